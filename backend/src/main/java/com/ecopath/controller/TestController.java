@@ -1,12 +1,16 @@
 package com.ecopath.controller;
 
+import com.ecopath.service.ArrowExportService;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.ResponseEntity;
 import org.springframework.jdbc.core.JdbcTemplate;
 import org.springframework.web.bind.annotation.GetMapping;
 import org.springframework.web.bind.annotation.RequestMapping;
 import org.springframework.web.bind.annotation.RequestParam;
 import org.springframework.web.bind.annotation.RestController;
+import org.springframework.web.servlet.mvc.method.annotation.StreamingResponseBody;
 
+import java.util.ArrayList;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
@@ -15,9 +19,96 @@ import java.util.Map;
 @RequestMapping("/test")
 public class TestController {
 
+    // last_updated dikirim sebagai string supaya watermark di client tidak kena masalah timezone
+    private static final String LAST_UPDATED_FORMAT = "YYYY-MM-DD HH24:MI:SS.FF3";
+
+    private static final String INVENTORY_SELECT = "SELECT " +
+            "i.inventory_id, " +
+            "i.facility_id, " +
+            "f.facility_name, " +
+            "i.item_id, " +
+            "m.item_name, " +
+            "i.current_stock, " +
+            "i.min_stock_threshold, " +
+            "i.max_stock_capacity, " +
+            "i.expiry_date, " +
+            "TO_VARCHAR(i.last_updated, '" + LAST_UPDATED_FORMAT + "') as last_updated " +
+            "FROM fact_inventory i " +
+            "JOIN dim_health_facilities f ON i.facility_id = f.facility_id " +
+            "JOIN dim_medical_items m ON i.item_id = m.item_id ";
+
+    private static final String INVENTORY_SQL = INVENTORY_SELECT +
+            "ORDER BY f.facility_name, m.item_name";
+
+    // Inclusive (>=) so rows sharing the watermark timestamp are never skipped.
+    // The client passes its watermark minus an overlap window (late commits with
+    // an older last_updated) and upserts by inventory_id, so re-sent rows are harmless.
+    private static final String INVENTORY_CHANGES_SQL = INVENTORY_SELECT +
+            "WHERE i.last_updated >= TO_TIMESTAMP_NTZ(?, '" + LAST_UPDATED_FORMAT + "') " +
+            "ORDER BY i.last_updated";
+
+    private static final String ITEMS_SQL = "SELECT " +
+            "item_id, " +
+            "item_name, " +
+            "item_category, " +
+            "disease_relation, " +
+            "unit_measurement, " +
+            "min_temperature, " +
+            "max_temperature, " +
+            "shelf_life_days, " +
+            "critical_item " +
+            "FROM dim_medical_items " +
+            "ORDER BY item_id";
+
+    // Versi data referensi: berubah kalau ada baris di dim table yang berubah,
+    // jadi client cukup cek ini sebelum download ulang
+    private static final String REFERENCE_VERSION_SQL = "SELECT " +
+            "(SELECT COUNT(*) FROM dim_health_facilities) as facility_count, " +
+            "(SELECT TO_VARCHAR(HASH_AGG(*)) FROM dim_health_facilities) as facility_hash, " +
+            "(SELECT COUNT(*) FROM dim_medical_items) as item_count, " +
+            "(SELECT TO_VARCHAR(HASH_AGG(*)) FROM dim_medical_items) as item_hash";
+
+    private static final String WEATHER_SQL = "SELECT w.weather_id, f.facility_name, w.date, " +
+            "w.temperature_avg, w.humidity_avg, w.rainfall_mm, w.weather_condition " +
+            "FROM ECOPATH_DB.PUBLIC.fact_weather_data w " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+            "  ON w.facility_id = f.facility_id " +
+            "ORDER BY w.date DESC LIMIT 10";
+
+    private static final String REPORTS_SQL = "SELECT r.report_id, f.facility_name, r.report_date, " +
+            "r.raw_text, r.disease_detected, r.severity_level, r.patient_count " +
+            "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports r " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+            "  ON r.facility_id = f.facility_id " +
+            "ORDER BY r.report_date DESC";
+
+    // Pemakaian harian (OUT, tanpa transfer redistribusi) per facility/item
+    private static final String CONSUMPTION_SQL = "SELECT facility_id, item_id, " +
+            "TO_VARCHAR(DATE(transaction_date)) as day, " +
+            "SUM(quantity) as quantity " +
+            "FROM fact_stock_transactions " +
+            "WHERE UPPER(transaction_type) = 'OUT' " +
+            "  AND (notes IS NULL OR notes NOT LIKE 'Redistribution%') " +
+            "  AND transaction_date >= DATEADD(day, -?, CURRENT_DATE()) " +
+            "GROUP BY facility_id, item_id, DATE(transaction_date)";
+
+    // Pasien 7 hari terakhir vs seluruh window, per facility (sinyal wabah)
+    private static final String DISEASE_PRESSURE_SQL = "SELECT facility_id, " +
+            "SUM(CASE WHEN report_date >= DATEADD(day, -7, CURRENT_DATE()) " +
+            "    THEN patient_count ELSE 0 END) as recent_patients, " +
+            "SUM(patient_count) as window_patients " +
+            "FROM fact_nurse_reports " +
+            "WHERE report_date >= DATEADD(day, -?, CURRENT_DATE()) " +
+            "GROUP BY facility_id";
+
+    private static final int MAX_HISTORY_DAYS = 365;
+
     @Autowired
     private JdbcTemplate jdbcTemplate;
 
+    @Autowired
+    private ArrowExportService arrowExportService;
+
     @GetMapping("/health")
     public Map<String, Object> healthCheck() {
         Map<String, Object> response = new HashMap<>();
@@ -83,6 +174,52 @@ public class TestController {
     }
 
 
+    /**
+     * Get ALL medical items (no limit)
+     */
+    @GetMapping("/items")
+    public Map<String, Object> getAllItems() {
+        Map<String, Object> response = new HashMap<>();
+
+        try {
+            List<Map<String, Object>> items = jdbcTemplate.queryForList(ITEMS_SQL);
+
+            response.put("status", "SUCCESS");
+            response.put("count", items.size());
+            response.put("data", items);
+
+        } catch (Exception e) {
+            response.put("status", "FAILED");
+            response.put("error", e.getMessage());
+        }
+
+        return response;
+    }
+
+    /**
+     * Versi facilities + items, untuk replica lokal di frontend
+     */
+    @GetMapping("/reference/version")
+    public Map<String, Object> getReferenceVersion() {
+        Map<String, Object> response = new HashMap<>();
+
+        try {
+            Map<String, Object> row = jdbcTemplate.queryForMap(REFERENCE_VERSION_SQL);
+
+            response.put("status", "SUCCESS");
+            response.put("facilities", row.get("FACILITY_COUNT"));
+            response.put("items", row.get("ITEM_COUNT"));
+            response.put("version", row.get("FACILITY_COUNT") + ":" + row.get("FACILITY_HASH") + "/" +
+                    row.get("ITEM_COUNT") + ":" + row.get("ITEM_HASH"));
+
+        } catch (Exception e) {
+            response.put("status", "FAILED");
+            response.put("error", e.getMessage());
+        }
+
+        return response;
+    }
+
     /**
      * Get ALL inventory data (no limit)
      */
@@ -90,6 +227,59 @@ public class TestController {
     public Map<String, Object> getAllInventory() {
         Map<String, Object> response = new HashMap<>();
 
+        try {
+            List<Map<String, Object>> inventoryData = jdbcTemplate.queryForList(INVENTORY_SQL);
+
+            response.put("status", "SUCCESS");
+            response.put("count", inventoryData.size());
+            response.put("data", inventoryData);
+
+        } catch (Exception e) {
+            response.put("status", "FAILED");
+            response.put("error", e.getMessage());
+        }
+
+        return response;
+    }
+
+    /**
+     * Get ALL inventory data as an Arrow IPC stream
+     */
+    @GetMapping(value = "/inventory", params = "format=arrow")
+    public ResponseEntity<StreamingResponseBody> getAllInventoryArrow() {
+        return arrowExportService.stream(INVENTORY_SQL);
+    }
+
+    /**
+     * Get inventory rows changed since a last_updated watermark (delta sync)
+     */
+    @GetMapping("/inventory/changes")
+    public Map<String, Object> getInventoryChanges(@RequestParam String since) {
+        Map<String, Object> response = new HashMap<>();
+
+        try {
+            List<Map<String, Object>> changes = jdbcTemplate.queryForList(INVENTORY_CHANGES_SQL, since);
+
+            response.put("status", "SUCCESS");
+            response.put("since", since);
+            response.put("count", changes.size());
+            response.put("data", changes);
+
+        } catch (Exception e) {
+            response.put("status", "FAILED");
+            response.put("error", e.getMessage());
+        }
+
+        return response;
+    }
+
+    /**
+     * Get inventory by facility
+     */
+    @GetMapping("/inventory/by-facility")
+    public Map<String, Object> getInventoryByFacility(@RequestParam String facilityId) {
+        Map<String, Object> response = new HashMap<>();
+
         try {
             String sql = "SELECT " +
                     "i.inventory_id, " +
@@ -104,11 +294,13 @@ public class TestController {
                     "FROM fact_inventory i " +
                     "JOIN dim_health_facilities f ON i.facility_id = f.facility_id " +
                     "JOIN dim_medical_items m ON i.item_id = m.item_id " +
-                    "ORDER BY f.facility_name, m.item_name";
+                    "WHERE i.facility_id = ? " +
+                    "ORDER BY m.item_name";
 
-            List<Map<String, Object>> inventoryData = jdbcTemplate.queryForList(sql);
+            List<Map<String, Object>> inventoryData = jdbcTemplate.queryForList(sql, facilityId);
 
             response.put("status", "SUCCESS");
+            response.put("facilityId", facilityId);
             response.put("count", inventoryData.size());
             response.put("data", inventoryData);
 
@@ -121,14 +313,51 @@ public class TestController {
     }
 
     /**
-     * Get inventory by facility
+     * Get one page of inventory with server-side filter, search and sort
      */
-    @GetMapping("/inventory/by-facility")
-    public Map<String, Object> getInventoryByFacility(@RequestParam String facilityId) {
+    @GetMapping("/inventory/page")
+    public Map<String, Object> getInventoryPage(
+            @RequestParam(required = false) String facilityId,
+            @RequestParam(required = false) String search,
+            @RequestParam(defaultValue = "default") String sort,
+            @RequestParam(defaultValue = "0") int page,
+            @RequestParam(defaultValue = "50") int size) {
         Map<String, Object> response = new HashMap<>();
 
         try {
-            String sql = "SELECT " +
+            int pageSize = Math.max(1, Math.min(size, 500));
+            int pageIndex = Math.max(page, 0);
+
+            // Filter yang sama dipakai untuk page, summary dan chart
+            StringBuilder where = new StringBuilder("WHERE 1 = 1 ");
+            List<Object> params = new ArrayList<>();
+
+            if (facilityId != null && !facilityId.isBlank()) {
+                where.append("AND i.facility_id = ? ");
+                params.add(facilityId);
+            }
+
+            if (search != null && !search.isBlank()) {
+                // Literal substring match (sama dengan snapshot lokal): escape wildcard LIKE
+                String literal = search.trim()
+                        .replace("\\", "\\\\")
+                        .replace("%", "\\%")
+                        .replace("_", "\\_");
+                where.append("AND m.item_name ILIKE ? ESCAPE '\\\\' ");
+                params.add("%" + literal + "%");
+            }
+
+            String orderBy = switch (sort) {
+                case "stock_desc" -> "ORDER BY i.current_stock DESC, i.inventory_id ";
+                case "stock_asc" -> "ORDER BY i.current_stock ASC, i.inventory_id ";
+                default -> "ORDER BY f.facility_name, m.item_name, i.inventory_id ";
+            };
+
+            String from = "FROM fact_inventory i " +
+                    "JOIN dim_health_facilities f ON i.facility_id = f.facility_id " +
+                    "JOIN dim_medical_items m ON i.item_id = m.item_id ";
+
+            String pageSql = "SELECT " +
                     "i.inventory_id, " +
                     "i.facility_id, " +
                     "f.facility_name, " +
@@ -138,17 +367,39 @@ public class TestController {
                     "i.min_stock_threshold, " +
                     "i.max_stock_capacity, " +
                     "i.expiry_date " +
-                    "FROM fact_inventory i " +
-                    "JOIN dim_health_facilities f ON i.facility_id = f.facility_id " +
-                    "JOIN dim_medical_items m ON i.item_id = m.item_id " +
-                    "WHERE i.facility_id = ? " +
-                    "ORDER BY m.item_name";
+                    from + where + orderBy +
+                    "LIMIT ? OFFSET ?";
 
-            List<Map<String, Object>> inventoryData = jdbcTemplate.queryForList(sql, facilityId);
+            List<Object> pageParams = new ArrayList<>(params);
+            pageParams.add(pageSize);
+            pageParams.add(pageIndex * pageSize);
+
+            List<Map<String, Object>> inventoryData =
+                    jdbcTemplate.queryForList(pageSql, pageParams.toArray());
+
+            String summarySql = "SELECT " +
+                    "COUNT(*) as total_items, " +
+                    "COALESCE(SUM(i.current_stock), 0) as total_stock, " +
+                    "COALESCE(AVG(i.current_stock), 0) as avg_stock, " +
+                    "COUNT(DISTINCT i.facility_id) as total_facilities " +
+                    from + where;
+
+            Map<String, Object> summary = jdbcTemplate.queryForMap(summarySql, params.toArray());
+
+            String byFacilitySql = "SELECT i.facility_id, SUM(i.current_stock) as current_stock " +
+                    from + where +
+                    "GROUP BY i.facility_id " +
+                    "ORDER BY current_stock DESC";
+
+            List<Map<String, Object>> byFacility =
+                    jdbcTemplate.queryForList(byFacilitySql, params.toArray());
 
             response.put("status", "SUCCESS");
-            response.put("facilityId", facilityId);
-            response.put("count", inventoryData.size());
+            response.put("page", pageIndex);
+            response.put("size", pageSize);
+            response.put("count", ((Number) summary.get("TOTAL_ITEMS")).intValue());
+            response.put("summary", summary);
+            response.put("by_facility", byFacility);
             response.put("data", inventoryData);
 
         } catch (Exception e) {
@@ -159,19 +410,69 @@ public class TestController {
         return response;
     }
 
+    /**
+     * Daily OUT quantities per facility/item over the last `days` days (forecasting input)
+     */
+    @GetMapping("/consumption")
+    public Map<String, Object> getConsumption(@RequestParam(defaultValue = "90") int days) {
+        Map<String, Object> response = new HashMap<>();
+
+        try {
+            int window = historyDays(days);
+            List<Map<String, Object>> consumption = jdbcTemplate.queryForList(CONSUMPTION_SQL, window);
+
+            response.put("status", "SUCCESS");
+            response.put("days", window);
+            response.put("count", consumption.size());
+            response.put("data", consumption);
+
+        } catch (Exception e) {
+            response.put("status", "FAILED");
+            response.put("error", e.getMessage());
+        }
+
+        return response;
+    }
+
+    @GetMapping(value = "/consumption", params = "format=arrow")
+    public ResponseEntity<StreamingResponseBody> getConsumptionArrow(@RequestParam(defaultValue = "90") int days) {
+        return arrowExportService.stream(CONSUMPTION_SQL, historyDays(days));
+    }
+
+    /**
+     * Recent vs window patient counts per facility from nurse reports
+     */
+    @GetMapping("/consumption/pressure")
+    public Map<String, Object> getDiseasePressure(@RequestParam(defaultValue = "90") int days) {
+        Map<String, Object> response = new HashMap<>();
+
+        try {
+            int window = historyDays(days);
+            List<Map<String, Object>> pressure = jdbcTemplate.queryForList(DISEASE_PRESSURE_SQL, window);
+
+            response.put("status", "SUCCESS");
+            response.put("days", window);
+            response.put("count", pressure.size());
+            response.put("data", pressure);
+
+        } catch (Exception e) {
+            response.put("status", "FAILED");
+            response.put("error", e.getMessage());
+        }
+
+        return response;
+    }
+
+    private static int historyDays(int days) {
+        return Math.max(7, Math.min(days, MAX_HISTORY_DAYS));
+    }
+
     @GetMapping("/weather")
     public Map<String, Object> getWeather() {
         Map<String, Object> response = new HashMap<>();
 
         try {
-            String sql = "SELECT w.weather_id, f.facility_name, w.date, " +
-                    "w.temperature_avg, w.humidity_avg, w.rainfall_mm, w.weather_condition " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_weather_data w " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON w.facility_id = f.facility_id " +
-                    "ORDER BY w.date DESC LIMIT 10";
-
-            List<Map<String, Object>> weather = jdbcTemplate.queryForList(sql);
+            List<Map<String, Object>> weather = jdbcTemplate.queryForList(WEATHER_SQL);
 
             response.put("status", "SUCCESS");
             response.put("count", weather.size());
@@ -185,19 +486,17 @@ public class TestController {
         return response;
     }
 
+    @GetMapping(value = "/weather", params = "format=arrow")
+    public ResponseEntity<StreamingResponseBody> getWeatherArrow() {
+        return arrowExportService.stream(WEATHER_SQL);
+    }
+
     @GetMapping("/reports")
     public Map<String, Object> getNurseReports() {
         Map<String, Object> response = new HashMap<>();
 
         try {
-            String sql = "SELECT r.report_id, f.facility_name, r.report_date, " +
-                    "r.raw_text, r.disease_detected, r.severity_level, r.patient_count " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports r " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON r.facility_id = f.facility_id " +
-                    "ORDER BY r.report_date DESC";
-
-            List<Map<String, Object>> reports = jdbcTemplate.queryForList(sql);
+            List<Map<String, Object>> reports = jdbcTemplate.queryForList(REPORTS_SQL);
 
             response.put("status", "SUCCESS");
             response.put("count", reports.size());
@@ -211,6 +510,11 @@ public class TestController {
         return response;
     }
 
+    @GetMapping(value = "/reports", params = "format=arrow")
+    public ResponseEntity<StreamingResponseBody> getNurseReportsArrow() {
+        return arrowExportService.stream(REPORTS_SQL);
+    }
+
     @GetMapping("/stats")
     public Map<String, Object> getStats() {
         Map<String, Object> response = new HashMap<>();
@@ -369,6 +673,8 @@ public class TestController {
                         "GET /api/test/health",
                         "GET /api/test/snowflake",
                         "GET /api/test/facilities",
+                        "GET /api/test/items",
+                        "GET /api/test/reference/version",
                         "POST /api/services/reports/process",
                         "POST /api/services/inventory/update",
                         "GET /api/services/inventory/anomalies",
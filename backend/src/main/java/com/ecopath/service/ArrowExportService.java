@@ -0,0 +1,118 @@
+package com.ecopath.service;
+
+import org.apache.arrow.adapter.jdbc.ArrowVectorIterator;
+import org.apache.arrow.adapter.jdbc.JdbcFieldInfo;
+import org.apache.arrow.adapter.jdbc.JdbcToArrow;
+import org.apache.arrow.adapter.jdbc.JdbcToArrowConfig;
+import org.apache.arrow.adapter.jdbc.JdbcToArrowConfigBuilder;
+import org.apache.arrow.adapter.jdbc.JdbcToArrowUtils;
+import org.apache.arrow.memory.BufferAllocator;
+import org.apache.arrow.memory.RootAllocator;
+import org.apache.arrow.vector.VectorSchemaRoot;
+import org.apache.arrow.vector.ipc.ArrowStreamWriter;
+import org.apache.arrow.vector.types.FloatingPointPrecision;
+import org.apache.arrow.vector.types.pojo.ArrowType;
+import org.springframework.http.MediaType;
+import org.springframework.http.ResponseEntity;
+import org.springframework.jdbc.core.JdbcTemplate;
+import org.springframework.jdbc.core.ResultSetExtractor;
+import org.springframework.stereotype.Service;
+import org.springframework.web.servlet.mvc.method.annotation.StreamingResponseBody;
+
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.UncheckedIOException;
+import java.nio.channels.Channels;
+import java.nio.channels.WritableByteChannel;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Types;
+import java.util.Calendar;
+
+@Service
+public class ArrowExportService {
+
+    public static final String ARROW_STREAM = "application/vnd.apache.arrow.stream";
+
+    private static final int BATCH_SIZE = 4096;
+
+    private final JdbcTemplate jdbcTemplate;
+    private final BufferAllocator allocator = new RootAllocator();
+
+    public ArrowExportService(JdbcTemplate jdbcTemplate) {
+        this.jdbcTemplate = jdbcTemplate;
+    }
+
+    /**
+     * Stream hasil query sebagai Arrow IPC stream, BATCH_SIZE rows per batch
+     */
+    public ResponseEntity<StreamingResponseBody> stream(String sql, Object... args) {
+        StreamingResponseBody body = out -> jdbcTemplate.query(sql, (ResultSetExtractor<Void>) rs -> {
+            writeArrow(rs, out);
+            return null;
+        }, args);
+
+        return ResponseEntity.ok()
+                .contentType(MediaType.parseMediaType(ARROW_STREAM))
+                .body(body);
+    }
+
+    private void writeArrow(ResultSet rs, OutputStream out) throws SQLException {
+        Calendar calendar = JdbcToArrowUtils.getUtcCalendar();
+
+        try (BufferAllocator child = allocator.newChildAllocator("arrow-export", 0, Long.MAX_VALUE)) {
+            JdbcToArrowConfig config = new JdbcToArrowConfigBuilder(child, calendar)
+                    .setReuseVectorSchemaRoot(true)
+                    .setTargetBatchSize(BATCH_SIZE)
+                    .setJdbcToArrowTypeConverter(field -> toArrowType(field, calendar))
+                    .build();
+
+            WritableByteChannel channel = Channels.newChannel(out);
+
+            try (ArrowVectorIterator iterator = JdbcToArrow.sqlToArrowVectorIterator(rs, config)) {
+                ArrowStreamWriter writer = null;
+
+                while (iterator.hasNext()) {
+                    VectorSchemaRoot root = iterator.next();
+                    if (writer == null) {
+                        writer = new ArrowStreamWriter(root, null, channel);
+                        writer.start();
+                    }
+                    writer.writeBatch();
+                }
+
+                if (writer == null) {
+                    // Query tanpa hasil: tetap kirim schema supaya client bisa baca kolom
+                    try (VectorSchemaRoot empty = VectorSchemaRoot.create(
+                            JdbcToArrowUtils.jdbcToArrowSchema(rs.getMetaData(), config), child)) {
+                        writer = new ArrowStreamWriter(empty, null, channel);
+                        writer.start();
+                        writer.end();
+                    }
+                } else {
+                    writer.end();
+                }
+            }
+
+            out.flush();
+
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+
+    /**
+     * Snowflake NUMBER jadi BIGINT/DOUBLE, bukan DECIMAL, supaya pandas dapat kolom numerik biasa
+     */
+    private ArrowType toArrowType(JdbcFieldInfo field, Calendar calendar) {
+        int type = field.getJdbcType();
+
+        if (type == Types.DECIMAL || type == Types.NUMERIC) {
+            return field.getScale() == 0
+                    ? new ArrowType.Int(64, true)
+                    : new ArrowType.FloatingPoint(FloatingPointPrecision.DOUBLE);
+        }
+
+        return JdbcToArrowUtils.getArrowTypeFromJdbcType(field, calendar);
+    }
+}
@@ -0,0 +1,129 @@
+package com.ecopath.service;
+
+import org.springframework.stereotype.Service;
+import org.springframework.web.context.request.async.DeferredResult;
+
+import java.time.Instant;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Change notification untuk frontend (long-poll).
+ * Service yang mengubah data memanggil publish; client memanggil poll(since) dan
+ * request-nya ditahan sampai ada event dengan seq > since atau timeout, jadi
+ * frontend tidak perlu polling data ke Snowflake untuk tahu ada perubahan.
+ */
+@Service
+public class EventService {
+
+    public static final String TOPIC_INVENTORY = "inventory";
+    public static final String TOPIC_PENDING = "pending";
+    public static final String TOPIC_APPROVED = "approved";
+    public static final String TOPIC_REPORTS = "reports";
+
+    // Client yang tertinggal lebih dari ini dapat reset (refresh semua topic)
+    private static final int MAX_RETAINED_EVENTS = 500;
+
+    public static final long MAX_WAIT_MS = 30_000;
+
+    private record Waiter(long since, DeferredResult<Map<String, Object>> result) {
+    }
+
+    private final Deque<Map<String, Object>> events = new ArrayDeque<>();
+    private final List<Waiter> waiters = new ArrayList<>();
+    private long seq = 0;
+
+    /**
+     * Catat perubahan dan bangunkan semua client yang sedang menunggu
+     */
+    public long publish(String type, List<String> topics, int count) {
+        List<Waiter> ready;
+        long eventSeq;
+
+        synchronized (this) {
+            eventSeq = ++seq;
+
+            Map<String, Object> event = new HashMap<>();
+            event.put("seq", eventSeq);
+            event.put("type", type);
+            event.put("topics", topics);
+            event.put("count", count);
+            event.put("at", Instant.now().toString());
+
+            events.addLast(event);
+            while (events.size() > MAX_RETAINED_EVENTS) {
+                events.removeFirst();
+            }
+
+            ready = new ArrayList<>(waiters);
+            waiters.clear();
+        }
+
+        // setResult di luar lock: dispatch ke servlet container
+        for (Waiter waiter : ready) {
+            waiter.result().setResult(since(waiter.since()));
+        }
+        return eventSeq;
+    }
+
+    /**
+     * Event setelah since; jika belum ada, tahan request sampai ada event atau waitMs habis.
+     * since < 0 langsung return seq terakhir (cursor awal client).
+     */
+    public DeferredResult<Map<String, Object>> poll(long since, long waitMs) {
+        long timeout = Math.max(0, Math.min(waitMs, MAX_WAIT_MS));
+
+        synchronized (this) {
+            if (since < 0 || since != seq || timeout == 0) {
+                DeferredResult<Map<String, Object>> result = new DeferredResult<>();
+                result.setResult(since(since));
+                return result;
+            }
+
+            // Tidak ada event baru sampai timeout: seq tetap sama
+            DeferredResult<Map<String, Object>> result = new DeferredResult<>(timeout, response(seq, false, List.of()));
+            Waiter waiter = new Waiter(since, result);
+            waiters.add(waiter);
+            result.onCompletion(() -> {
+                synchronized (this) {
+                    waiters.remove(waiter);
+                }
+            });
+            return result;
+        }
+    }
+
+    private synchronized Map<String, Object> since(long since) {
+        if (since < 0) {
+            return response(seq, false, List.of());
+        }
+
+        // since di depan seq = backend restart; event terlama sudah lewat = client tertinggal
+        Long oldest = events.isEmpty() ? null : (Long) events.getFirst().get("seq");
+        if (since > seq || (oldest != null && oldest > since + 1)) {
+            return response(seq, true, List.of());
+        }
+
+        List<Map<String, Object>> newer = new ArrayList<>();
+        for (Map<String, Object> event : events) {
+            if ((Long) event.get("seq") > since) {
+                newer.add(event);
+            }
+        }
+        return response(seq, false, newer);
+    }
+
+    private static Map<String, Object> response(long seq, boolean reset, List<Map<String, Object>> events) {
+        Map<String, Object> response = new HashMap<>();
+        response.put("status", "SUCCESS");
+        response.put("seq", seq);
+        response.put("reset", reset);
+        response.put("count", events.size());
+        response.put("events", events);
+        return response;
+    }
+}
@@ -0,0 +1,156 @@
+package com.ecopath.service;
+
+import org.springframework.http.HttpHeaders;
+import org.springframework.http.MediaType;
+import org.springframework.http.ResponseEntity;
+import org.springframework.jdbc.core.JdbcTemplate;
+import org.springframework.jdbc.core.ResultSetExtractor;
+import org.springframework.stereotype.Service;
+import org.springframework.web.servlet.mvc.method.annotation.StreamingResponseBody;
+
+import javax.sql.DataSource;
+import java.io.BufferedWriter;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.OutputStreamWriter;
+import java.io.UncheckedIOException;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.sql.ResultSet;
+import java.sql.ResultSetMetaData;
+import java.sql.SQLException;
+import java.time.LocalDate;
+import java.time.format.DateTimeFormatter;
+import java.util.Map;
+import java.util.zip.GZIPOutputStream;
+
+/**
+ * Export dataset lengkap sebagai CSV (opsional gzip) atau Arrow stream.
+ * Baris ditulis ke response sambil dibaca dari Snowflake, tidak pernah dikumpulkan di memory.
+ */
+@Service
+public class ExportService {
+
+    // Baris per fetch dari Snowflake
+    private static final int FETCH_SIZE = 10000;
+
+    private static final int BUFFER_SIZE = 64 * 1024;
+
+    private static final Map<String, String> DATASETS = Map.of(
+            "reports", "SELECT r.report_id, r.facility_id, f.facility_name, r.report_date, " +
+                    "r.raw_text, r.disease_detected, r.severity_level, r.patient_count, r.created_at " +
+                    "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports r " +
+                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+                    "  ON r.facility_id = f.facility_id " +
+                    "ORDER BY r.report_date DESC",
+            "inventory", "SELECT i.inventory_id, i.facility_id, f.facility_name, i.item_id, m.item_name, " +
+                    "i.current_stock, i.min_stock_threshold, i.max_stock_capacity, i.expiry_date, i.last_updated " +
+                    "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
+                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f ON i.facility_id = f.facility_id " +
+                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m ON i.item_id = m.item_id " +
+                    "ORDER BY f.facility_name, m.item_name",
+            "transactions", "SELECT t.transaction_id, t.facility_id, f.facility_name, t.item_id, m.item_name, " +
+                    "t.transaction_type, t.quantity, t.transaction_date, t.notes " +
+                    "FROM ECOPATH_DB.PUBLIC.fact_stock_transactions t " +
+                    "LEFT JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f ON t.facility_id = f.facility_id " +
+                    "LEFT JOIN ECOPATH_DB.PUBLIC.dim_medical_items m ON t.item_id = m.item_id " +
+                    "ORDER BY t.transaction_date DESC",
+            "redistributions", "SELECT r.recommendation_id, " +
+                    "r.from_facility_id, fs.facility_name as source_facility, " +
+                    "r.to_facility_id, fd.facility_name as destination_facility, " +
+                    "r.item_id, m.item_name, r.recommended_quantity, r.priority_score, " +
+                    "r.status, r.reason, r.approved_by, r.approved_at, r.created_at " +
+                    "FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS r " +
+                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities fs ON r.from_facility_id = fs.facility_id " +
+                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities fd ON r.to_facility_id = fd.facility_id " +
+                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m ON r.item_id = m.item_id " +
+                    "ORDER BY r.created_at DESC"
+    );
+
+    private final JdbcTemplate jdbcTemplate;
+    private final ArrowExportService arrowExportService;
+
+    public ExportService(DataSource dataSource, ArrowExportService arrowExportService) {
+        // JdbcTemplate sendiri supaya fetch size besar tidak berlaku untuk query lain
+        this.jdbcTemplate = new JdbcTemplate(dataSource);
+        this.jdbcTemplate.setFetchSize(FETCH_SIZE);
+        this.arrowExportService = arrowExportService;
+    }
+
+    public boolean hasDataset(String dataset) {
+        return DATASETS.containsKey(dataset);
+    }
+
+    /**
+     * Stream dataset sebagai CSV (header lower-case), gzip jika diminta
+     */
+    public ResponseEntity<StreamingResponseBody> csv(String dataset, boolean gzip) {
+        String sql = DATASETS.get(dataset);
+        String filename = dataset + "_" + LocalDate.now().format(DateTimeFormatter.BASIC_ISO_DATE) +
+                (gzip ? ".csv.gz" : ".csv");
+
+        StreamingResponseBody body = out -> {
+            GZIPOutputStream compressed = gzip ? new GZIPOutputStream(out, BUFFER_SIZE) : null;
+            OutputStream target = compressed != null ? compressed : out;
+            Writer writer = new BufferedWriter(new OutputStreamWriter(target, StandardCharsets.UTF_8), BUFFER_SIZE);
+
+            jdbcTemplate.query(sql, (ResultSetExtractor<Void>) rs -> {
+                writeCsv(rs, writer);
+                return null;
+            });
+
+            writer.flush();
+            if (compressed != null) {
+                compressed.finish();
+            }
+        };
+
+        return ResponseEntity.ok()
+                .contentType(gzip ? MediaType.parseMediaType("application/gzip") : MediaType.parseMediaType("text/csv"))
+                .header(HttpHeaders.CONTENT_DISPOSITION, "attachment; filename=\"" + filename + "\"")
+                .body(body);
+    }
+
+    /**
+     * Stream dataset sebagai Arrow IPC stream (client menulis Parquet per batch)
+     */
+    public ResponseEntity<StreamingResponseBody> arrow(String dataset) {
+        return arrowExportService.stream(DATASETS.get(dataset));
+    }
+
+    private void writeCsv(ResultSet rs, Writer writer) throws SQLException {
+        try {
+            ResultSetMetaData meta = rs.getMetaData();
+            int columns = meta.getColumnCount();
+
+            for (int i = 1; i <= columns; i++) {
+                if (i > 1) {
+                    writer.write(',');
+                }
+                writer.write(csvField(meta.getColumnLabel(i).toLowerCase()));
+            }
+            writer.write('\n');
+
+            while (rs.next()) {
+                for (int i = 1; i <= columns; i++) {
+                    if (i > 1) {
+                        writer.write(',');
+                    }
+                    String value = rs.getString(i);
+                    if (value != null) {
+                        writer.write(csvField(value));
+                    }
+                }
+                writer.write('\n');
+            }
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+
+    private static String csvField(String value) {
+        boolean quote = value.indexOf(',') >= 0 || value.indexOf('"') >= 0
+                || value.indexOf('\n') >= 0 || value.indexOf('\r') >= 0;
+        return quote ? '"' + value.replace("\"", "\"\"") + '"' : value;
+    }
+}
@@ -2,6 +2,9 @@ package com.ecopath.service;
 
 import com.fasterxml.jackson.databind.JsonNode;
 import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.MissingNode;
+import com.fasterxml.jackson.databind.node.ObjectNode;
+import jakarta.annotation.PreDestroy;
 import org.springframework.beans.factory.annotation.Value;
 import org.springframework.http.*;
 import org.springframework.jdbc.core.JdbcTemplate;
@@ -9,15 +12,32 @@ import org.springframework.stereotype.Service;
 import org.springframework.web.client.RestTemplate;
 
 import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
 import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 import java.util.UUID;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 
 @Service
 public class GeminiService {
 
+    // Laporan per prompt Gemini pada mode bulk
+    private static final int BATCH_PROMPT_SIZE = 20;
+
+    // Maksimal prompt Gemini yang jalan bersamaan
+    private static final int EXTRACTION_THREADS = 4;
+
+    private static final String MERGE_SOURCE_ROW = "(?, ?, ?, ?, ?, ?, ?)";
+
     private final JdbcTemplate jdbcTemplate;
+    private final ReportRollupService reportRollupService;
+    private final ExecutorService extractionPool = Executors.newFixedThreadPool(EXTRACTION_THREADS);
     private final RestTemplate restTemplate = new RestTemplate();
     private final ObjectMapper objectMapper = new ObjectMapper();
 
@@ -27,8 +47,44 @@ public class GeminiService {
     @Value("${gemini.api.url}")
     private String apiUrl;
 
-    public GeminiService(JdbcTemplate jdbcTemplate) {
+    public GeminiService(JdbcTemplate jdbcTemplate, ReportRollupService reportRollupService) {
         this.jdbcTemplate = jdbcTemplate;
+        this.reportRollupService = reportRollupService;
+    }
+
+    @PreDestroy
+    public void shutdown() {
+        extractionPool.shutdownNow();
+    }
+
+    /**
+     * Kirim prompt ke Gemini, return teks jawaban (tanpa markdown fence)
+     */
+    private String callGemini(String prompt) throws Exception {
+        Map<String, Object> requestBody = new HashMap<>();
+        Map<String, Object> contents = new HashMap<>();
+        Map<String, String> parts = new HashMap<>();
+        parts.put("text", prompt);
+        contents.put("parts", new Object[]{parts});
+        requestBody.put("contents", new Object[]{contents});
+
+        HttpHeaders headers = new HttpHeaders();
+        headers.setContentType(MediaType.APPLICATION_JSON);
+
+        String urlWithKey = apiUrl + "?key=" + apiKey;
+
+        HttpEntity<Map<String, Object>> entity = new HttpEntity<>(requestBody, headers);
+        ResponseEntity<String> response = restTemplate.exchange(
+                urlWithKey, HttpMethod.POST, entity, String.class);
+
+        System.out.println("Gemini API Response: " + response.getStatusCode());
+
+        JsonNode root = objectMapper.readTree(response.getBody());
+        String aiResponse = root.path("candidates").get(0)
+                .path("content").path("parts").get(0)
+                .path("text").asText();
+
+        return aiResponse.replaceAll("```json|```", "").trim();
     }
 
     /**
@@ -65,6 +121,45 @@ public class GeminiService {
         return disease; // Return original jika tidak match
     }
 
+    /**
+     * Normalisasi severity ke format yang dipakai data dan dashboard (Low/Medium/High/Critical)
+     */
+    private String normalizeSeverity(String severity) {
+        if (severity == null) return "Medium";
+
+        return switch (severity.toUpperCase().trim()) {
+            case "LOW", "RINGAN" -> "Low";
+            case "HIGH", "BERAT" -> "High";
+            case "CRITICAL", "KRITIS" -> "Critical";
+            default -> "Medium";
+        };
+    }
+
+    /**
+     * Ekstrak disease, severity dan patient_count dari laporan dengan Gemini (tanpa simpan)
+     */
+    public Map<String, Object> extractReport(String rawText) throws Exception {
+        String prompt = "Analisis laporan kesehatan berikut dan ekstrak informasi dalam format JSON. " +
+                "Berikan HANYA JSON tanpa teks lain, dengan struktur: " +
+                "{\"disease\": \"nama penyakit\", \"severity\": \"LOW/MEDIUM/HIGH/CRITICAL\", \"patient_count\": angka}. " +
+                "Gunakan nama penyakit standar seperti: DBD, ISPA, Diare, COVID-19, Demam Tifoid, Malaria. " +
+                "Laporan: " + rawText;
+
+        String cleanJson = callGemini(prompt);
+
+        System.out.println("AI Response: " + cleanJson);
+
+        JsonNode parsed = objectMapper.readTree(cleanJson);
+        String diseaseRaw = parsed.path("disease").asText("Unknown");
+
+        Map<String, Object> extraction = new HashMap<>();
+        extraction.put("disease", normalizeDisease(diseaseRaw)); // NORMALIZE HERE
+        extraction.put("disease_raw", diseaseRaw);
+        extraction.put("severity", normalizeSeverity(parsed.path("severity").asText("Medium")));
+        extraction.put("patient_count", parsed.path("patient_count").asInt(0));
+        return extraction;
+    }
+
     /**
      * SMART: Update existing report atau create new jika belum ada
      */
@@ -73,110 +168,257 @@ public class GeminiService {
             System.out.println("Processing nurse report with Gemini AI...");
             System.out.println("Raw text: " + rawText);
 
-            // 1. Prepare prompt untuk Gemini
-            String prompt = "Analisis laporan kesehatan berikut dan ekstrak informasi dalam format JSON. " +
-                    "Berikan HANYA JSON tanpa teks lain, dengan struktur: " +
-                    "{\"disease\": \"nama penyakit\", \"severity\": \"LOW/MEDIUM/HIGH/CRITICAL\", \"patient_count\": angka}. " +
-                    "Gunakan nama penyakit standar seperti: DBD, ISPA, Diare, COVID-19, Demam Tifoid, Malaria. " +
-                    "Laporan: " + rawText;
-
-            // 2. Build request body untuk Gemini API
-            Map<String, Object> requestBody = new HashMap<>();
-            Map<String, Object> contents = new HashMap<>();
-            Map<String, String> parts = new HashMap<>();
-            parts.put("text", prompt);
-            contents.put("parts", new Object[]{parts});
-            requestBody.put("contents", new Object[]{contents});
-
-            // 3. Call Gemini API
-            HttpHeaders headers = new HttpHeaders();
-            headers.setContentType(MediaType.APPLICATION_JSON);
-
-            String urlWithKey = apiUrl + "?key=" + apiKey;
-
-            HttpEntity<Map<String, Object>> entity = new HttpEntity<>(requestBody, headers);
-            ResponseEntity<String> response = restTemplate.exchange(
-                    urlWithKey, HttpMethod.POST, entity, String.class);
-
-            System.out.println("Gemini API Response: " + response.getStatusCode());
-
-            // 4. Parse Gemini response
-            JsonNode root = objectMapper.readTree(response.getBody());
-            String aiResponse = root.path("candidates").get(0)
-                    .path("content").path("parts").get(0)
-                    .path("text").asText();
-
-            System.out.println("AI Response: " + aiResponse);
+            Map<String, Object> extraction = extractReport(rawText);
 
-            // 5. Parse JSON dari AI response
-            String cleanJson = aiResponse.replaceAll("```json|```", "").trim();
-            JsonNode parsed = objectMapper.readTree(cleanJson);
+            String disease = (String) extraction.get("disease");
+            String severity = (String) extraction.get("severity");
+            int patientCount = (Integer) extraction.get("patient_count");
 
-            String diseaseRaw = parsed.path("disease").asText("Unknown");
-            String disease = normalizeDisease(diseaseRaw); // NORMALIZE HERE
-            String severity = parsed.path("severity").asText("Medium");
-            int patientCount = parsed.path("patient_count").asInt(0);
-
-            System.out.println("Extracted - Disease: " + diseaseRaw + " → " + disease +
+            System.out.println("Extracted - Disease: " + extraction.get("disease_raw") + " → " + disease +
                     ", Severity: " + severity +
                     ", Patients: " + patientCount);
 
-            String reportDate = LocalDate.now().toString();
+            return upsertReport(facilityId, rawText, disease, severity, patientCount);
 
-            // 6. CHECK: Apakah sudah ada report untuk facility + disease hari ini?
-            String checkSql = "SELECT report_id, patient_count " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports " +
-                    "WHERE facility_id = ? " +
-                    "  AND disease_detected = ? " +
-                    "  AND report_date = ?";
+        } catch (Exception e) {
+            System.err.println("Error: " + e.getMessage());
+            e.printStackTrace();
+            return "Error: " + e.getMessage();
+        }
+    }
 
-            List<Map<String, Object>> existing = jdbcTemplate.queryForList(
-                    checkSql, facilityId, disease, reportDate);
+    /**
+     * Simpan laporan yang sudah diekstrak di client (tanpa Gemini)
+     */
+    public String ingestReport(String facilityId, String rawText, String disease,
+                               String severity, int patientCount) {
+        try {
+            return upsertReport(facilityId, rawText, normalizeDisease(disease), normalizeSeverity(severity), patientCount);
+        } catch (Exception e) {
+            System.err.println("Error: " + e.getMessage());
+            return "Error: " + e.getMessage();
+        }
+    }
 
-            if (!existing.isEmpty()) {
-                // UPDATE existing record (tambahkan patient count)
-                String existingReportId = (String) existing.get(0).get("REPORT_ID");
-                int existingCount = ((Number) existing.get(0).get("PATIENT_COUNT")).intValue();
-                int newTotal = existingCount + patientCount;
+    /**
+     * Tambahkan ke report facility + disease hari ini, atau insert baru jika belum ada
+     */
+    private String upsertReport(String facilityId, String rawText, String disease,
+                                String severity, int patientCount) {
+        String reportDate = LocalDate.now().toString();
+
+        // CHECK: Apakah sudah ada report untuk facility + disease hari ini?
+        String checkSql = "SELECT report_id, patient_count " +
+                "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports " +
+                "WHERE facility_id = ? " +
+                "  AND disease_detected = ? " +
+                "  AND report_date = ?";
+
+        List<Map<String, Object>> existing = jdbcTemplate.queryForList(
+                checkSql, facilityId, disease, reportDate);
+
+        if (!existing.isEmpty()) {
+            // UPDATE existing record (tambahkan patient count)
+            String existingReportId = (String) existing.get(0).get("REPORT_ID");
+            int existingCount = ((Number) existing.get(0).get("PATIENT_COUNT")).intValue();
+            int newTotal = existingCount + patientCount;
+
+            String updateSql = "UPDATE ECOPATH_DB.PUBLIC.fact_nurse_reports " +
+                    "SET patient_count = ?, " +
+                    "    raw_text = raw_text || ' | ' || ?, " +
+                    "    severity_level = ?, " +
+                    "    created_at = CURRENT_TIMESTAMP() " +
+                    "WHERE report_id = ?";
+
+            jdbcTemplate.update(updateSql, newTotal, rawText, severity, existingReportId);
+            reportRollupService.refreshRollup(LocalDate.parse(reportDate));
+
+            System.out.println("Report UPDATED: " + existingReportId +
+                    " (patient count: " + existingCount + " → " + newTotal + ")");
+
+            return String.format("Report updated: %s (Total patients: %d → %d) - ID: %s",
+                    disease, existingCount, newTotal, existingReportId);
+
+        } else {
+            // INSERT new record
+            String reportId = "RPT-" + UUID.randomUUID().toString().substring(0, 8);
+
+            String insertSql = "INSERT INTO ECOPATH_DB.PUBLIC.fact_nurse_reports " +
+                    "(report_id, facility_id, report_date, raw_text, " +
+                    "disease_detected, severity_level, patient_count, created_at) " +
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP())";
+
+            jdbcTemplate.update(insertSql, reportId, facilityId, reportDate,
+                    rawText, disease, severity, patientCount);
+            reportRollupService.refreshRollup(LocalDate.parse(reportDate));
+
+            System.out.println("New report created: " + reportId);
+
+            return String.format("New report created: %s (%s severity, %d patients) - ID: %s",
+                    disease, severity, patientCount, reportId);
+        }
+    }
 
-                String updateSql = "UPDATE ECOPATH_DB.PUBLIC.fact_nurse_reports " +
-                        "SET patient_count = ?, " +
-                        "    raw_text = raw_text || ' | ' || ?, " +
-                        "    severity_level = ?, " +
-                        "    created_at = CURRENT_TIMESTAMP() " +
-                        "WHERE report_id = ?";
+    /**
+     * BULK: ekstrak banyak laporan (BATCH_PROMPT_SIZE per prompt, paralel terbatas),
+     * gabungkan per facility + disease + tanggal, lalu simpan dengan satu MERGE.
+     * Laporan yang sudah membawa disease (diekstrak di client) tidak dikirim ke Gemini.
+     */
+    public Map<String, Object> processNurseReportsBatch(List<Map<String, Object>> reports) {
+        String reportDate = LocalDate.now().toString();
+        List<String> errors = new ArrayList<>();
+        JsonNode[] extractions = new JsonNode[reports.size()];
+
+        // 1. Pakai hasil ekstraksi client jika ada
+        List<Integer> pending = new ArrayList<>();
+        for (int i = 0; i < reports.size(); i++) {
+            Map<String, Object> report = reports.get(i);
+
+            if (report.get("disease") != null) {
+                ObjectNode given = objectMapper.createObjectNode();
+                given.put("disease", report.get("disease").toString());
+                given.put("severity", String.valueOf(report.getOrDefault("severity", "Medium")));
+                given.put("patient_count", Integer.parseInt(String.valueOf(report.getOrDefault("patientCount", 0))));
+                extractions[i] = given;
+            } else {
+                pending.add(i);
+            }
+        }
 
-                jdbcTemplate.update(updateSql, newTotal, rawText, severity, existingReportId);
+        // 2. Sisanya diekstrak per chunk di worker pool
+        List<List<Integer>> chunks = new ArrayList<>();
+        List<Future<JsonNode[]>> futures = new ArrayList<>();
+        for (int start = 0; start < pending.size(); start += BATCH_PROMPT_SIZE) {
+            List<Integer> chunk = pending.subList(start, Math.min(start + BATCH_PROMPT_SIZE, pending.size()));
+            List<String> texts = chunk.stream().map(i -> reports.get(i).get("text").toString()).toList();
+            chunks.add(chunk);
+            futures.add(extractionPool.submit(() -> extractBatch(texts)));
+        }
+
+        for (int c = 0; c < futures.size(); c++) {
+            List<Integer> chunk = chunks.get(c);
+            try {
+                JsonNode[] results = futures.get(c).get();
+                for (int k = 0; k < chunk.size(); k++) {
+                    extractions[chunk.get(k)] = results[k] != null ? results[k] : MissingNode.getInstance();
+                }
+            } catch (Exception e) {
+                errors.add("Reports " + (chunk.get(0) + 1) + "-" + (chunk.get(chunk.size() - 1) + 1) +
+                        ": " + e.getMessage());
+            }
+        }
 
-                System.out.println("Report UPDATED: " + existingReportId +
-                        " (patient count: " + existingCount + " → " + newTotal + ")");
+        // 3. Aggregate per (facility, disease, date), urutan laporan tetap dijaga
+        Map<String, Object[]> groups = new LinkedHashMap<>();
+        int extracted = 0;
 
-                return String.format("Report updated: %s (Total patients: %d → %d) - ID: %s",
-                        disease, existingCount, newTotal, existingReportId);
+        for (int i = 0; i < reports.size(); i++) {
+            JsonNode extraction = extractions[i];
+            if (extraction == null) {
+                continue; // chunk gagal, sudah dicatat di errors
+            }
+            if (extraction.isMissingNode()) {
+                errors.add("Report " + (i + 1) + ": no extraction returned");
+                continue;
+            }
 
+            String facilityId = reports.get(i).get("facilityId").toString();
+            String rawText = reports.get(i).get("text").toString();
+            String disease = normalizeDisease(extraction.path("disease").asText("Unknown"));
+            String severity = normalizeSeverity(extraction.path("severity").asText("Medium"));
+            int patientCount = extraction.path("patient_count").asInt(0);
+            extracted++;
+
+            String key = facilityId + "|" + disease + "|" + reportDate;
+            Object[] group = groups.get(key);
+
+            if (group == null) {
+                groups.put(key, new Object[]{
+                        "RPT-" + UUID.randomUUID().toString().substring(0, 8),
+                        facilityId, reportDate, rawText, disease, severity, patientCount
+                });
             } else {
-                // INSERT new record
-                String reportId = "RPT-" + UUID.randomUUID().toString().substring(0, 8);
+                group[3] = group[3] + " | " + rawText;
+                group[5] = severity;
+                group[6] = (Integer) group[6] + patientCount;
+            }
+        }
 
-                String insertSql = "INSERT INTO ECOPATH_DB.PUBLIC.fact_nurse_reports " +
-                        "(report_id, facility_id, report_date, raw_text, " +
-                        "disease_detected, severity_level, patient_count, created_at) " +
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP())";
+        // 4. Satu MERGE untuk semua group
+        int merged = groups.isEmpty() ? 0 : mergeReports(new ArrayList<>(groups.values()));
+        if (merged > 0) {
+            reportRollupService.refreshRollup(LocalDate.parse(reportDate));
+        }
 
-                jdbcTemplate.update(insertSql, reportId, facilityId, reportDate,
-                        rawText, disease, severity, patientCount);
+        System.out.println("Bulk reports: " + extracted + "/" + reports.size() +
+                " extracted (" + pending.size() + " via Gemini), " + groups.size() + " groups merged");
+
+        Map<String, Object> result = new HashMap<>();
+        result.put("submitted", reports.size());
+        result.put("processed", extracted);
+        result.put("failed", reports.size() - extracted);
+        result.put("llm_extracted", pending.size());
+        result.put("groups", groups.size());
+        result.put("rows_merged", merged);
+        result.put("errors", errors);
+        return result;
+    }
 
-                System.out.println("New report created: " + reportId);
+    /**
+     * Satu prompt Gemini untuk beberapa laporan; hasil index ke-i untuk laporan ke-i (null jika tidak ada)
+     */
+    private JsonNode[] extractBatch(List<String> texts) throws Exception {
+        StringBuilder prompt = new StringBuilder(
+                "Analisis setiap laporan kesehatan berikut dan ekstrak informasi dalam format JSON. " +
+                "Berikan HANYA JSON array tanpa teks lain, satu objek per laporan dengan struktur: " +
+                "{\"index\": nomor laporan, \"disease\": \"nama penyakit\", " +
+                "\"severity\": \"LOW/MEDIUM/HIGH/CRITICAL\", \"patient_count\": angka}. " +
+                "Gunakan nama penyakit standar seperti: DBD, ISPA, Diare, COVID-19, Demam Tifoid, Malaria.\n");
+
+        for (int i = 0; i < texts.size(); i++) {
+            prompt.append("Laporan ").append(i + 1).append(": ")
+                    .append(texts.get(i).replace("\n", " "))
+                    .append("\n");
+        }
 
-                return String.format("New report created: %s (%s severity, %d patients) - ID: %s",
-                        disease, severity, patientCount, reportId);
-            }
+        JsonNode parsed = objectMapper.readTree(callGemini(prompt.toString()));
+        JsonNode[] results = new JsonNode[texts.size()];
 
-        } catch (Exception e) {
-            System.err.println("Error: " + e.getMessage());
-            e.printStackTrace();
-            return "Error: " + e.getMessage();
+        for (JsonNode item : parsed) {
+            int index = item.path("index").asInt(0) - 1;
+            if (index >= 0 && index < results.length) {
+                results[index] = item;
+            }
         }
+        return results;
+    }
+
+    /**
+     * MERGE semua group sekaligus: tambah patient_count jika sudah ada, insert jika belum
+     */
+    private int mergeReports(List<Object[]> groups) {
+        String sql = "MERGE INTO ECOPATH_DB.PUBLIC.fact_nurse_reports t " +
+                "USING (SELECT column1 AS report_id, column2 AS facility_id, column3::DATE AS report_date, " +
+                "              column4 AS raw_text, column5 AS disease_detected, column6 AS severity_level, " +
+                "              column7::INTEGER AS patient_count " +
+                "       FROM VALUES " + String.join(", ", Collections.nCopies(groups.size(), MERGE_SOURCE_ROW)) +
+                "      ) s " +
+                "ON t.facility_id = s.facility_id " +
+                "   AND t.disease_detected = s.disease_detected " +
+                "   AND t.report_date = s.report_date " +
+                "WHEN MATCHED THEN UPDATE SET " +
+                "   patient_count = t.patient_count + s.patient_count, " +
+                "   raw_text = t.raw_text || ' | ' || s.raw_text, " +
+                "   severity_level = s.severity_level, " +
+                "   created_at = CURRENT_TIMESTAMP() " +
+                "WHEN NOT MATCHED THEN INSERT " +
+                "   (report_id, facility_id, report_date, raw_text, " +
+                "    disease_detected, severity_level, patient_count, created_at) " +
+                "   VALUES (s.report_id, s.facility_id, s.report_date, s.raw_text, " +
+                "           s.disease_detected, s.severity_level, s.patient_count, CURRENT_TIMESTAMP())";
+
+        Object[] args = groups.stream().flatMap(Arrays::stream).toArray();
+        return jdbcTemplate.update(sql, args);
     }
 
     public String processNurseReport(String facilityId, String rawText) {
@@ -1,8 +1,15 @@
 package com.ecopath.service;
 
+import org.springframework.dao.DataAccessException;
 import org.springframework.jdbc.core.JdbcTemplate;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.support.TransactionTemplate;
 
+import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 import java.util.UUID;
@@ -10,72 +17,131 @@ import java.util.UUID;
 @Service
 public class InventoryService {
 
+    // Satu pass atas fact_inventory: semua flag anomali per baris
+    private static final String ANOMALY_SOURCE_SQL = "SELECT DISTINCT " +
+            "i.facility_id, i.item_id, f.facility_name, m.item_name, " +
+            "i.current_stock, i.min_stock_threshold, i.max_stock_capacity, i.expiry_date, " +
+            "CASE WHEN i.current_stock < i.min_stock_threshold THEN TRUE ELSE FALSE END AS is_understocked, " +
+            "CASE WHEN i.current_stock > i.max_stock_capacity * 0.9 THEN TRUE ELSE FALSE END AS is_overstocked, " +
+            "CASE WHEN DATEDIFF(day, CURRENT_DATE(), i.expiry_date) < 30 THEN TRUE ELSE FALSE END AS is_near_expiry " +
+            "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+            "  ON i.facility_id = f.facility_id " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
+            "  ON i.item_id = m.item_id ";
+
+    private static final String ANY_ANOMALY = "(s.is_understocked OR s.is_overstocked OR s.is_near_expiry)";
+
+    private static final String ANOMALY_COLUMNS = "facility_id, item_id, facility_name, item_name, " +
+            "current_stock, min_stock_threshold, max_stock_capacity, expiry_date, " +
+            "is_understocked, is_overstocked, is_near_expiry";
+
+    private static final String ANOMALY_REFRESH_SQL = "INSERT OVERWRITE INTO ECOPATH_DB.PUBLIC.analytics_inventory_anomalies " +
+            "(" + ANOMALY_COLUMNS + ", refreshed_at) " +
+            "SELECT s.*, CURRENT_TIMESTAMP() FROM (" + ANOMALY_SOURCE_SQL + ") s " +
+            "WHERE " + ANY_ANOMALY;
+
+    // %s = daftar (?, ?) facility/item yang di-merge
+    private static final String ANOMALY_MERGE_SQL = "MERGE INTO ECOPATH_DB.PUBLIC.analytics_inventory_anomalies a " +
+            "USING (" + ANOMALY_SOURCE_SQL + "WHERE (i.facility_id, i.item_id) IN (%s)) s " +
+            "ON a.facility_id = s.facility_id AND a.item_id = s.item_id " +
+            "WHEN MATCHED AND NOT " + ANY_ANOMALY + " THEN DELETE " +
+            "WHEN MATCHED THEN UPDATE SET " +
+            "  current_stock = s.current_stock, " +
+            "  min_stock_threshold = s.min_stock_threshold, " +
+            "  max_stock_capacity = s.max_stock_capacity, " +
+            "  expiry_date = s.expiry_date, " +
+            "  is_understocked = s.is_understocked, " +
+            "  is_overstocked = s.is_overstocked, " +
+            "  is_near_expiry = s.is_near_expiry, " +
+            "  refreshed_at = CURRENT_TIMESTAMP() " +
+            "WHEN NOT MATCHED AND " + ANY_ANOMALY + " THEN INSERT " +
+            "(" + ANOMALY_COLUMNS + ", refreshed_at) VALUES " +
+            "(s.facility_id, s.item_id, s.facility_name, s.item_name, " +
+            "s.current_stock, s.min_stock_threshold, s.max_stock_capacity, s.expiry_date, " +
+            "s.is_understocked, s.is_overstocked, s.is_near_expiry, CURRENT_TIMESTAMP())";
+
+    private static final String ANOMALY_OUTPUT = "s.facility_name, s.item_name, s.current_stock, " +
+            "s.min_stock_threshold, s.max_stock_capacity, s.expiry_date, " +
+            "DATEDIFF(day, CURRENT_DATE(), s.expiry_date) AS days_until_expiry, " +
+            "s.is_understocked, s.is_overstocked, s.is_near_expiry ";
+
+    private static final String ANOMALY_SUMMARY_SQL = "SELECT " + ANOMALY_OUTPUT +
+            "FROM ECOPATH_DB.PUBLIC.analytics_inventory_anomalies s " +
+            "ORDER BY s.facility_name, s.item_name";
+
+    private static final String ANOMALY_LIVE_SQL = "SELECT " + ANOMALY_OUTPUT +
+            "FROM (" + ANOMALY_SOURCE_SQL + ") s " +
+            "WHERE " + ANY_ANOMALY + " " +
+            "ORDER BY s.facility_name, s.item_name";
+
+    private static final String STOCK_DELTA_SQL = "UPDATE ECOPATH_DB.PUBLIC.fact_inventory " +
+            "SET current_stock = current_stock + ?, " +
+            "    last_updated = CURRENT_TIMESTAMP() " +
+            "WHERE facility_id = ? AND item_id = ? " +
+            "  AND current_stock + ? >= 0";
+
+    private static final String CURRENT_STOCK_SQL = "SELECT current_stock " +
+            "FROM ECOPATH_DB.PUBLIC.fact_inventory " +
+            "WHERE facility_id = ? AND item_id = ?";
+
+    public static final String INSERT_TRANSACTION_SQL = "INSERT INTO ECOPATH_DB.PUBLIC.fact_stock_transactions " +
+            "(transaction_id, facility_id, item_id, transaction_type, " +
+            "quantity, transaction_date, notes) " +
+            "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP(), ?)";
+
     private final JdbcTemplate jdbcTemplate;
+    private final TransactionTemplate transactionTemplate;
+    private final EventService eventService;
+
+    // Tanggal full refresh terakhir summary anomaly (null = belum/invalid)
+    private volatile LocalDate anomaliesRefreshedOn;
 
-    public InventoryService(JdbcTemplate jdbcTemplate) {
+    public InventoryService(JdbcTemplate jdbcTemplate, TransactionTemplate transactionTemplate,
+                            EventService eventService) {
         this.jdbcTemplate = jdbcTemplate;
+        this.transactionTemplate = transactionTemplate;
+        this.eventService = eventService;
     }
 
     /**
-     * Update stock (IN atau OUT)
+     * Update stock (IN atau OUT) dalam satu transaksi
      */
     public String updateStock(String facilityId, String itemId, int quantity, String type) {
         try {
             System.out.println("📦 Updating stock: " + type + " " + quantity + " units for " + facilityId + " - " + itemId);
 
-            // STEP 1: Check if inventory record exists
-            String checkSql = "SELECT inventory_id, current_stock " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_inventory " +
-                    "WHERE facility_id = ? AND item_id = ?";
-
-            List<Map<String, Object>> existing = jdbcTemplate.queryForList(checkSql, facilityId, itemId);
-
-            if (existing.isEmpty()) {
-                System.err.println("Inventory record not found for: " + facilityId + " - " + itemId);
-                return "Error: Inventory record not found for facility " + facilityId + " and item " + itemId;
-            }
-
-            int currentStock = ((Number) existing.get(0).get("CURRENT_STOCK")).intValue();
-            System.out.println("Current stock: " + currentStock);
-
-            // STEP 2: Calculate new stock
             int delta = type.equalsIgnoreCase("IN") ? quantity : -quantity;
-            int newStock = currentStock + delta;
-
-            if (newStock < 0) {
-                return "Error: Cannot reduce stock below 0. Current: " + currentStock + ", Requested: " + quantity;
-            }
-
-            System.out.println("New stock will be: " + newStock + " (delta: " + delta + ")");
-
-            // STEP 3: Update inventory
-            String updateSql = "UPDATE ECOPATH_DB.PUBLIC.fact_inventory " +
-                    "SET current_stock = ?, " +
-                    "    last_updated = CURRENT_TIMESTAMP() " +
-                    "WHERE facility_id = ? AND item_id = ?";
-
-            int updated = jdbcTemplate.update(updateSql, newStock, facilityId, itemId);
 
-            if (updated == 0) {
-                return "Error: Failed to update inventory";
+            String result = transactionTemplate.execute(status -> {
+                // Update bersyarat: stok tidak pernah turun di bawah 0
+                int updated = jdbcTemplate.update(STOCK_DELTA_SQL, delta, facilityId, itemId, delta);
+
+                if (updated == 0) {
+                    List<Integer> existing = jdbcTemplate.queryForList(CURRENT_STOCK_SQL, Integer.class, facilityId, itemId);
+                    if (existing.isEmpty()) {
+                        System.err.println("Inventory record not found for: " + facilityId + " - " + itemId);
+                        return "Error: Inventory record not found for facility " + facilityId + " and item " + itemId;
+                    }
+                    return "Error: Cannot reduce stock below 0. Current: " + existing.get(0) + ", Requested: " + quantity;
+                }
+
+                String transactionId = "TRX-" + UUID.randomUUID().toString().substring(0, 8);
+                jdbcTemplate.update(INSERT_TRANSACTION_SQL, transactionId, facilityId, itemId,
+                        type, quantity, "Stock " + type + " via Dashboard");
+
+                int newStock = jdbcTemplate.queryForObject(CURRENT_STOCK_SQL, Integer.class, facilityId, itemId);
+                System.out.println("Stock updated: " + (newStock - delta) + " → " + newStock + " (" + transactionId + ")");
+
+                return String.format("Stock updated successfully! %s → %s (Transaction: %s)",
+                        newStock - delta, newStock, transactionId);
+            });
+
+            if (!result.startsWith("Error")) {
+                refreshAnomalies(facilityId, itemId);
+                eventService.publish("stock-updated", List.of(EventService.TOPIC_INVENTORY), 1);
             }
-
-            System.out.println("Stock updated: " + currentStock + " → " + newStock);
-
-            // STEP 4: Record transaction
-            String transactionId = "TRX-" + UUID.randomUUID().toString().substring(0, 8);
-            String insertSql = "INSERT INTO ECOPATH_DB.PUBLIC.fact_stock_transactions " +
-                    "(transaction_id, facility_id, item_id, transaction_type, " +
-                    "quantity, transaction_date, notes) " +
-                    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP(), ?)";
-
-            jdbcTemplate.update(insertSql, transactionId, facilityId, itemId,
-                    type, quantity, "Stock " + type + " via Dashboard");
-
-            System.out.println("Transaction recorded: " + transactionId);
-
-            return String.format("Stock updated successfully! %s → %s (Transaction: %s)",
-                    currentStock, newStock, transactionId);
+            return result;
 
         } catch (Exception e) {
             System.err.println("Error updating stock: " + e.getMessage());
@@ -85,70 +151,27 @@ public class InventoryService {
     }
 
     /**
-     * Detect stock anomalies (understocked, overstocked, near expiry)
+     * Detect stock anomalies (understocked, overstocked, near expiry).
+     * Dibaca dari analytics_inventory_anomalies; full refresh sekali per hari
+     * karena near expiry bergeser mengikuti tanggal.
      */
     public Map<String, Object> detectAnomalies() {
         try {
-            System.out.println("Starting anomaly detection...");
-
-            // Understocked items - TAMBAH DISTINCT
-            String underSql = "SELECT DISTINCT " +
-                    "f.facility_name, " +
-                    "m.item_name, " +
-                    "i.current_stock, " +
-                    "i.min_stock_threshold " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON i.facility_id = f.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
-                    "  ON i.item_id = m.item_id " +
-                    "WHERE i.current_stock < i.min_stock_threshold";
-
-            List<Map<String, Object>> understocked = jdbcTemplate.queryForList(underSql);
-            System.out.println("Understocked items found: " + understocked.size());
-
-            // Overstocked items - TAMBAH DISTINCT
-            String overSql = "SELECT DISTINCT " +
-                    "f.facility_name, " +
-                    "m.item_name, " +
-                    "i.current_stock, " +
-                    "i.max_stock_capacity " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON i.facility_id = f.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
-                    "  ON i.item_id = m.item_id " +
-                    "WHERE i.current_stock > i.max_stock_capacity * 0.9";
-
-            List<Map<String, Object>> overstocked = jdbcTemplate.queryForList(overSql);
-            System.out.println("Overstocked items found: " + overstocked.size());
-
-            // Near expiry items - TAMBAH DISTINCT
-            String expirySql = "SELECT DISTINCT " +
-                    "f.facility_name, " +
-                    "m.item_name, " +
-                    "i.current_stock, " +
-                    "i.expiry_date, " +
-                    "DATEDIFF(day, CURRENT_DATE(), i.expiry_date) as days_until_expiry " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON i.facility_id = f.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
-                    "  ON i.item_id = m.item_id " +
-                    "WHERE DATEDIFF(day, CURRENT_DATE(), i.expiry_date) < 30";
-
-            List<Map<String, Object>> nearExpiry = jdbcTemplate.queryForList(expirySql);
-            System.out.println("Near expiry items found: " + nearExpiry.size());
-
-            int totalIssues = understocked.size() + overstocked.size() + nearExpiry.size();
-            System.out.println("Total anomalies detected: " + totalIssues);
-
-            return Map.of(
-                    "understocked", understocked,
-                    "overstocked", overstocked,
-                    "near_expiry", nearExpiry,
-                    "total_issues", totalIssues
-            );
+            List<Map<String, Object>> rows;
+            try {
+                if (!LocalDate.now().equals(anomaliesRefreshedOn)) {
+                    refreshAnomalies();
+                }
+                rows = jdbcTemplate.queryForList(ANOMALY_SUMMARY_SQL);
+            } catch (DataAccessException e) {
+                // Summary table belum dibuat (lihat create_views.sql): klasifikasi langsung
+                System.err.println("Anomaly summary unavailable, classifying live: " + e.getMessage());
+                rows = jdbcTemplate.queryForList(ANOMALY_LIVE_SQL);
+            }
+
+            Map<String, Object> anomalies = groupAnomalies(rows);
+            System.out.println("Total anomalies detected: " + anomalies.get("total_issues"));
+            return anomalies;
 
         } catch (Exception e) {
             System.err.println("Error detecting anomalies: " + e.getMessage());
@@ -156,4 +179,80 @@ public class InventoryService {
             return Map.of("error", e.getMessage());
         }
     }
-}
\ No newline at end of file
+
+    /**
+     * Rebuild analytics_inventory_anomalies dari seluruh fact_inventory (satu pass)
+     */
+    public void refreshAnomalies() {
+        int rows = jdbcTemplate.update(ANOMALY_REFRESH_SQL);
+        anomaliesRefreshedOn = LocalDate.now();
+        System.out.println("Anomaly summary refreshed: " + rows + " rows");
+    }
+
+    /**
+     * Update baris summary untuk satu facility/item setelah stok berubah
+     */
+    public void refreshAnomalies(String facilityId, String itemId) {
+        refreshAnomalies(List.<Object[]>of(new Object[]{facilityId, itemId}));
+    }
+
+    /**
+     * Update baris summary untuk banyak {facilityId, itemId} dengan satu MERGE
+     */
+    public void refreshAnomalies(List<Object[]> keys) {
+        if (keys.isEmpty()) {
+            return;
+        }
+        try {
+            String sql = String.format(ANOMALY_MERGE_SQL, String.join(", ", Collections.nCopies(keys.size(), "(?, ?)")));
+            jdbcTemplate.update(sql, keys.stream().flatMap(Arrays::stream).toArray());
+        } catch (DataAccessException e) {
+            // Full refresh berikutnya yang membetulkan
+            System.err.println("Error refreshing anomaly summary: " + e.getMessage());
+            anomaliesRefreshedOn = null;
+        }
+    }
+
+    private Map<String, Object> groupAnomalies(List<Map<String, Object>> rows) {
+        List<Map<String, Object>> understocked = new ArrayList<>();
+        List<Map<String, Object>> overstocked = new ArrayList<>();
+        List<Map<String, Object>> nearExpiry = new ArrayList<>();
+
+        for (Map<String, Object> row : rows) {
+            if (Boolean.TRUE.equals(row.get("IS_UNDERSTOCKED"))) {
+                understocked.add(anomalyRow(row, "MIN_STOCK_THRESHOLD"));
+            }
+            if (Boolean.TRUE.equals(row.get("IS_OVERSTOCKED"))) {
+                overstocked.add(anomalyRow(row, "MAX_STOCK_CAPACITY"));
+            }
+            if (Boolean.TRUE.equals(row.get("IS_NEAR_EXPIRY"))) {
+                nearExpiry.add(anomalyRow(row, "EXPIRY_DATE", "DAYS_UNTIL_EXPIRY"));
+            }
+        }
+
+        int totalIssues = understocked.size() + overstocked.size() + nearExpiry.size();
+
+        return Map.of(
+                "understocked", understocked,
+                "overstocked", overstocked,
+                "near_expiry", nearExpiry,
+                "counts", Map.of(
+                        "understocked", understocked.size(),
+                        "overstocked", overstocked.size(),
+                        "near_expiry", nearExpiry.size()
+                ),
+                "total_issues", totalIssues
+        );
+    }
+
+    private static Map<String, Object> anomalyRow(Map<String, Object> row, String... extra) {
+        Map<String, Object> compact = new LinkedHashMap<>();
+        compact.put("FACILITY_NAME", row.get("FACILITY_NAME"));
+        compact.put("ITEM_NAME", row.get("ITEM_NAME"));
+        compact.put("CURRENT_STOCK", row.get("CURRENT_STOCK"));
+        for (String column : extra) {
+            compact.put(column, row.get(column));
+        }
+        return compact;
+    }
+}
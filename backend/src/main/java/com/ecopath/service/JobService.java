@@ -0,0 +1,216 @@
+package com.ecopath.service;
+
+import jakarta.annotation.PreDestroy;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+
+import java.time.Instant;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.UUID;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Background job untuk operasi lama (generate, fetch weather, anomalies, Gemini).
+ * Submit langsung return job id; status/progress dan result di-poll terpisah.
+ */
+@Service
+public class JobService {
+
+    /**
+     * Dipakai task untuk melaporkan progress
+     */
+    public interface Progress {
+        void setTotal(int total);
+
+        void advance(int steps);
+
+        void setMessage(String message);
+
+        void addError(String error);
+    }
+
+    @FunctionalInterface
+    public interface Task {
+        Object run(Progress progress) throws Exception;
+    }
+
+    // Job yang sudah selesai tetap bisa di-poll sampai tergeser job baru;
+    // job QUEUED/RUNNING tidak pernah digeser
+    private static final int MAX_TRACKED_JOBS = 100;
+
+    private static final int MAX_JOB_ERRORS = 20;
+
+    private final ExecutorService pool;
+
+    private final Map<String, Job> jobs = Collections.synchronizedMap(new LinkedHashMap<>());
+
+    // Job exclusive yang masih jalan, per type
+    private final Map<String, Job> running = new HashMap<>();
+
+    public JobService(@Value("${jobs.max-concurrency:4}") int maxConcurrency) {
+        this.pool = Executors.newFixedThreadPool(maxConcurrency);
+    }
+
+    @PreDestroy
+    public void shutdown() {
+        pool.shutdownNow();
+    }
+
+    /**
+     * Jalankan task di background, return status awal job
+     */
+    public Map<String, Object> submit(String type, Task task) {
+        Job job = new Job(type);
+        track(job);
+        pool.submit(() -> job.execute(task));
+
+        System.out.println("Job " + job.id + " (" + type + ") submitted");
+        return job.toMap();
+    }
+
+    /**
+     * Seperti submit, tapi maksimal satu job per type: jika masih ada yang jalan, job itu yang dikembalikan
+     */
+    public synchronized Map<String, Object> submitExclusive(String type, Task task) {
+        Job current = running.get(type);
+        if (current != null && !current.isFinished()) {
+            return current.toMap();
+        }
+
+        Job job = new Job(type);
+        track(job);
+        running.put(type, job);
+        pool.submit(() -> job.execute(task));
+
+        System.out.println("Job " + job.id + " (" + type + ") submitted");
+        return job.toMap();
+    }
+
+    /**
+     * Simpan job baru; jika lebih dari MAX_TRACKED_JOBS, geser job selesai yang paling lama
+     */
+    private void track(Job job) {
+        synchronized (jobs) {
+            jobs.put(job.id, job);
+
+            Iterator<Job> iterator = jobs.values().iterator();
+            while (jobs.size() > MAX_TRACKED_JOBS && iterator.hasNext()) {
+                if (iterator.next().isFinished()) {
+                    iterator.remove();
+                }
+            }
+        }
+    }
+
+    /**
+     * Status dan progress job, null jika tidak dikenal
+     */
+    public Map<String, Object> status(String jobId) {
+        Job job = jobs.get(jobId);
+        return job == null ? null : job.toMap();
+    }
+
+    /**
+     * Hasil job (null sampai job COMPLETED)
+     */
+    public Object result(String jobId) {
+        Job job = jobs.get(jobId);
+        return job == null ? null : job.result;
+    }
+
+    private static class Job implements Progress {
+        final String id = "JOB-" + UUID.randomUUID().toString().substring(0, 8);
+        final String type;
+        final Instant createdAt = Instant.now();
+        final AtomicInteger completed = new AtomicInteger();
+        final List<String> errors = Collections.synchronizedList(new ArrayList<>());
+
+        volatile String status = "QUEUED";
+        volatile int total = -1;
+        volatile String message;
+        volatile String error;
+        volatile Object result;
+        volatile Instant startedAt;
+        volatile Instant finishedAt;
+
+        Job(String type) {
+            this.type = type;
+        }
+
+        void execute(Task task) {
+            startedAt = Instant.now();
+            status = "RUNNING";
+            String outcome;
+            try {
+                result = task.run(this);
+                outcome = "COMPLETED";
+            } catch (Exception e) {
+                System.err.println("Job " + id + " (" + type + ") failed: " + e.getMessage());
+                error = e.getMessage();
+                outcome = "FAILED";
+            }
+            // finishedAt sebelum status: poll yang melihat job selesai selalu dapat finished_at
+            finishedAt = Instant.now();
+            status = outcome;
+        }
+
+        boolean isFinished() {
+            return "COMPLETED".equals(status) || "FAILED".equals(status);
+        }
+
+        @Override
+        public void setTotal(int total) {
+            this.total = total;
+        }
+
+        @Override
+        public void advance(int steps) {
+            completed.addAndGet(steps);
+        }
+
+        @Override
+        public void setMessage(String message) {
+            this.message = message;
+        }
+
+        @Override
+        public void addError(String error) {
+            if (errors.size() < MAX_JOB_ERRORS) {
+                errors.add(error);
+            }
+        }
+
+        Map<String, Object> toMap() {
+            // status dibaca dulu: execute menulis finishedAt sebelum status akhir
+            String currentStatus = status;
+            Instant finished = finishedAt;
+            Instant start = startedAt != null ? startedAt : createdAt;
+            Instant end = finished != null ? finished : Instant.now();
+
+            Map<String, Object> map = new HashMap<>();
+            map.put("job_id", id);
+            map.put("type", type);
+            map.put("status", currentStatus);
+            map.put("total", total >= 0 ? total : null);
+            map.put("completed", completed.get());
+            map.put("progress", total > 0 ? Math.min(1.0, completed.get() / (double) total) : null);
+            map.put("message", message);
+            map.put("error", error);
+            synchronized (errors) {
+                map.put("errors", new ArrayList<>(errors));
+            }
+            map.put("created_at", createdAt.toString());
+            map.put("finished_at", finished != null ? finished.toString() : null);
+            map.put("elapsed_ms", end.toEpochMilli() - start.toEpochMilli());
+            return map;
+        }
+    }
+}
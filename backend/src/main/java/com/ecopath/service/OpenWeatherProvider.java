@@ -0,0 +1,52 @@
+package com.ecopath.service;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.boot.autoconfigure.condition.ConditionalOnProperty;
+import org.springframework.http.client.SimpleClientHttpRequestFactory;
+import org.springframework.stereotype.Component;
+import org.springframework.web.client.RestTemplate;
+
+/**
+ * OpenWeather current weather API. weather.api.url bisa diarahkan ke fake server lokal untuk benchmark.
+ */
+@Component
+@ConditionalOnProperty(name = "weather.provider", havingValue = "openweather", matchIfMissing = true)
+public class OpenWeatherProvider implements WeatherProvider {
+
+    private static final int CONNECT_TIMEOUT_MS = 5000;
+    private static final int READ_TIMEOUT_MS = 10000;
+
+    private final RestTemplate restTemplate;
+    private final ObjectMapper objectMapper = new ObjectMapper();
+
+    @Value("${weather.api.key}")
+    private String apiKey;
+
+    @Value("${weather.api.url}")
+    private String apiUrl;
+
+    public OpenWeatherProvider() {
+        SimpleClientHttpRequestFactory factory = new SimpleClientHttpRequestFactory();
+        factory.setConnectTimeout(CONNECT_TIMEOUT_MS);
+        factory.setReadTimeout(READ_TIMEOUT_MS);
+        this.restTemplate = new RestTemplate(factory);
+    }
+
+    @Override
+    public Reading fetch(double lat, double lon) throws Exception {
+        String url = String.format("%s?lat=%f&lon=%f&appid=%s&units=metric",
+                apiUrl, lat, lon, apiKey);
+
+        String response = restTemplate.getForObject(url, String.class);
+        JsonNode root = objectMapper.readTree(response);
+
+        return new Reading(
+                root.path("main").path("temp").asDouble(),
+                root.path("main").path("humidity").asDouble(),
+                root.path("rain").path("1h").asDouble(0.0),
+                root.path("weather").get(0).path("main").asText()
+        );
+    }
+}
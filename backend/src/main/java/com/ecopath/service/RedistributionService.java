@@ -2,16 +2,95 @@ package com.ecopath.service;
 
 import org.springframework.jdbc.core.JdbcTemplate;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.support.TransactionTemplate;
 
 import java.util.*;
 
 @Service
 public class RedistributionService {
 
-    private final JdbcTemplate jdbcTemplate;
+    private static final String PENDING_SELECT = "SELECT " +
+            "r.recommendation_id, " +
+            "r.from_facility_id, " +
+            "r.to_facility_id, " +
+            "r.item_id, " +
+            "r.recommended_quantity, " +
+            "r.priority_score, " +
+            "r.status, " +
+            "r.reason, " +
+            "r.created_at, " +
+            "fs.facility_name as from_facility_name, " +
+            "fd.facility_name as to_facility_name, " +
+            "m.item_name, " +
+            "inv_from.current_stock as from_current_stock, " +
+            "inv_to.current_stock as to_current_stock, " +
+            "(inv_from.current_stock - r.recommended_quantity) as from_after_stock, " +
+            "(inv_to.current_stock + r.recommended_quantity) as to_after_stock, " +
+            "r.priority_score as priority ";
+
+    private static final String PENDING_JOINS = "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities fs " +
+            "  ON r.from_facility_id = fs.facility_id " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities fd " +
+            "  ON r.to_facility_id = fd.facility_id " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
+            "  ON r.item_id = m.item_id " +
+            "LEFT JOIN ECOPATH_DB.PUBLIC.fact_inventory inv_from " +
+            "  ON r.from_facility_id = inv_from.facility_id " +
+            "  AND r.item_id = inv_from.item_id " +
+            "LEFT JOIN ECOPATH_DB.PUBLIC.fact_inventory inv_to " +
+            "  ON r.to_facility_id = inv_to.facility_id " +
+            "  AND r.item_id = inv_to.item_id ";
+
+    // recommendation_id sebagai tie-breaker supaya halaman stabil
+    private static final String PENDING_ORDER = "ORDER BY r.priority_score DESC, r.created_at DESC, r.recommendation_id";
 
-    public RedistributionService(JdbcTemplate jdbcTemplate) {
+    private final JdbcTemplate jdbcTemplate;
+    private final TransactionTemplate transactionTemplate;
+    private final InventoryService inventoryService;
+    private final EventService eventService;
+
+    public RedistributionService(JdbcTemplate jdbcTemplate,
+                                 TransactionTemplate transactionTemplate,
+                                 InventoryService inventoryService,
+                                 EventService eventService) {
         this.jdbcTemplate = jdbcTemplate;
+        this.transactionTemplate = transactionTemplate;
+        this.inventoryService = inventoryService;
+        this.eventService = eventService;
+    }
+
+    /**
+     * Overstocked inventory rows (kandidat pengirim)
+     */
+    public List<Map<String, Object>> findOverstocked() {
+        String overSql = "SELECT i.facility_id, f.facility_name, " +
+                "i.item_id, m.item_name, i.current_stock, " +
+                "i.max_stock_capacity, f.latitude, f.longitude " +
+                "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
+                "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+                "  ON i.facility_id = f.facility_id " +
+                "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
+                "  ON i.item_id = m.item_id " +
+                "WHERE i.current_stock > i.max_stock_capacity * 0.8";
+
+        return jdbcTemplate.queryForList(overSql);
+    }
+
+    /**
+     * Understocked inventory rows (kandidat penerima)
+     */
+    public List<Map<String, Object>> findUnderstocked() {
+        String underSql = "SELECT i.facility_id, f.facility_name, " +
+                "i.item_id, m.item_name, i.current_stock, " +
+                "i.min_stock_threshold, f.latitude, f.longitude " +
+                "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
+                "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+                "  ON i.facility_id = f.facility_id " +
+                "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
+                "  ON i.item_id = m.item_id " +
+                "WHERE i.current_stock < i.min_stock_threshold * 1.5";
+
+        return jdbcTemplate.queryForList(underSql);
     }
 
     /**
@@ -22,35 +101,16 @@ public class RedistributionService {
             System.out.println("Generating redistribution recommendations...");
 
             // 1. Find overstocked facilities
-            String overSql = "SELECT i.facility_id, f.facility_name, " +
-                    "i.item_id, m.item_name, i.current_stock, " +
-                    "i.max_stock_capacity, f.latitude, f.longitude " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON i.facility_id = f.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
-                    "  ON i.item_id = m.item_id " +
-                    "WHERE i.current_stock > i.max_stock_capacity * 0.8";
-
-            List<Map<String, Object>> overstocked = jdbcTemplate.queryForList(overSql);
+            List<Map<String, Object>> overstocked = findOverstocked();
 
             // 2. Find understocked facilities
-            String underSql = "SELECT i.facility_id, f.facility_name, " +
-                    "i.item_id, m.item_name, i.current_stock, " +
-                    "i.min_stock_threshold, f.latitude, f.longitude " +
-                    "FROM ECOPATH_DB.PUBLIC.fact_inventory i " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
-                    "  ON i.facility_id = f.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
-                    "  ON i.item_id = m.item_id " +
-                    "WHERE i.current_stock < i.min_stock_threshold * 1.5";
-
-            List<Map<String, Object>> understocked = jdbcTemplate.queryForList(underSql);
+            List<Map<String, Object>> understocked = findUnderstocked();
 
             System.out.println("Found " + overstocked.size() + " overstocked, " +
                     understocked.size() + " understocked items");
 
-            List<Map<String, Object>> recommendations = new ArrayList<>();
+            List<Map<String, Object>> toSave = new ArrayList<>();
+            List<Map<String, Object>> details = new ArrayList<>();
 
             // 3. Match overstocked with understocked
             for (var over : overstocked) {
@@ -80,27 +140,22 @@ public class RedistributionService {
                             // Calculate priority score
                             int priorityScore = calculatePriority(transferQty, distance, deficit);
 
-                            // Generate recommendation ID
-                            String recId = "REC-" + UUID.randomUUID().toString().substring(0, 8);
-
-                            // Save to database
-                            String insertSql = "INSERT INTO ECOPATH_DB.PUBLIC.analytics_redistribution_recommendations " +
-                                    "(recommendation_id, from_facility_id, to_facility_id, item_id, " +
-                                    "recommended_quantity, priority_score, reason, status, created_at) " +
-                                    "VALUES (?, ?, ?, ?, ?, ?, ?, 'PENDING', CURRENT_TIMESTAMP())";
-
                             String reason = String.format(
                                     "Transfer %d units from %s (surplus) to %s (deficit). Distance: %.1f km",
                                     transferQty, over.get("FACILITY_NAME"),
                                     under.get("FACILITY_NAME"), distance
                             );
 
-                            jdbcTemplate.update(insertSql, recId,
-                                    over.get("FACILITY_ID"), under.get("FACILITY_ID"),
-                                    over.get("ITEM_ID"), transferQty, priorityScore, reason);
+                            toSave.add(Map.of(
+                                    "fromFacilityId", over.get("FACILITY_ID"),
+                                    "toFacilityId", under.get("FACILITY_ID"),
+                                    "itemId", over.get("ITEM_ID"),
+                                    "quantity", transferQty,
+                                    "priority", priorityScore,
+                                    "reason", reason
+                            ));
 
-                            recommendations.add(Map.of(
-                                    "recommendation_id", recId,
+                            details.add(Map.of(
                                     "from_facility", over.get("FACILITY_NAME"),
                                     "to_facility", under.get("FACILITY_NAME"),
                                     "item", over.get("ITEM_NAME"),
@@ -117,6 +172,16 @@ public class RedistributionService {
                 }
             }
 
+            // 4. Save semua recommendation dalam satu batch INSERT
+            List<String> ids = saveRecommendations(toSave);
+
+            List<Map<String, Object>> recommendations = new ArrayList<>();
+            for (int i = 0; i < details.size(); i++) {
+                Map<String, Object> rec = new HashMap<>(details.get(i));
+                rec.put("recommendation_id", ids.get(i));
+                recommendations.add(rec);
+            }
+
             System.out.println("Generated " + recommendations.size() + " recommendations");
 
             return Map.of(
@@ -132,6 +197,43 @@ public class RedistributionService {
         }
     }
 
+    /**
+     * Simpan recommendations dengan satu batch INSERT.
+     * Tiap map butuh fromFacilityId, toFacilityId, itemId, quantity, priority, reason.
+     * Return recommendation_id sesuai urutan input.
+     */
+    public List<String> saveRecommendations(List<Map<String, Object>> recommendations) {
+        String insertSql = "INSERT INTO ECOPATH_DB.PUBLIC.analytics_redistribution_recommendations " +
+                "(recommendation_id, from_facility_id, to_facility_id, item_id, " +
+                "recommended_quantity, priority_score, reason, status, created_at) " +
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 'PENDING', CURRENT_TIMESTAMP())";
+
+        List<String> ids = new ArrayList<>();
+        List<Object[]> batchArgs = new ArrayList<>();
+
+        for (var rec : recommendations) {
+            String recId = "REC-" + UUID.randomUUID().toString().substring(0, 8);
+            ids.add(recId);
+            batchArgs.add(new Object[]{
+                    recId,
+                    rec.get("fromFacilityId"),
+                    rec.get("toFacilityId"),
+                    rec.get("itemId"),
+                    ((Number) rec.get("quantity")).intValue(),
+                    ((Number) rec.get("priority")).intValue(),
+                    rec.get("reason")
+            });
+        }
+
+        if (!batchArgs.isEmpty()) {
+            jdbcTemplate.batchUpdate(insertSql, batchArgs);
+            System.out.println("Saved " + batchArgs.size() + " recommendations in one batch");
+            eventService.publish("recommendations-generated", List.of(EventService.TOPIC_PENDING), batchArgs.size());
+        }
+
+        return ids;
+    }
+
     /**
      * Calculate distance (Haversine formula)
      */
@@ -166,41 +268,9 @@ public class RedistributionService {
      */
     public List<Map<String, Object>> getPendingRecommendations() {
         try {
-            String sql = "SELECT " +
-                    "r.recommendation_id, " +
-                    "r.from_facility_id, " +
-                    "r.to_facility_id, " +
-                    "r.item_id, " +
-                    "r.recommended_quantity, " +
-                    "r.priority_score, " +
-                    "r.status, " +
-                    "r.reason, " +
-                    "r.created_at, " +
-                    "fs.facility_name as from_facility_name, " +
-                    "fd.facility_name as to_facility_name, " +
-                    "m.item_name, " +
-                    "inv_from.current_stock as from_current_stock, " +
-                    "inv_to.current_stock as to_current_stock, " +
-                    "(inv_from.current_stock - r.recommended_quantity) as from_after_stock, " +
-                    "(inv_to.current_stock + r.recommended_quantity) as to_after_stock, " +
-                    "r.priority_score as priority " +
-                    "FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS r " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities fs " +
-                    "  ON r.from_facility_id = fs.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities fd " +
-                    "  ON r.to_facility_id = fd.facility_id " +
-                    "JOIN ECOPATH_DB.PUBLIC.dim_medical_items m " +
-                    "  ON r.item_id = m.item_id " +
-                    "LEFT JOIN ECOPATH_DB.PUBLIC.fact_inventory inv_from " +
-                    "  ON r.from_facility_id = inv_from.facility_id " +
-                    "  AND r.item_id = inv_from.item_id " +
-                    "LEFT JOIN ECOPATH_DB.PUBLIC.fact_inventory inv_to " +
-                    "  ON r.to_facility_id = inv_to.facility_id " +
-                    "  AND r.item_id = inv_to.item_id " +
-                    "WHERE r.status = 'PENDING' " +
-                    "ORDER BY r.priority_score DESC, r.created_at DESC";
-
-            List<Map<String, Object>> results = jdbcTemplate.queryForList(sql);
+            List<Map<String, Object>> results = jdbcTemplate.queryForList(
+                    PENDING_SELECT + "FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS r " +
+                            PENDING_JOINS + "WHERE r.status = 'PENDING' " + PENDING_ORDER);
             System.out.println("Pending recommendations found: " + results.size());
 
             return results;
@@ -212,77 +282,178 @@ public class RedistributionService {
         }
     }
 
+    /**
+     * Jumlah recommendation yang masih PENDING
+     */
+    public int countPending() {
+        Integer total = jdbcTemplate.queryForObject(
+                "SELECT COUNT(*) FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
+                        "WHERE status = 'PENDING'",
+                Integer.class);
+        return total == null ? 0 : total;
+    }
+
+    /**
+     * Satu halaman pending recommendations dengan priority_score >= minPriority.
+     * Limit/offset dijalankan sebelum join, jadi hanya baris yang tampil yang di-join.
+     */
+    public Map<String, Object> getPendingPage(int minPriority, int limit, int offset) {
+        Integer total = jdbcTemplate.queryForObject(
+                "SELECT COUNT(*) FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
+                        "WHERE status = 'PENDING' AND priority_score >= ?",
+                Integer.class, minPriority);
+
+        List<Map<String, Object>> page = jdbcTemplate.queryForList(
+                PENDING_SELECT +
+                        "FROM (SELECT * FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
+                        "      WHERE status = 'PENDING' AND priority_score >= ? " +
+                        "      ORDER BY priority_score DESC, created_at DESC, recommendation_id " +
+                        "      LIMIT ? OFFSET ?) r " +
+                        PENDING_JOINS + PENDING_ORDER,
+                minPriority, limit, offset);
+
+        return Map.of(
+                "total", total == null ? 0 : total,
+                "limit", limit,
+                "offset", offset,
+                "recommendations", page
+        );
+    }
+
     /**
      * Approve recommendation
      */
     public String approveRecommendation(String recommendationId, String approvedBy) {
         try {
-            // Get recommendation details
-            String selectSql = "SELECT * FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
-                    "WHERE recommendation_id = ?";
-
-            List<Map<String, Object>> results = jdbcTemplate.queryForList(selectSql, recommendationId);
+            Map<String, Object> result = approveRecommendations(List.of(recommendationId), approvedBy);
 
-            if (results.isEmpty()) {
-                return "Error: Recommendation not found";
+            if (((Number) result.get("approved")).intValue() == 0) {
+                return "Error: Recommendation not found or not pending";
             }
 
-            Map<String, Object> rec = results.get(0);
-            String fromFacilityId = (String) rec.get("FROM_FACILITY_ID");
-            String toFacilityId = (String) rec.get("TO_FACILITY_ID");
-            String itemId = (String) rec.get("ITEM_ID");
-            int quantity = ((Number) rec.get("RECOMMENDED_QUANTITY")).intValue();
+            System.out.println("Approved redistribution: " + recommendationId);
 
-            // Update status to APPROVED
-            String updateSql = "UPDATE ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
-                    "SET status = 'APPROVED', " +
-                    "    approved_by = ?, " +
-                    "    approved_at = CURRENT_TIMESTAMP() " +
-                    "WHERE recommendation_id = ?";
+            return "Redistribution approved successfully! Stock updated.";
 
-            jdbcTemplate.update(updateSql, approvedBy, recommendationId);
+        } catch (Exception e) {
+            System.err.println("Error approving recommendation: " + e.getMessage());
+            e.printStackTrace();
+            return "Error: " + e.getMessage();
+        }
+    }
 
-            // Update inventory stocks
-            // Reduce from source
-            String reduceStockSql = "UPDATE ECOPATH_DB.PUBLIC.fact_inventory " +
-                    "SET current_stock = current_stock - ?, " +
-                    "    last_updated = CURRENT_TIMESTAMP() " +
-                    "WHERE facility_id = ? AND item_id = ?";
+    /**
+     * Approve banyak recommendation dalam satu transaksi: satu UPDATE status,
+     * satu MERGE stok (delta per facility/item) dan satu batch INSERT transaksi.
+     * Id yang tidak ada / bukan PENDING dilewati; error apa pun me-rollback semuanya.
+     */
+    public Map<String, Object> approveRecommendations(List<String> recommendationIds, String approvedBy) {
+        List<String> ids = new ArrayList<>(new LinkedHashSet<>(recommendationIds));
+        if (ids.isEmpty()) {
+            return Map.of("approved", 0, "approved_ids", List.of(), "skipped_ids", List.of());
+        }
 
-            jdbcTemplate.update(reduceStockSql, quantity, fromFacilityId, itemId);
+        Map<String, Object[]> deltas = new LinkedHashMap<>();
 
-            // Add to destination
-            String addStockSql = "UPDATE ECOPATH_DB.PUBLIC.fact_inventory " +
-                    "SET current_stock = current_stock + ?, " +
-                    "    last_updated = CURRENT_TIMESTAMP() " +
-                    "WHERE facility_id = ? AND item_id = ?";
+        List<String> approvedIds = transactionTemplate.execute(status -> {
+            List<Map<String, Object>> pending = jdbcTemplate.queryForList(
+                    "SELECT recommendation_id, from_facility_id, to_facility_id, item_id, recommended_quantity " +
+                            "FROM ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
+                            "WHERE status = 'PENDING' AND recommendation_id IN (" + placeholders(ids.size()) + ")",
+                    ids.toArray());
 
-            jdbcTemplate.update(addStockSql, quantity, toFacilityId, itemId);
+            if (pending.isEmpty()) {
+                return List.of();
+            }
 
-            // Record transaction for both facilities
-            String transactionId = "TRX-" + java.util.UUID.randomUUID().toString().substring(0, 8);
+            List<String> found = new ArrayList<>();
+            List<Object[]> transactions = new ArrayList<>();
+
+            for (var rec : pending) {
+                String recId = (String) rec.get("RECOMMENDATION_ID");
+                String fromFacilityId = (String) rec.get("FROM_FACILITY_ID");
+                String toFacilityId = (String) rec.get("TO_FACILITY_ID");
+                String itemId = (String) rec.get("ITEM_ID");
+                int quantity = ((Number) rec.get("RECOMMENDED_QUANTITY")).intValue();
+
+                found.add(recId);
+                addDelta(deltas, fromFacilityId, itemId, -quantity);
+                addDelta(deltas, toFacilityId, itemId, quantity);
+
+                String transactionId = "TRX-" + UUID.randomUUID().toString().substring(0, 8);
+                transactions.add(new Object[]{transactionId + "-OUT", fromFacilityId, itemId,
+                        "OUT", quantity, "Redistribution to another facility"});
+                transactions.add(new Object[]{transactionId + "-IN", toFacilityId, itemId,
+                        "IN", quantity, "Redistribution from another facility"});
+            }
 
-            String insertTransactionSql = "INSERT INTO ECOPATH_DB.PUBLIC.fact_stock_transactions " +
-                    "(transaction_id, facility_id, item_id, transaction_type, " +
-                    "quantity, transaction_date, notes) " +
-                    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP(), ?)";
+            // 1. Status, hanya yang masih PENDING
+            List<Object> statusArgs = new ArrayList<>();
+            statusArgs.add(approvedBy);
+            statusArgs.addAll(found);
+
+            int updated = jdbcTemplate.update(
+                    "UPDATE ECOPATH_DB.PUBLIC.ANALYTICS_REDISTRIBUTION_RECOMMENDATIONS " +
+                            "SET status = 'APPROVED', " +
+                            "    approved_by = ?, " +
+                            "    approved_at = CURRENT_TIMESTAMP() " +
+                            "WHERE status = 'PENDING' AND recommendation_id IN (" + placeholders(found.size()) + ")",
+                    statusArgs.toArray());
+
+            if (updated != found.size()) {
+                throw new IllegalStateException("Recommendations changed while approving, nothing was approved");
+            }
 
-            // OUT from source
-            jdbcTemplate.update(insertTransactionSql, transactionId + "-OUT", fromFacilityId, itemId,
-                    "OUT", quantity, "Redistribution to another facility");
+            // 2. Semua perubahan stok sekaligus
+            jdbcTemplate.update(
+                    "MERGE INTO ECOPATH_DB.PUBLIC.fact_inventory t " +
+                            "USING (SELECT column1 AS facility_id, column2 AS item_id, column3::INTEGER AS delta " +
+                            "       FROM VALUES " + String.join(", ", Collections.nCopies(deltas.size(), "(?, ?, ?)")) +
+                            "      ) s " +
+                            "ON t.facility_id = s.facility_id AND t.item_id = s.item_id " +
+                            "WHEN MATCHED THEN UPDATE SET " +
+                            "   current_stock = t.current_stock + s.delta, " +
+                            "   last_updated = CURRENT_TIMESTAMP()",
+                    deltas.values().stream().flatMap(Arrays::stream).toArray());
+
+            // 3. OUT dan IN untuk tiap recommendation
+            jdbcTemplate.batchUpdate(InventoryService.INSERT_TRANSACTION_SQL, transactions);
+
+            return found;
+        });
+
+        inventoryService.refreshAnomalies(deltas.values().stream()
+                .map(delta -> new Object[]{delta[0], delta[1]})
+                .toList());
+
+        List<String> skipped = new ArrayList<>(ids);
+        skipped.removeAll(approvedIds);
+
+        if (!approvedIds.isEmpty()) {
+            eventService.publish("recommendations-approved", List.of(
+                    EventService.TOPIC_PENDING, EventService.TOPIC_APPROVED, EventService.TOPIC_INVENTORY),
+                    approvedIds.size());
+        }
 
-            // IN to destination
-            jdbcTemplate.update(insertTransactionSql, transactionId + "-IN", toFacilityId, itemId,
-                    "IN", quantity, "Redistribution from another facility");
+        System.out.println("Approved " + approvedIds.size() + " redistributions in one transaction" +
+                (skipped.isEmpty() ? "" : ", skipped " + skipped.size()));
 
-            System.out.println("Approved redistribution: " + recommendationId);
+        return Map.of(
+                "approved", approvedIds.size(),
+                "approved_ids", approvedIds,
+                "skipped_ids", skipped,
+                "stock_rows_changed", deltas.size()
+        );
+    }
 
-            return "Redistribution approved successfully! Stock updated.";
+    private static void addDelta(Map<String, Object[]> deltas, String facilityId, String itemId, int quantity) {
+        Object[] delta = deltas.computeIfAbsent(facilityId + "|" + itemId,
+                key -> new Object[]{facilityId, itemId, 0});
+        delta[2] = (Integer) delta[2] + quantity;
+    }
 
-        } catch (Exception e) {
-            System.err.println("Error approving recommendation: " + e.getMessage());
-            e.printStackTrace();
-            return "Error: " + e.getMessage();
-        }
+    private static String placeholders(int count) {
+        return String.join(", ", Collections.nCopies(count, "?"));
     }
+
 }
\ No newline at end of file
@@ -0,0 +1,176 @@
+package com.ecopath.service;
+
+import org.springframework.dao.DataAccessException;
+import org.springframework.jdbc.core.JdbcTemplate;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.support.TransactionTemplate;
+
+import java.sql.Date;
+import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Rollup harian nurse reports (analytics_nurse_reports_daily) untuk dashboard.
+ * Satu baris per tanggal + disease + severity; setiap laporan masuk hanya
+ * menghitung ulang hari laporan itu, jadi biaya dashboard tidak ikut tumbuh
+ * dengan jumlah laporan.
+ */
+@Service
+public class ReportRollupService {
+
+    // Hari terakhir fact_nurse_reports yang dibaca untuk "Recent Reports"
+    private static final int RECENT_DAYS = 30;
+
+    private static final String ROLLUP_COLUMNS = "report_date, disease_detected, severity_level, " +
+            "report_count, total_patients, last_updated";
+
+    private static final String ROLLUP_SOURCE_SQL = "SELECT report_date, disease_detected, severity_level, " +
+            "COUNT(*) AS report_count, " +
+            "SUM(patient_count) AS total_patients, " +
+            "MAX(created_at) AS last_updated " +
+            "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports ";
+
+    private static final String ROLLUP_GROUP = "GROUP BY report_date, disease_detected, severity_level";
+
+    private static final String ROLLUP_TABLE = "ECOPATH_DB.PUBLIC.analytics_nurse_reports_daily";
+
+    private static final String ROLLUP_REFRESH_SQL = "INSERT OVERWRITE INTO " + ROLLUP_TABLE +
+            " (" + ROLLUP_COLUMNS + ") " + ROLLUP_SOURCE_SQL + ROLLUP_GROUP;
+
+    // Severity laporan bisa berubah saat di-update, jadi satu hari dihapus lalu dihitung ulang
+    private static final String ROLLUP_DELETE_DAY_SQL = "DELETE FROM " + ROLLUP_TABLE + " WHERE report_date = ?";
+
+    private static final String ROLLUP_INSERT_DAY_SQL = "INSERT INTO " + ROLLUP_TABLE +
+            " (" + ROLLUP_COLUMNS + ") " + ROLLUP_SOURCE_SQL + "WHERE report_date = ? " + ROLLUP_GROUP;
+
+    // Tanpa rollup (tabel belum dibuat): agregasi yang sama langsung dari fact_nurse_reports
+    private static final String LIVE_SOURCE = "(" + ROLLUP_SOURCE_SQL + ROLLUP_GROUP + ")";
+
+    // %s = sumber rollup, %s = filter tanggal opsional
+    private static final String BREAKDOWN_SQL = "SELECT disease_detected, severity_level, " +
+            "GROUPING(disease_detected) AS by_severity, " +
+            "SUM(report_count) AS report_count, " +
+            "SUM(total_patients) AS total_patients " +
+            "FROM %s s %s" +
+            "GROUP BY GROUPING SETS ((disease_detected), (severity_level)) " +
+            "ORDER BY total_patients DESC";
+
+    private static final String TOTALS_SQL = "SELECT " +
+            "(SELECT COUNT(*) FROM ECOPATH_DB.PUBLIC.dim_health_facilities) as total_facilities, " +
+            "(SELECT COUNT(*) FROM ECOPATH_DB.PUBLIC.dim_medical_items) as total_items, " +
+            "(SELECT COUNT(*) FROM ECOPATH_DB.PUBLIC.fact_inventory) as total_inventory, " +
+            "(SELECT COALESCE(SUM(report_count), 0) FROM %s s) as total_reports";
+
+    // %s = filter tanggal opsional
+    private static final String RECENT_SQL = "SELECT f.facility_name, r.disease_detected, r.severity_level, " +
+            "r.patient_count AS total_patients, " +
+            "r.report_date AS last_report_date, " +
+            "r.created_at AS last_updated " +
+            "FROM ECOPATH_DB.PUBLIC.fact_nurse_reports r " +
+            "JOIN ECOPATH_DB.PUBLIC.dim_health_facilities f " +
+            "  ON r.facility_id = f.facility_id " +
+            "%s" +
+            "ORDER BY r.created_at DESC " +
+            "LIMIT ?";
+
+    private final JdbcTemplate jdbcTemplate;
+    private final TransactionTemplate transactionTemplate;
+    private final EventService eventService;
+
+    // false setelah refresh per hari gagal: summary berikutnya rebuild penuh dulu
+    private volatile boolean rollupValid = true;
+
+    public ReportRollupService(JdbcTemplate jdbcTemplate, TransactionTemplate transactionTemplate,
+                               EventService eventService) {
+        this.jdbcTemplate = jdbcTemplate;
+        this.transactionTemplate = transactionTemplate;
+        this.eventService = eventService;
+    }
+
+    /**
+     * Rebuild analytics_nurse_reports_daily dari seluruh fact_nurse_reports (satu pass)
+     */
+    public void refreshRollup() {
+        int rows = jdbcTemplate.update(ROLLUP_REFRESH_SQL);
+        rollupValid = true;
+        System.out.println("Report rollup rebuilt: " + rows + " rows");
+    }
+
+    /**
+     * Hitung ulang baris rollup satu tanggal setelah laporan hari itu berubah,
+     * lalu kabari client bahwa data laporan berubah
+     */
+    public void refreshRollup(LocalDate reportDate) {
+        try {
+            Date day = Date.valueOf(reportDate);
+            transactionTemplate.executeWithoutResult(status -> {
+                jdbcTemplate.update(ROLLUP_DELETE_DAY_SQL, day);
+                jdbcTemplate.update(ROLLUP_INSERT_DAY_SQL, day);
+            });
+        } catch (DataAccessException e) {
+            // Rebuild penuh saat summary berikutnya yang membetulkan
+            System.err.println("Error refreshing report rollup: " + e.getMessage());
+            rollupValid = false;
+        }
+        eventService.publish("reports-updated", List.of(EventService.TOPIC_REPORTS), 1);
+    }
+
+    /**
+     * Dashboard: total, pasien/laporan per disease dan per severity (days terakhir, 0 = semua)
+     * dan recentLimit laporan terbaru
+     */
+    public Map<String, Object> dashboardSummary(int days, int recentLimit) {
+        String dateFilter = days > 0 ? "WHERE s.report_date >= DATEADD(day, " + (-days) + ", CURRENT_DATE()) " : "";
+
+        String source = "rollup";
+        List<Map<String, Object>> breakdown;
+        Map<String, Object> totals;
+        try {
+            if (!rollupValid) {
+                refreshRollup();
+            }
+            breakdown = jdbcTemplate.queryForList(String.format(BREAKDOWN_SQL, ROLLUP_TABLE, dateFilter));
+            totals = jdbcTemplate.queryForMap(String.format(TOTALS_SQL, ROLLUP_TABLE));
+        } catch (DataAccessException e) {
+            // Rollup belum dibuat (lihat create_views.sql): agregasi langsung
+            System.err.println("Report rollup unavailable, aggregating live: " + e.getMessage());
+            source = "live";
+            breakdown = jdbcTemplate.queryForList(String.format(BREAKDOWN_SQL, LIVE_SOURCE, dateFilter));
+            totals = jdbcTemplate.queryForMap(String.format(TOTALS_SQL, LIVE_SOURCE));
+        }
+
+        List<Map<String, Object>> diseases = new ArrayList<>();
+        List<Map<String, Object>> severities = new ArrayList<>();
+        for (Map<String, Object> row : breakdown) {
+            boolean bySeverity = ((Number) row.get("BY_SEVERITY")).intValue() == 1;
+            String column = bySeverity ? "SEVERITY_LEVEL" : "DISEASE_DETECTED";
+
+            Map<String, Object> group = new LinkedHashMap<>();
+            group.put(column, row.get(column));
+            group.put("REPORT_COUNT", row.get("REPORT_COUNT"));
+            group.put("TOTAL_PATIENTS", row.get("TOTAL_PATIENTS"));
+            (bySeverity ? severities : diseases).add(group);
+        }
+
+        // Laporan terbaru dari beberapa hari terakhir saja; kalau kosong, yang terakhir dari semua
+        List<Map<String, Object>> recent = jdbcTemplate.queryForList(
+                String.format(RECENT_SQL, "WHERE r.report_date >= DATEADD(day, " + (-RECENT_DAYS) + ", CURRENT_DATE()) "),
+                recentLimit);
+        if (recent.isEmpty()) {
+            recent = jdbcTemplate.queryForList(String.format(RECENT_SQL, ""), recentLimit);
+        }
+
+        Map<String, Object> summary = new HashMap<>();
+        summary.put("statistics", totals);
+        summary.put("diseases", diseases);
+        summary.put("severities", severities);
+        summary.put("recent", recent);
+        summary.put("days", days);
+        summary.put("source", source);
+        return summary;
+    }
+}
@@ -0,0 +1,39 @@
+package com.ecopath.service;
+
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.boot.autoconfigure.condition.ConditionalOnProperty;
+import org.springframework.stereotype.Component;
+
+import java.time.LocalDate;
+import java.util.Objects;
+import java.util.Random;
+
+/**
+ * Provider lokal tanpa network (weather.provider=stub): data deterministik per koordinat
+ * dan tanggal, dengan latency buatan supaya pipeline bisa di-benchmark offline
+ */
+@Component
+@ConditionalOnProperty(name = "weather.provider", havingValue = "stub")
+public class StubWeatherProvider implements WeatherProvider {
+
+    private static final String[] CONDITIONS = {"Clear", "Clouds", "Rain", "Thunderstorm", "Drizzle"};
+
+    @Value("${weather.stub.latency-ms:200}")
+    private long latencyMs;
+
+    @Override
+    public Reading fetch(double lat, double lon) throws Exception {
+        Thread.sleep(latencyMs);
+
+        Random random = new Random(Objects.hash(lat, lon, LocalDate.now()));
+        String condition = CONDITIONS[random.nextInt(CONDITIONS.length)];
+        boolean wet = condition.equals("Rain") || condition.equals("Thunderstorm") || condition.equals("Drizzle");
+
+        return new Reading(
+                24 + random.nextDouble() * 9,
+                60 + random.nextDouble() * 35,
+                wet ? random.nextDouble() * 25 : 0.0,
+                condition
+        );
+    }
+}
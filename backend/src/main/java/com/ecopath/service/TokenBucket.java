@@ -0,0 +1,51 @@
+package com.ecopath.service;
+
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Token bucket rate limiter: ratePerSecond token per detik, maksimal capacity token (burst)
+ */
+public class TokenBucket {
+
+    private final double ratePerSecond;
+    private final double capacity;
+
+    private double tokens;
+    private long lastRefill;
+
+    public TokenBucket(double ratePerSecond, int capacity) {
+        if (ratePerSecond <= 0 || capacity < 1) {
+            throw new IllegalArgumentException("ratePerSecond must be > 0 and capacity >= 1");
+        }
+        this.ratePerSecond = ratePerSecond;
+        this.capacity = capacity;
+        this.tokens = capacity;
+        this.lastRefill = System.nanoTime();
+    }
+
+    /**
+     * Tunggu sampai ada token, lalu ambil satu
+     */
+    public void acquire() throws InterruptedException {
+        while (true) {
+            long waitNanos;
+
+            synchronized (this) {
+                refill();
+                if (tokens >= 1) {
+                    tokens -= 1;
+                    return;
+                }
+                waitNanos = (long) ((1 - tokens) / ratePerSecond * TimeUnit.SECONDS.toNanos(1));
+            }
+
+            TimeUnit.NANOSECONDS.sleep(Math.max(waitNanos, 1));
+        }
+    }
+
+    private void refill() {
+        long now = System.nanoTime();
+        tokens = Math.min(capacity, tokens + (now - lastRefill) / (double) TimeUnit.SECONDS.toNanos(1) * ratePerSecond);
+        lastRefill = now;
+    }
+}
@@ -0,0 +1,12 @@
+package com.ecopath.service;
+
+/**
+ * Sumber data cuaca untuk satu koordinat (OpenWeather, stub lokal, ...)
+ */
+public interface WeatherProvider {
+
+    record Reading(double temperature, double humidity, double rainfall, String condition) {
+    }
+
+    Reading fetch(double lat, double lon) throws Exception;
+}
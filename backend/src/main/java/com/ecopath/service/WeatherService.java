@@ -1,66 +1,77 @@
 package com.ecopath.service;
 
-import com.fasterxml.jackson.databind.JsonNode;
-import com.fasterxml.jackson.databind.ObjectMapper;
+import jakarta.annotation.PreDestroy;
 import org.springframework.beans.factory.annotation.Value;
 import org.springframework.jdbc.core.JdbcTemplate;
 import org.springframework.stereotype.Service;
-import org.springframework.web.client.RestTemplate;
 
 import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
 import java.util.UUID;
+import java.util.concurrent.CompletionService;
+import java.util.concurrent.ExecutorCompletionService;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
 
 @Service
 public class WeatherService {
 
-    private final JdbcTemplate jdbcTemplate;
-    private final RestTemplate restTemplate = new RestTemplate();
-    private final ObjectMapper objectMapper = new ObjectMapper();
+    public static final String FETCH_ALL_JOB = "weather-fetch-all";
 
-    @Value("${weather.api.key}")
-    private String apiKey;
+    // Row yang dikumpulkan sebelum satu batch insert
+    private static final int INSERT_BATCH_SIZE = 100;
 
-    @Value("${weather.api.url}")
-    private String apiUrl;
+    private static final String INSERT_SQL = "INSERT INTO ECOPATH_DB.PUBLIC.fact_weather_data " +
+            "(weather_id, facility_id, date, temperature_avg, humidity_avg, " +
+            "rainfall_mm, weather_condition, created_at) " +
+            "VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP())";
 
-    public WeatherService(JdbcTemplate jdbcTemplate) {
+    private final JdbcTemplate jdbcTemplate;
+    private final WeatherProvider provider;
+    private final TokenBucket rateLimiter;
+    private final JobService jobService;
+    private final ExecutorService fetchPool;
+
+    public WeatherService(JdbcTemplate jdbcTemplate,
+                          WeatherProvider provider,
+                          JobService jobService,
+                          @Value("${weather.rate-per-second:1}") double ratePerSecond,
+                          @Value("${weather.burst:5}") int burst,
+                          @Value("${weather.max-concurrency:8}") int maxConcurrency) {
         this.jdbcTemplate = jdbcTemplate;
+        this.provider = provider;
+        this.jobService = jobService;
+        this.rateLimiter = new TokenBucket(ratePerSecond, burst);
+        this.fetchPool = Executors.newFixedThreadPool(maxConcurrency);
+    }
+
+    @PreDestroy
+    public void shutdown() {
+        fetchPool.shutdownNow();
     }
 
     /**
-     * Fetch weather data dari OpenWeather API dan simpan ke Snowflake
+     * Fetch weather data dari provider dan simpan ke Snowflake
      */
     public String fetchAndStoreWeather(String facilityId, double lat, double lon) {
         try {
-            // 1. Fetch dari OpenWeather API
-            String url = String.format("%s?lat=%f&lon=%f&appid=%s&units=metric",
-                    apiUrl, lat, lon, apiKey);
-
-            System.out.println("📡 Fetching weather from: " + url);
-
-            String response = restTemplate.getForObject(url, String.class);
-            JsonNode root = objectMapper.readTree(response);
+            // 1. Fetch dari provider (OpenWeather / stub)
+            rateLimiter.acquire();
+            WeatherProvider.Reading reading = provider.fetch(lat, lon);
 
             // 2. Parse response
             String weatherId = "WTH-" + UUID.randomUUID().toString().substring(0, 8);
-            double temp = root.path("main").path("temp").asDouble();
-            double humidity = root.path("main").path("humidity").asDouble();
-            double rainfall = root.path("rain").path("1h").asDouble(0.0);
-            String condition = root.path("weather").get(0).path("main").asText();
 
-            System.out.println("Temperature: " + temp + "°C");
-            System.out.println("Humidity: " + humidity + "%");
-            System.out.println("Rainfall: " + rainfall + " mm");
-            System.out.println("Condition: " + condition);
+            System.out.println("Temperature: " + reading.temperature() + "°C");
+            System.out.println("Humidity: " + reading.humidity() + "%");
+            System.out.println("Rainfall: " + reading.rainfall() + " mm");
+            System.out.println("Condition: " + reading.condition());
 
             // 3. Insert ke Snowflake
-            String sql = "INSERT INTO ECOPATH_DB.PUBLIC.fact_weather_data " +
-                    "(weather_id, facility_id, date, temperature_avg, humidity_avg, " +
-                    "rainfall_mm, weather_condition, created_at) " +
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP())";
-
-            jdbcTemplate.update(sql, weatherId, facilityId, LocalDate.now().toString(),
-                    temp, humidity, rainfall, condition);
+            jdbcTemplate.update(INSERT_SQL, weatherId, facilityId, LocalDate.now().toString(),
+                    reading.temperature(), reading.humidity(), reading.rainfall(), reading.condition());
 
             System.out.println("Weather data stored for facility: " + facilityId);
 
@@ -74,41 +85,85 @@ public class WeatherService {
     }
 
     /**
-     * Fetch weather untuk semua fasilitas
+     * Mulai fetch weather untuk semua fasilitas sebagai background job.
+     * Jika masih ada job yang jalan, job itu yang dikembalikan.
      */
-    public String fetchWeatherForAllFacilities() {
-        try {
-            String sql = "SELECT facility_id, facility_name, latitude, longitude " +
-                    "FROM ECOPATH_DB.PUBLIC.dim_health_facilities";
+    public Map<String, Object> startFetchAll() {
+        return jobService.submitExclusive(FETCH_ALL_JOB, this::fetchAll);
+    }
 
-            var facilities = jdbcTemplate.queryForList(sql);
+    private Map<String, Object> fetchAll(JobService.Progress progress) throws Exception {
+        String sql = "SELECT facility_id, facility_name, latitude, longitude " +
+                "FROM ECOPATH_DB.PUBLIC.dim_health_facilities";
 
-            int successCount = 0;
-            int failCount = 0;
+        List<Map<String, Object>> facilities = jdbcTemplate.queryForList(sql);
+        progress.setTotal(facilities.size());
 
-            for (var facility : facilities) {
-                String facilityId = (String) facility.get("FACILITY_ID");
-                double lat = ((Number) facility.get("LATITUDE")).doubleValue();
-                double lon = ((Number) facility.get("LONGITUDE")).doubleValue();
+        CompletionService<Object[]> completion = new ExecutorCompletionService<>(fetchPool);
+        String date = LocalDate.now().toString();
 
+        // Fetch paralel (dibatasi pool + token bucket)
+        for (Map<String, Object> facility : facilities) {
+            completion.submit(() -> {
+                String facilityId = (String) facility.get("FACILITY_ID");
                 try {
-                    fetchAndStoreWeather(facilityId, lat, lon);
-                    successCount++;
+                    double lat = ((Number) facility.get("LATITUDE")).doubleValue();
+                    double lon = ((Number) facility.get("LONGITUDE")).doubleValue();
 
-                    // Delay 1 detik untuk avoid rate limit
-                    Thread.sleep(1000);
+                    rateLimiter.acquire();
+                    WeatherProvider.Reading reading = provider.fetch(lat, lon);
 
+                    return new Object[]{
+                            "WTH-" + UUID.randomUUID().toString().substring(0, 8),
+                            facilityId, date,
+                            reading.temperature(), reading.humidity(), reading.rainfall(), reading.condition()
+                    };
                 } catch (Exception e) {
-                    failCount++;
-                    System.err.println("Failed for facility: " + facilityId);
+                    progress.addError(facilityId + ": " + e.getMessage());
+                    return null;
                 }
-            }
+            });
+        }
 
-            return String.format("Weather fetch completed: %d success, %d failed",
-                    successCount, failCount);
+        // Kumpulkan hasil sesuai urutan selesai, insert per INSERT_BATCH_SIZE
+        List<Object[]> buffer = new ArrayList<>();
+        int stored = 0;
+        int failed = 0;
 
-        } catch (Exception e) {
-            return "Error: " + e.getMessage();
+        for (int i = 0; i < facilities.size(); i++) {
+            Object[] row = completion.take().get();
+
+            if (row == null) {
+                failed++;
+            } else {
+                buffer.add(row);
+            }
+            if (buffer.size() >= INSERT_BATCH_SIZE) {
+                stored += flush(buffer);
+            }
+            progress.advance(1);
+        }
+        stored += flush(buffer);
+
+        String message = String.format("Weather fetch completed: %d success, %d failed", stored, failed);
+        progress.setMessage(message);
+        System.out.println(message);
+
+        return Map.of(
+                "total", facilities.size(),
+                "stored", stored,
+                "failed", failed,
+                "message", message
+        );
+    }
+
+    private int flush(List<Object[]> rows) {
+        if (rows.isEmpty()) {
+            return 0;
         }
+        int count = rows.size();
+        jdbcTemplate.batchUpdate(INSERT_SQL, rows);
+        rows.clear();
+        return count;
     }
-}
\ No newline at end of file
+}
@@ -20,4 +20,72 @@ FROM fact_nurse_reports r
 JOIN dim_health_facilities f 
   ON r.facility_id = f.facility_id
 GROUP BY r.facility_id, f.facility_name, r.disease_detected, r.severity_level
-ORDER BY last_updated DESC;
\ No newline at end of file
+ORDER BY last_updated DESC;
+
+-- Table: Nurse Reports Daily Rollup (dipelihara oleh backend)
+-- Satu baris per tanggal + disease + severity. ReportRollupService menghitung
+-- ulang hari laporan setelah setiap laporan masuk; dashboard membaca tabel ini
+-- alih-alih GROUP BY atas seluruh fact_nurse_reports.
+CREATE TABLE IF NOT EXISTS analytics_nurse_reports_daily (
+    report_date DATE,
+    disease_detected VARCHAR(100),
+    severity_level VARCHAR(20),
+    report_count INTEGER,
+    total_patients INTEGER,
+    last_updated TIMESTAMP
+);
+
+-- Initial fill
+INSERT OVERWRITE INTO analytics_nurse_reports_daily
+SELECT
+    report_date,
+    disease_detected,
+    severity_level,
+    COUNT(*) AS report_count,
+    SUM(patient_count) AS total_patients,
+    MAX(created_at) AS last_updated
+FROM fact_nurse_reports
+GROUP BY report_date, disease_detected, severity_level;
+
+-- Table: Inventory Anomalies (summary, dipelihara oleh backend)
+-- Satu baris per facility/item yang understocked, overstocked atau near expiry.
+-- InventoryService merge baris yang berubah setelah update stok dan
+-- full refresh sekali per hari (near expiry bergeser mengikuti tanggal).
+CREATE TABLE IF NOT EXISTS analytics_inventory_anomalies (
+    facility_id VARCHAR,
+    item_id VARCHAR,
+    facility_name VARCHAR,
+    item_name VARCHAR,
+    current_stock INTEGER,
+    min_stock_threshold INTEGER,
+    max_stock_capacity INTEGER,
+    expiry_date DATE,
+    is_understocked BOOLEAN,
+    is_overstocked BOOLEAN,
+    is_near_expiry BOOLEAN,
+    refreshed_at TIMESTAMP
+);
+
+-- Initial fill (satu pass atas fact_inventory)
+INSERT OVERWRITE INTO analytics_inventory_anomalies
+SELECT s.*, CURRENT_TIMESTAMP()
+FROM (
+    SELECT DISTINCT
+        i.facility_id,
+        i.item_id,
+        f.facility_name,
+        m.item_name,
+        i.current_stock,
+        i.min_stock_threshold,
+        i.max_stock_capacity,
+        i.expiry_date,
+        CASE WHEN i.current_stock < i.min_stock_threshold THEN TRUE ELSE FALSE END AS is_understocked,
+        CASE WHEN i.current_stock > i.max_stock_capacity * 0.9 THEN TRUE ELSE FALSE END AS is_overstocked,
+        CASE WHEN DATEDIFF(day, CURRENT_DATE(), i.expiry_date) < 30 THEN TRUE ELSE FALSE END AS is_near_expiry
+    FROM fact_inventory i
+    JOIN dim_health_facilities f
+      ON i.facility_id = f.facility_id
+    JOIN dim_medical_items m
+      ON i.item_id = m.item_id
+) s
+WHERE s.is_understocked OR s.is_overstocked OR s.is_near_expiry;
@@ -0,0 +1,399 @@
+"""
+HTTP helpers for the EcoPath backend.
+
+Kept outside app.py on purpose: Streamlit re-executes the main script on every
+rerun, but imported modules stay loaded, so the response cache below is shared
+by every session served from this process.
+"""
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import registry as metrics, series_name
+
+try:
+    import pyarrow as pa
+except ImportError:  # JSON transport only
+    pa = None
+
+# ========================================
+# CONFIGURATION
+# ========================================
+# Override with ECOPATH_API_URL, e.g. to point at bench/mock_backend.py
+API_BASE_URL = os.environ.get("ECOPATH_API_URL", "https://echopath-production.up.railway.app").rstrip("/")
+
+# Connection pool shared by every session in this process
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 32
+
+# Retries only apply to idempotent methods (GET/HEAD)
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.3
+HTTP_RETRY_STATUSES = (429, 502, 503, 504)
+
+# (connect, read) timeouts in seconds; per-endpoint overrides below
+DEFAULT_GET_TIMEOUT = (3.05, 10)
+DEFAULT_POST_TIMEOUT = (3.05, 30)
+
+# Read timeout between chunks of a streamed download, not for the whole body
+DEFAULT_STREAM_TIMEOUT = (3.05, 300)
+
+# Bulk table endpoints that can answer with an Arrow IPC stream (?format=arrow)
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_ENDPOINTS = {
+    "/test/consumption",
+    "/test/inventory",
+    "/test/reports",
+    "/test/weather",
+    "/services/redistribution/approved",
+}
+
+# Worker threads used to fan out independent GETs
+FETCH_MAX_WORKERS = 16
+
+ENDPOINT_TIMEOUTS = {
+    "/test/health": (3.05, 5),
+    "/test/consumption": (3.05, 60),
+    "/services/reports/process": (3.05, 60),
+    "/services/reports/process-batch": (3.05, 180),
+    "/services/reports/extract": (3.05, 60),
+    "/services/redistribution/generate": (3.05, 60),
+    "/services/redistribution/approve-batch": (3.05, 60),
+    # Long-poll: the backend holds the request for up to ?wait= seconds
+    "/services/events": (3.05, 45),
+}
+
+# TTL in seconds per GET endpoint prefix (longest prefix wins).
+# Endpoints that are not listed here, or map to None, are never cached.
+CACHE_TTL = {
+    "/test/health": 10,
+    "/test/snowflake": 30,
+    "/test/facilities": 600,
+    "/test/inventory": 30,
+    "/test/inventory/changes": None,
+    "/test/reports": 30,
+    "/test/weather": 120,
+    "/services/dashboard/summary": 60,
+    "/services/redistribution/pending": 15,
+    "/services/redistribution/approved": 60,
+}
+
+CACHE_MAX_ENTRIES = 256
+
+# TTL for prefixes kept fresh by change events (see live.py) while the
+# listener is connected; an event evicts them, so expiry is only a backstop
+LIVE_CACHE_TTL = 10 * 60
+
+# GET prefixes made stale by a successful POST to an endpoint
+CACHE_INVALIDATIONS = {
+    "/services/inventory/update": ["/test/inventory", "/services/dashboard"],
+    "/services/redistribution/approve": ["/services/redistribution", "/services/dashboard", "/test/inventory"],
+    "/services/redistribution/approve-batch": ["/services/redistribution", "/services/dashboard", "/test/inventory"],
+    "/services/redistribution/generate": ["/services/redistribution/pending", "/services/dashboard"],
+    "/services/redistribution/bulk": ["/services/redistribution/pending", "/services/dashboard"],
+    "/services/reports/process": ["/test/reports", "/services/dashboard"],
+    "/services/reports/process-batch": ["/test/reports", "/services/dashboard"],
+    "/services/reports/ingest": ["/test/reports", "/services/dashboard"],
+    "/services/weather/fetch": ["/test/weather"],
+    "/services/weather/fetch-all": ["/test/weather"],
+}
+
+# ========================================
+# HTTP SESSION
+# ========================================
+
+class JitteredRetry(Retry):
+    """Retry policy using "full jitter" exponential backoff"""
+
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+
+def _build_session():
+    retry = JitteredRetry(
+        total=HTTP_RETRY_TOTAL,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+# requests.Session is safe to share for plain GET/POST calls; the adapter's
+# urllib3 pool keeps TCP+TLS connections alive between calls.
+_session = _build_session()
+
+
+_fetch_pool = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="api-fetch")
+
+
+def _timeout(endpoint, default):
+    return ENDPOINT_TIMEOUTS.get(endpoint.split("?", 1)[0], default)
+
+# ========================================
+# RESPONSE CACHE
+# ========================================
+
+class ResponseCache:
+    """Thread-safe LRU cache where every entry carries its own expiry time"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prefixes=None):
+        """Drop entries whose key starts with one of prefixes (all when None)"""
+        with self._lock:
+            if prefixes is None:
+                self._entries.clear()
+                return
+
+            prefixes = tuple(prefixes)
+            for key in [k for k in self._entries if k.startswith(prefixes)]:
+                del self._entries[key]
+
+
+_response_cache = ResponseCache(CACHE_MAX_ENTRIES)
+
+
+_live_prefixes = ()
+
+
+def set_live_prefixes(prefixes):
+    """Cache prefixes currently refreshed by change events (empty to stop)"""
+    global _live_prefixes
+    _live_prefixes = tuple(prefixes)
+
+
+def _cache_ttl(endpoint):
+    path = endpoint.split("?", 1)[0]
+    matches = [prefix for prefix in CACHE_TTL if path.startswith(prefix)]
+    if not matches:
+        return None
+    ttl = CACHE_TTL[max(matches, key=len)]
+    if ttl is not None and _live_prefixes and path.startswith(_live_prefixes):
+        return max(ttl, LIVE_CACHE_TTL)
+    return ttl
+
+
+def invalidate_cache(*prefixes):
+    """Evict cached GET responses (everything when called without arguments)"""
+    _response_cache.invalidate(prefixes or None)
+
+# ========================================
+# REQUESTS
+# ========================================
+
+def api_get(endpoint, use_cache=True):
+    """Generic GET request, served from the response cache when fresh.
+
+    Cached responses are shared between callers, so treat them as read-only.
+    """
+    ttl = _cache_ttl(endpoint) if use_cache else None
+    name = series_name(endpoint)
+
+    if ttl is not None:
+        cached = _response_cache.get(endpoint)
+        metrics.count("cache", name, "miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
+    try:
+        started = time.perf_counter()
+        response = _session.get(
+            f"{API_BASE_URL}{endpoint}",
+            timeout=_timeout(endpoint, DEFAULT_GET_TIMEOUT)
+        )
+        metrics.observe("get", name, time.perf_counter() - started, len(response.content))
+        if response.status_code != 200:
+            metrics.count("status", name, str(response.status_code))
+            return {"status": "FAILED", "error": f"HTTP {response.status_code}"}
+        with metrics.timed("json", name):
+            result = response.json()
+    except Exception as e:
+        metrics.count("status", name, "error")
+        return {"status": "FAILED", "error": str(e)}
+
+    if ttl is not None and result.get("status") != "FAILED":
+        _response_cache.put(endpoint, result, ttl)
+
+    return result
+
+def _frame_from_rows(rows):
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df.columns = df.columns.str.upper()
+    return df
+
+def _with_param(endpoint, param):
+    return f"{endpoint}{'&' if '?' in endpoint else '?'}{param}"
+
+def api_get_frame(endpoint, key="data", use_cache=True):
+    """GET a bulk table as a DataFrame with upper-case column names.
+
+    Negotiates the Arrow IPC stream format when pyarrow is available and the
+    endpoint supports it; otherwise falls back to the JSON row payload.
+    Returns (df, error) where error is None on success.
+    """
+    if pa is None or endpoint.split("?", 1)[0] not in ARROW_ENDPOINTS:
+        result = api_get(endpoint, use_cache)
+        if result.get("status") == "FAILED":
+            return pd.DataFrame(), result.get("error")
+        with metrics.timed("frame", series_name(endpoint)):
+            return _frame_from_rows(result.get(key, [])), None
+
+    arrow_endpoint = _with_param(endpoint, "format=arrow")
+    ttl = _cache_ttl(endpoint) if use_cache else None
+    name = series_name(endpoint)
+    table = _response_cache.get(arrow_endpoint) if ttl is not None else None
+    if ttl is not None:
+        metrics.count("cache", name, "miss" if table is None else "hit")
+
+    if table is None:
+        try:
+            started = time.perf_counter()
+            response = _session.get(
+                f"{API_BASE_URL}{arrow_endpoint}",
+                headers={"Accept": ARROW_STREAM},
+                timeout=_timeout(endpoint, DEFAULT_GET_TIMEOUT)
+            )
+            metrics.observe("get", name, time.perf_counter() - started, len(response.content))
+            if response.status_code != 200:
+                metrics.count("status", name, str(response.status_code))
+                return pd.DataFrame(), f"HTTP {response.status_code}"
+
+            if not response.headers.get("Content-Type", "").startswith(ARROW_STREAM):
+                # Backend without Arrow support answered with the JSON payload
+                result = response.json()
+                if result.get("status") == "FAILED":
+                    return pd.DataFrame(), result.get("error")
+                with metrics.timed("frame", name):
+                    return _frame_from_rows(result.get(key, [])), None
+
+            with metrics.timed("arrow", name):
+                table = pa.ipc.open_stream(response.content).read_all()
+        except Exception as e:
+            metrics.count("status", name, "error")
+            return pd.DataFrame(), str(e)
+
+        # Normalise column names once, on the schema
+        table = table.rename_columns([name.upper() for name in table.column_names])
+
+        if ttl is not None:
+            _response_cache.put(arrow_endpoint, table, ttl)
+
+    # Tables are immutable, so every caller gets its own DataFrame to modify
+    with metrics.timed("frame", name):
+        return table.to_pandas(), None
+
+def api_get_many(endpoints, frames=(), use_cache=True):
+    """Fetch independent GET endpoints concurrently.
+
+    Endpoints listed in frames are fetched with api_get_frame. Returns a dict
+    keyed by endpoint, so the wait is the slowest call rather than the sum of
+    all of them.
+    """
+    frames = set(frames)
+    futures = {
+        endpoint: _fetch_pool.submit(
+            api_get_frame if endpoint in frames else api_get,
+            endpoint,
+            use_cache=use_cache
+        )
+        for endpoint in dict.fromkeys(list(endpoints) + list(frames))
+    }
+    return {endpoint: future.result() for endpoint, future in futures.items()}
+
+def api_prefetch(endpoint):
+    """Warm the response cache for a cacheable GET in the background"""
+    if _cache_ttl(endpoint) is not None:
+        _fetch_pool.submit(api_get, endpoint)
+
+def api_stream(endpoint, accept=None, timeout=DEFAULT_STREAM_TIMEOUT):
+    """Open a streamed GET for large downloads; never cached.
+
+    Returns (response, error). The caller reads it with iter_content() and
+    must close the response.
+    """
+    headers = {"Accept": accept} if accept else None
+    try:
+        response = _session.get(
+            f"{API_BASE_URL}{endpoint}",
+            headers=headers,
+            stream=True,
+            timeout=timeout
+        )
+    except Exception as e:
+        return None, str(e)
+
+    if response.status_code != 200:
+        response.close()
+        return None, f"HTTP {response.status_code}"
+    return response, None
+
+def api_post(endpoint, payload):
+    """Generic POST request, evicting the GET responses it makes stale"""
+    name = series_name(endpoint)
+    try:
+        started = time.perf_counter()
+        response = _session.post(
+            f"{API_BASE_URL}{endpoint}",
+            json=payload,
+            timeout=_timeout(endpoint, DEFAULT_POST_TIMEOUT)
+        )
+        metrics.observe("post", name, time.perf_counter() - started, len(response.content))
+        if response.status_code != 200:
+            metrics.count("status", name, str(response.status_code))
+            return {"status": "FAILED", "error": f"HTTP {response.status_code}"}
+        with metrics.timed("json", name):
+            result = response.json()
+    except Exception as e:
+        metrics.count("status", name, "error")
+        return {"status": "FAILED", "error": str(e)}
+
+    if result.get("status") == "SUCCESS" and endpoint in CACHE_INVALIDATIONS:
+        _response_cache.invalidate(CACHE_INVALIDATIONS[endpoint])
+
+    return result
@@ -0,0 +1 @@
+"""Benchmark harness: synthetic backend (mock_backend) and page data-path runner (run)."""
@@ -0,0 +1,508 @@
+"""
+Synthetic stand-in for the EcoPath backend.
+
+Serves the /test/* and /services/* endpoints the dashboard reads, with the
+same response shapes (upper-case keys, status/data envelopes, Arrow streams
+for ?format=arrow when pyarrow is installed), over tables generated from a
+single size knob: the number of inventory rows. Everything else scales from
+it, so 10 rows is a toy tree and 100k rows a province-sized one.
+
+Run it standalone to point a real dashboard at it:
+
+    python -m bench.mock_backend --rows 100000 --port 8765
+    ECOPATH_API_URL=http://127.0.0.1:8765 streamlit run app.py
+"""
+import argparse
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # JSON responses only
+    pa = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+TODAY = pd.Timestamp("2026-01-31")
+
+DISEASES = ["Dengue", "Malaria", "Diarrhea", "ISPA", "Typhoid"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+CATEGORIES = ["Obat", "Alkes", "Vaksin"]
+
+# Backend weather query is LIMIT 10
+WEATHER_ROWS = 10
+
+# POSTs that publish a change event, and the topics it carries
+EVENT_TOPICS = {
+    "/services/inventory/update": ["inventory"],
+    "/services/redistribution/bulk": ["pending"],
+    "/services/redistribution/approve": ["pending", "approved", "inventory"],
+    "/services/redistribution/approve-batch": ["pending", "approved", "inventory"],
+    "/services/reports/ingest": ["reports"],
+    "/services/reports/process": ["reports"],
+    "/services/reports/process-batch": ["reports"],
+}
+
+
+def _ids(prefix, n, width):
+    return np.char.add(prefix, np.char.zfill(np.arange(1, n + 1).astype(str), width))
+
+
+def _dates(days_back, size, rng):
+    return (TODAY - pd.to_timedelta(rng.integers(0, days_back, size), unit="D")).strftime("%Y-%m-%d")
+
+
+class SyntheticData:
+    """Every table the mock serves, scaled from the inventory row count"""
+
+    def __init__(self, rows, seed=0):
+        rng = np.random.default_rng(seed)
+        self.rows = rows
+
+        n_facilities = int(np.clip(rows // 100, 5, 2000))
+        n_items = max(1, math.ceil(rows / n_facilities))
+
+        self.facilities = pd.DataFrame({
+            "FACILITY_ID": _ids("PKM", n_facilities, 5),
+            "FACILITY_NAME": _ids("Puskesmas ", n_facilities, 5),
+            "FACILITY_TYPE": rng.choice(["Puskesmas", "Klinik", "RSUD"], n_facilities),
+            "DISTRICT": _ids("Kecamatan ", n_facilities, 3),
+            "PROVINCE": "Jawa Barat",
+            "LATITUDE": rng.uniform(-8.0, -6.0, n_facilities).round(6),
+            "LONGITUDE": rng.uniform(106.0, 112.0, n_facilities).round(6),
+            "POPULATION_COVERAGE": rng.integers(5_000, 100_000, n_facilities),
+            "ACCESSIBILITY_SCORE": rng.uniform(1, 10, n_facilities).round(1),
+        })
+
+        self.items = pd.DataFrame({
+            "ITEM_ID": _ids("MED", n_items, 5),
+            "ITEM_NAME": _ids("Item ", n_items, 5),
+            "ITEM_CATEGORY": rng.choice(CATEGORIES, n_items),
+            "DISEASE_RELATION": rng.choice(DISEASES, n_items),
+            "UNIT_MEASUREMENT": "box",
+            "MIN_TEMPERATURE": 2.0,
+            "MAX_TEMPERATURE": 25.0,
+            "SHELF_LIFE_DAYS": rng.integers(90, 1000, n_items),
+            "CRITICAL_ITEM": rng.random(n_items) < 0.2,
+        })
+
+        facility = np.repeat(np.arange(n_facilities), n_items)[:rows]
+        item = np.tile(np.arange(n_items), n_facilities)[:rows]
+        self.inventory = pd.DataFrame({
+            "INVENTORY_ID": _ids("INV", rows, 7),
+            "FACILITY_ID": self.facilities["FACILITY_ID"].to_numpy()[facility],
+            "FACILITY_NAME": self.facilities["FACILITY_NAME"].to_numpy()[facility],
+            "ITEM_ID": self.items["ITEM_ID"].to_numpy()[item],
+            "ITEM_NAME": self.items["ITEM_NAME"].to_numpy()[item],
+            "CURRENT_STOCK": rng.integers(0, 1000, rows),
+            "MIN_STOCK_THRESHOLD": 100,
+            "MAX_STOCK_CAPACITY": 800,
+            "EXPIRY_DATE": (TODAY + pd.to_timedelta(rng.integers(1, 720, rows), unit="D")).strftime("%Y-%m-%d"),
+            "LAST_UPDATED": "2026-01-31 00:00:00.000",
+        })
+
+        n_reports = max(10, rows // 2)
+        report_facility = rng.integers(0, n_facilities, n_reports)
+        self.reports = pd.DataFrame({
+            "REPORT_ID": _ids("RPT", n_reports, 7),
+            "FACILITY_NAME": self.facilities["FACILITY_NAME"].to_numpy()[report_facility],
+            "REPORT_DATE": _dates(90, n_reports, rng),
+            "RAW_TEXT": "synthetic report",
+            "DISEASE_DETECTED": rng.choice(DISEASES, n_reports),
+            "SEVERITY_LEVEL": rng.choice(SEVERITIES, n_reports),
+            "PATIENT_COUNT": rng.integers(1, 50, n_reports),
+        })
+
+        n_usage = rows * 3
+        usage_row = rng.integers(0, rows, n_usage)
+        self.consumption = pd.DataFrame({
+            "FACILITY_ID": self.inventory["FACILITY_ID"].to_numpy()[usage_row],
+            "ITEM_ID": self.inventory["ITEM_ID"].to_numpy()[usage_row],
+            "DAY": _dates(90, n_usage, rng),
+            "QUANTITY": rng.integers(1, 20, n_usage),
+        }).groupby(["FACILITY_ID", "ITEM_ID", "DAY"], as_index=False)["QUANTITY"].sum()
+
+        self.pressure = pd.DataFrame({
+            "FACILITY_ID": self.facilities["FACILITY_ID"],
+            "RECENT_PATIENTS": rng.integers(0, 100, n_facilities),
+            "WINDOW_PATIENTS": rng.integers(100, 1000, n_facilities),
+        })
+
+        self.weather = pd.DataFrame({
+            "WEATHER_ID": _ids("WTH", WEATHER_ROWS, 5),
+            "FACILITY_NAME": self.facilities["FACILITY_NAME"].to_numpy()[np.arange(WEATHER_ROWS) % n_facilities],
+            "DATE": _dates(3, WEATHER_ROWS, rng),
+            "TEMPERATURE_AVG": rng.uniform(22, 34, WEATHER_ROWS).round(1),
+            "HUMIDITY_AVG": rng.uniform(60, 95, WEATHER_ROWS).round(1),
+            "RAINFALL_MM": rng.uniform(0, 40, WEATHER_ROWS).round(1),
+            "WEATHER_CONDITION": rng.choice(["Rain", "Clouds", "Clear"], WEATHER_ROWS),
+        })
+
+        n_recs = max(10, rows // 10)
+        src = rng.integers(0, rows, n_recs)
+        dst = rng.integers(0, n_facilities, n_recs)
+        self.recommendations = pd.DataFrame({
+            "RECOMMENDATION_ID": _ids("REC", n_recs, 7),
+            "FROM_FACILITY_ID": self.inventory["FACILITY_ID"].to_numpy()[src],
+            "TO_FACILITY_ID": self.facilities["FACILITY_ID"].to_numpy()[dst],
+            "ITEM_ID": self.inventory["ITEM_ID"].to_numpy()[src],
+            "RECOMMENDED_QUANTITY": rng.integers(11, 200, n_recs),
+            "PRIORITY_SCORE": rng.integers(1, 100, n_recs),
+            "STATUS": "PENDING",
+            "REASON": "synthetic",
+            "CREATED_AT": "2026-01-31 00:00:00.000",
+            "FROM_FACILITY_NAME": self.inventory["FACILITY_NAME"].to_numpy()[src],
+            "TO_FACILITY_NAME": self.facilities["FACILITY_NAME"].to_numpy()[dst],
+            "ITEM_NAME": self.inventory["ITEM_NAME"].to_numpy()[src],
+        }).sort_values(["PRIORITY_SCORE", "CREATED_AT"], ascending=False, ignore_index=True)
+
+        self.approved = self.recommendations.rename(columns={
+            "FROM_FACILITY_NAME": "SOURCE_FACILITY",
+            "TO_FACILITY_NAME": "DESTINATION_FACILITY",
+        }).assign(STATUS="APPROVED", APPROVED_BY="bench", APPROVED_AT="2026-01-31 00:00:00.000")
+
+    def candidates(self):
+        located = self.inventory.merge(self.facilities[["FACILITY_ID", "LATITUDE", "LONGITUDE"]], on="FACILITY_ID")
+        over = located[located["CURRENT_STOCK"] > located["MAX_STOCK_CAPACITY"] * 0.8]
+        under = located[located["CURRENT_STOCK"] < located["MIN_STOCK_THRESHOLD"] * 1.5]
+        return (
+            over.drop(columns=["INVENTORY_ID", "MIN_STOCK_THRESHOLD", "EXPIRY_DATE", "LAST_UPDATED"]),
+            under.drop(columns=["INVENTORY_ID", "MAX_STOCK_CAPACITY", "EXPIRY_DATE", "LAST_UPDATED"]),
+        )
+
+    def anomalies(self):
+        inv = self.inventory
+        expiry_days = (pd.to_datetime(inv["EXPIRY_DATE"]) - TODAY).dt.days
+        base = ["FACILITY_NAME", "ITEM_NAME", "CURRENT_STOCK"]
+        groups = {
+            "understocked": inv.loc[inv["CURRENT_STOCK"] < inv["MIN_STOCK_THRESHOLD"], base + ["MIN_STOCK_THRESHOLD"]],
+            "overstocked": inv.loc[inv["CURRENT_STOCK"] > inv["MAX_STOCK_CAPACITY"], base + ["MAX_STOCK_CAPACITY"]],
+            "near_expiry": inv.loc[expiry_days <= 30, base + ["EXPIRY_DATE"]].assign(
+                DAYS_UNTIL_EXPIRY=expiry_days[expiry_days <= 30]),
+        }
+        result = {key: _records(df) for key, df in groups.items()}
+        result["counts"] = {key: len(df) for key, df in groups.items()}
+        result["total_issues"] = sum(result["counts"].values())
+        return result
+
+    def inventory_page(self, query):
+        df = self.inventory
+        facility_id = query.get("facilityId")
+        search = query.get("search")
+        if facility_id:
+            df = df[df["FACILITY_ID"] == facility_id]
+        if search:
+            df = df[df["ITEM_NAME"].str.contains(search, case=False, regex=False)]
+
+        sort = query.get("sort", "default")
+        if sort == "stock_desc":
+            df = df.sort_values(["CURRENT_STOCK", "INVENTORY_ID"], ascending=[False, True])
+        elif sort == "stock_asc":
+            df = df.sort_values(["CURRENT_STOCK", "INVENTORY_ID"])
+
+        page, size = int(query.get("page", 0)), int(query.get("size", 50))
+        by_facility = (
+            df.groupby("FACILITY_ID", as_index=False)["CURRENT_STOCK"].sum()
+            .sort_values("CURRENT_STOCK", ascending=False)
+        )
+        return {
+            "status": "SUCCESS",
+            "page": page,
+            "size": size,
+            "count": len(df),
+            "summary": {
+                "TOTAL_ITEMS": len(df),
+                "TOTAL_STOCK": int(df["CURRENT_STOCK"].sum()),
+                "AVG_STOCK": float(df["CURRENT_STOCK"].mean()) if len(df) else 0.0,
+                "TOTAL_FACILITIES": int(df["FACILITY_ID"].nunique()),
+            },
+            "by_facility": _records(by_facility),
+            "data": _records(df.iloc[page * size:(page + 1) * size].drop(columns=["LAST_UPDATED"])),
+        }
+
+    def pending_page(self, query):
+        df = self.recommendations
+        min_priority = query.get("minPriority")
+        if min_priority:
+            df = df[df["PRIORITY_SCORE"] >= int(min_priority)]
+        limit, offset = int(query.get("limit", len(df))), int(query.get("offset", 0))
+        return {
+            "status": "SUCCESS",
+            "total": len(df),
+            "limit": limit,
+            "offset": offset,
+            "count": min(limit, max(0, len(df) - offset)),
+            "recommendations": _records(df.iloc[offset:offset + limit]),
+        }
+
+    def summary(self):
+        merged = self.reports.groupby(["FACILITY_NAME", "DISEASE_DETECTED", "SEVERITY_LEVEL"], as_index=False).agg(
+            REPORT_COUNT=("REPORT_ID", "count"),
+            TOTAL_PATIENTS=("PATIENT_COUNT", "sum"),
+            LAST_REPORT_DATE=("REPORT_DATE", "max"),
+        )
+        return merged.assign(FACILITY_ID=None, LAST_UPDATED=merged["LAST_REPORT_DATE"])
+
+    def dashboard(self, query):
+        """Same shape as ReportRollupService.dashboardSummary plus the stock counts"""
+        reports = self.reports
+        days = int(query.get("days", 0))
+        if days > 0:
+            reports = reports[pd.to_datetime(reports["REPORT_DATE"]) >= TODAY - pd.Timedelta(days=days)]
+
+        def breakdown(column):
+            return reports.groupby(column, as_index=False).agg(
+                REPORT_COUNT=("REPORT_ID", "count"),
+                TOTAL_PATIENTS=("PATIENT_COUNT", "sum"),
+            ).sort_values("TOTAL_PATIENTS", ascending=False)
+
+        recent = self.reports.sort_values("REPORT_DATE", ascending=False).head(int(query.get("recent", 10)))
+        recent = recent[["FACILITY_NAME", "DISEASE_DETECTED", "SEVERITY_LEVEL", "PATIENT_COUNT", "REPORT_DATE"]].rename(
+            columns={"PATIENT_COUNT": "TOTAL_PATIENTS", "REPORT_DATE": "LAST_REPORT_DATE"})
+
+        stats = self.stats()
+        return {
+            "status": "SUCCESS",
+            "statistics": {key: stats[key] for key in ("TOTAL_FACILITIES", "TOTAL_ITEMS", "TOTAL_INVENTORY", "TOTAL_REPORTS")},
+            "diseases": _records(breakdown("DISEASE_DETECTED")),
+            "severities": _records(breakdown("SEVERITY_LEVEL")),
+            "recent": _records(recent.assign(LAST_UPDATED=recent["LAST_REPORT_DATE"])),
+            "days": days,
+            "source": "rollup",
+            "summary": {
+                "stock_issues": self.anomalies()["total_issues"],
+                "pending_redistributions": len(self.recommendations),
+            },
+        }
+
+    def stats(self):
+        return {
+            "TOTAL_FACILITIES": len(self.facilities),
+            "TOTAL_ITEMS": len(self.items),
+            "TOTAL_INVENTORY": len(self.inventory),
+            "TOTAL_TRANSACTIONS": len(self.consumption),
+            "TOTAL_WEATHER": len(self.weather),
+            "TOTAL_REPORTS": len(self.reports),
+        }
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records"))
+
+
+def _table(df):
+    return {"status": "SUCCESS", "count": len(df), "data": df}
+
+
+class MockBackend:
+    """Threaded HTTP server over a SyntheticData instance.
+
+    Static table responses are serialised once and served from memory, so
+    the mock's own cost stays small next to the client being measured.
+    latency adds a fixed delay per request to imitate the network.
+    """
+
+    def __init__(self, data, host="127.0.0.1", port=0, latency=0.0):
+        self.data = data
+        self.latency = latency
+        self.requests = 0
+        self._payloads = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._events = []
+        self._event_posted = threading.Condition(self._lock)
+
+        self._tables = {
+            "/test/facilities": lambda q: _table(data.facilities),
+            "/test/items": lambda q: _table(data.items),
+            "/test/inventory": lambda q: _table(data.inventory),
+            "/test/inventory/changes": lambda q: {"status": "SUCCESS", "since": q.get("since"), "count": 0, "data": []},
+            "/test/reports": lambda q: _table(data.reports),
+            "/test/weather": lambda q: _table(data.weather),
+            "/test/consumption": lambda q: _table(data.consumption),
+            "/test/consumption/pressure": lambda q: _table(data.pressure),
+            "/services/reports/summary": lambda q: _table(data.summary()),
+            "/services/redistribution/approved": lambda q: _table(data.approved),
+        }
+        self._dynamic = {
+            "/test/health": lambda q: {"status": "UP", "service": "EcoPath Mock", "timestamp": int(time.time() * 1000)},
+            "/test/snowflake": lambda q: {"status": "SUCCESS", "message": "Mock backend", "version": "mock"},
+            "/test/stats": lambda q: {"status": "SUCCESS", "statistics": data.stats()},
+            "/test/reference/version": lambda q: {
+                "status": "SUCCESS",
+                "facilities": len(data.facilities),
+                "items": len(data.items),
+                "version": f"mock-{data.rows}",
+            },
+            "/test/inventory/page": data.inventory_page,
+            "/services/redistribution/pending": data.pending_page,
+            "/services/dashboard/summary": data.dashboard,
+            "/services/redistribution/candidates": lambda q: dict(
+                zip(("overstocked", "understocked"), map(_records, data.candidates())), status="SUCCESS"),
+            "/services/inventory/anomalies": lambda q: {"status": "SUCCESS", "data": data.anomalies()},
+        }
+
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                backend._handle(self, "GET")
+
+            def do_POST(self):
+                backend._handle(self, "POST")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handle(self, handler, method):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urlparse(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        path = parsed.path
+
+        if method == "POST":
+            length = int(handler.headers.get("Content-Length") or 0)
+            body = json.loads(handler.rfile.read(length) or b"{}")
+            return self._send_json(handler, self._post(path, body))
+
+        if path == "/services/events":
+            return self._send_json(handler, self._poll_events(int(query.get("since", -1)), float(query.get("wait", 0))))
+
+        job = re.fullmatch(r"/services/jobs/([^/]+)(/result)?", path)
+        if job:
+            return self._send_json(handler, self._job(job.group(1), bool(job.group(2))))
+
+        if path in self._tables:
+            arrow = query.get("format") == "arrow" and pa is not None
+            key = (path, arrow)
+            with self._lock:
+                payload = self._payloads.get(key)
+            if payload is None:
+                payload = self._serialise(self._tables[path](query), arrow)
+                if path != "/test/inventory/changes":
+                    with self._lock:
+                        self._payloads[key] = payload
+            return self._send(handler, 200, payload, ARROW_STREAM if arrow else "application/json")
+
+        if path in self._dynamic:
+            return self._send_json(handler, self._dynamic[path](query))
+
+        self._send_json(handler, {"status": "FAILED", "error": f"Unknown endpoint {path}"}, 404)
+
+    def _post(self, path, body):
+        if path in EVENT_TOPICS:
+            with self._event_posted:
+                self._events.append({"seq": len(self._events) + 1, "type": path, "topics": EVENT_TOPICS[path]})
+                self._event_posted.notify_all()
+        if path.startswith("/services/jobs/"):
+            job_id = str(uuid.uuid4())
+            job_type = path.rsplit("/", 1)[-1]
+            job = {"id": job_id, "type": job_type, "status": "COMPLETED", "progress": 100}
+            with self._lock:
+                self._jobs[job_id] = job
+            return {"status": "SUCCESS", "job_id": job_id, "job": job}
+        if path == "/services/redistribution/bulk":
+            count = len(body.get("recommendations", []))
+            return {"status": "SUCCESS", "created": count, "message": f"Saved {count} recommendations"}
+        return {"status": "SUCCESS", "message": "Mock accepted " + path}
+
+    def _poll_events(self, since, wait):
+        """Long-poll like EventService: hold the request until a newer event or wait runs out"""
+        with self._event_posted:
+            if since >= 0:
+                self._event_posted.wait_for(lambda: len(self._events) != since, timeout=wait)
+            seq = len(self._events)
+            reset = since > seq
+            events = [] if since < 0 or reset else self._events[since:]
+        return {"status": "SUCCESS", "seq": seq, "reset": reset, "count": len(events), "events": events}
+
+    def _job(self, job_id, result):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return {"status": "FAILED", "error": "Job not found"}
+        if not result:
+            return {"status": "SUCCESS", "job": job}
+        if job["type"] == "inventory-anomalies":
+            return {"status": "SUCCESS", "result": self.data.anomalies()}
+        return {"status": "SUCCESS", "result": {}}
+
+    @staticmethod
+    def _serialise(response, arrow):
+        frame = response["data"]
+        if arrow:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes()
+        return json.dumps({**response, "data": _records(frame)}).encode()
+
+    def _send_json(self, handler, payload, status=200):
+        self._send(handler, status, json.dumps(payload, default=str).encode(), "application/json")
+
+    @staticmethod
+    def _send(handler, status, body, content_type):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+def serve(rows, port=0, latency=0.0, seed=0, ready=None):
+    """Build the data and serve until killed; the URL is put on ready when given"""
+    backend = MockBackend(SyntheticData(rows, seed), port=port, latency=latency)
+    if ready is not None:
+        ready.put(backend.url)
+    backend.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic EcoPath backend")
+    parser.add_argument("--rows", type=int, default=1000, help="inventory rows (other tables scale from it)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every request")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backend = MockBackend(SyntheticData(args.rows, args.seed), port=args.port, latency=args.latency_ms / 1000)
+    print(f"Mock backend with {args.rows} inventory rows on {backend.url}")
+    backend.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Benchmark the dashboard's data paths against the synthetic backend.
+
+For every --rows size a mock backend is started in its own process (so its
+CPU and memory stay out of the numbers), api_client is pointed at it, and
+each page scenario below runs --repeat times with a cold response cache.
+The scenarios call the same modules the pages use (api_client,
+inventory_store, forecasting, redistribution_engine, reference_store,
+spatial_index) without Streamlit; --apptest additionally renders every page
+of app.py headlessly with streamlit.testing.
+
+Reported per scenario and size: median / max latency, peak Python heap
+(tracemalloc, from one extra run) and the requests and response bytes taken
+from the metrics registry. Results are written as JSON; with --baseline the
+run exits non-zero when a scenario got slower or heavier than the tolerance.
+
+    cd frontend
+    python -m bench.run --rows 10 1000 100000 --output bench.json
+    python -m bench.run --rows 1000 --baseline bench.json --tolerance 0.25
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, FRONTEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+import api_client  # noqa: E402
+import reference_store  # noqa: E402
+from api_client import api_get, api_get_frame, invalidate_cache  # noqa: E402
+from bench.mock_backend import serve  # noqa: E402
+from forecasting import HISTORY_DAYS, consumption_rates, forecast_stockout  # noqa: E402
+from inventory_store import InventorySnapshot  # noqa: E402
+from metrics import registry as metrics  # noqa: E402
+from redistribution_engine import match_candidates, solve_transport  # noqa: E402
+from reference_store import ReferenceReplica  # noqa: E402
+from spatial_index import FacilityIndex  # noqa: E402
+from views import PAGES  # noqa: E402
+
+DEFAULT_ROWS = [10, 1_000, 100_000]
+DEFAULT_REPEAT = 3
+
+# Inventory pages walked by the inventory scenarios
+INVENTORY_PAGES = 3
+INVENTORY_PAGE_SIZE = 50
+
+# Radius used for the facility-pair pruning in the redistribution scenario
+MAX_DISTANCE_KM = 50
+
+# solve_transport runs one LP per item, so it is skipped above this size
+TRANSPORT_MAX_ROWS = 10_000
+
+# ========================================
+# SCENARIOS
+# ========================================
+
+
+def _check(error):
+    if error is not None:
+        raise RuntimeError(error)
+
+
+def dashboard(rows):
+    data = api_get("/services/dashboard/summary?days=0&recent=10")
+    _check(data.get("error") if data.get("status") != "SUCCESS" else None)
+    for key in ("diseases", "severities", "recent"):
+        pd.DataFrame(data.get(key, []))
+
+
+def nurse_reports(rows):
+    reports, error = api_get_frame("/test/reports")
+    _check(error)
+    reports[
+        reports["DISEASE_DETECTED"].isin(reports["DISEASE_DETECTED"].dropna().unique())
+        & reports["SEVERITY_LEVEL"].isin(reports["SEVERITY_LEVEL"].dropna().unique())
+    ]
+
+
+def inventory_snapshot(rows):
+    snapshot = InventorySnapshot()
+    _check(snapshot.sync())
+    for page in range(INVENTORY_PAGES):
+        snapshot.query(page=page, size=INVENTORY_PAGE_SIZE)
+    snapshot.query(search="Item 1", sort="stock_desc")
+    _check(snapshot.sync(force=True))
+
+
+def inventory_server_pages(rows):
+    for page in range(INVENTORY_PAGES):
+        data = api_get(f"/test/inventory/page?sort=default&page={page}&size={INVENTORY_PAGE_SIZE}")
+        _check(data.get("error"))
+        pd.DataFrame(data.get("data", []))
+
+
+def forecast(rows):
+    snapshot = InventorySnapshot()
+    _check(snapshot.sync())
+    daily, error = api_get_frame(f"/test/consumption?days={HISTORY_DAYS}", use_cache=False)
+    _check(error)
+    pressure, error = api_get_frame(f"/test/consumption/pressure?days={HISTORY_DAYS}", use_cache=False)
+    _check(error)
+    forecast_stockout(snapshot.frame, consumption_rates(daily, pressure))
+
+
+def redistribution(rows):
+    data = api_get("/services/redistribution/candidates", use_cache=False)
+    _check(data.get("error"))
+    over = pd.DataFrame(data.get("overstocked", []))
+    under = pd.DataFrame(data.get("understocked", []))
+
+    facilities, error = api_get_frame("/test/facilities", use_cache=False)
+    _check(error)
+    allowed_pairs = FacilityIndex(facilities).pairs_within(MAX_DISTANCE_KM)
+
+    match_candidates(over, under, allowed_pairs)
+    if rows <= TRANSPORT_MAX_ROWS:
+        solve_transport(over, under, allowed_pairs)
+
+    _check(api_get("/services/redistribution/pending?minPriority=0&limit=25&offset=0").get("error"))
+    _check(api_get_frame("/services/redistribution/approved")[1])
+
+
+def weather(rows):
+    _check(api_get_frame("/test/weather")[1])
+    with tempfile.TemporaryDirectory() as tmp:
+        replica = ReferenceReplica(os.path.join(tmp, "reference.sqlite"))
+        _check(replica.refresh(force=True))
+        FacilityIndex(replica.facilities).nearest(-7.0, 107.0, k=5)
+
+
+SCENARIOS = {
+    "dashboard": dashboard,
+    "nurse_reports": nurse_reports,
+    "inventory_snapshot": inventory_snapshot,
+    "inventory_server_pages": inventory_server_pages,
+    "forecast": forecast,
+    "redistribution": redistribution,
+    "weather": weather,
+}
+
+# ========================================
+# MEASUREMENT
+# ========================================
+
+
+def _payload():
+    """(requests, bytes) recorded since the last metrics reset"""
+    summary = metrics.summary()
+    http = summary[summary["KIND"].isin(["get", "post"])]
+    return int(http["COUNT"].sum()), int((http["COUNT"] * http["AVG_KB"].fillna(0) * 1024).sum())
+
+
+def measure(name, scenario, rows, repeat):
+    timings = []
+    requests = payload_bytes = 0
+
+    for i in range(repeat):
+        invalidate_cache()
+        metrics.reset()
+        started = time.perf_counter()
+        scenario(rows)
+        timings.append(time.perf_counter() - started)
+        if i == 0:
+            requests, payload_bytes = _payload()
+
+    # Separate traced run: tracemalloc slows the code it watches
+    invalidate_cache()
+    tracemalloc.start()
+    scenario(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "rows": rows,
+        "median_ms": statistics.median(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+        "peak_mb": peak / 1e6,
+        "requests": requests,
+        "payload_kb": payload_bytes / 1024,
+    }
+
+
+def measure_pages(rows, repeat):
+    """Render every page of app.py headlessly; needs streamlit"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for page in PAGES:
+        timings = []
+        for _ in range(repeat):
+            invalidate_cache()
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            app = AppTest.from_file(os.path.join(FRONTEND_DIR, "app.py"), default_timeout=300)
+            app.run()
+            started = time.perf_counter()
+            app.sidebar.radio[0].set_value(page).run()
+            timings.append(time.perf_counter() - started)
+            if app.exception:
+                raise RuntimeError(f"{page}: {app.exception[0].message}")
+
+        results.append({
+            "scenario": f"page:{page}",
+            "rows": rows,
+            "median_ms": statistics.median(timings) * 1000,
+            "max_ms": max(timings) * 1000,
+            "peak_mb": None,
+            "requests": None,
+            "payload_kb": None,
+        })
+    return results
+
+
+def start_backend(rows, latency):
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    process = ctx.Process(target=serve, args=(rows, 0, latency), kwargs={"ready": ready}, daemon=True)
+    process.start()
+    return process, ready.get(timeout=600)
+
+
+def regressions(results, baseline, tolerance):
+    """Scenario/size pairs slower or heavier than baseline * (1 + tolerance)"""
+    previous = {(r["scenario"], r["rows"]): r for r in baseline}
+    failures = []
+    for result in results:
+        before = previous.get((result["scenario"], result["rows"]))
+        if before is None:
+            continue
+        for field in ("median_ms", "peak_mb", "payload_kb"):
+            if result[field] is not None and before.get(field) and result[field] > before[field] * (1 + tolerance):
+                failures.append(
+                    f"{result['scenario']} @ {result['rows']} rows: {field} "
+                    f"{before[field]:.1f} -> {result[field]:.1f}"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard data paths against a mock backend")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="inventory sizes to run")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), help="subset of scenarios")
+    parser.add_argument("--apptest", action="store_true", help="also render app.py pages with AppTest")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="network delay the mock adds per request")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="earlier --output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    scenarios = {name: SCENARIOS[name] for name in (args.scenario or SCENARIOS)}
+    results = []
+
+    # Keep the app's reference replica (--apptest) away from the real one
+    workdir = tempfile.mkdtemp(prefix="ecopath_bench_")
+    reference_store.REPLICA_PATH = os.path.join(workdir, "reference.sqlite")
+
+    for rows in args.rows:
+        process, url = start_backend(rows, args.latency_ms / 1000)
+        api_client.API_BASE_URL = os.environ["ECOPATH_API_URL"] = url
+        if os.path.exists(reference_store.REPLICA_PATH):
+            os.remove(reference_store.REPLICA_PATH)
+        try:
+            for name, scenario in scenarios.items():
+                result = measure(name, scenario, rows, args.repeat)
+                results.append(result)
+                print(
+                    f"{name:<24} {rows:>7} rows  {result['median_ms']:>9.1f} ms  (max {result['max_ms']:.1f})  "
+                    f"peak {result['peak_mb']:>7.1f} MB  {result['requests']:>3} req  {result['payload_kb']:>10.1f} KB"
+                )
+            if args.apptest:
+                for result in measure_pages(rows, args.repeat):
+                    results.append(result)
+                    print(f"{result['scenario']:<24} {rows:>7} rows  {result['median_ms']:>9.1f} ms")
+        finally:
+            process.terminate()
+            process.join()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
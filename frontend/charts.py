@@ -0,0 +1,98 @@
+"""
+Plotly figure builders shared by the pages.
+
+Figures are memoised with st.cache_data on the (already aggregated) input
+frame plus the theme, so a rerun caused by an unrelated widget reuses the
+figure instead of rebuilding it. Callers first reduce their data to at most
+CHART_MAX_POINTS categories with limit_categories / latest_per_group, which
+keeps both the hash and the figure size independent of the raw table.
+
+Figure builds (cache misses only) and st.plotly_chart calls are timed into
+metrics as "figure" and "chart" series named after the chart title.
+"""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from metrics import registry as metrics
+
+# Most bars / pie slices drawn by a single chart
+CHART_MAX_POINTS = 25
+
+OTHER_LABEL = "Other"
+
+FIGURE_CACHE_ENTRIES = 64
+
+
+def plotly_template(theme):
+    return "plotly_dark" if theme == "dark" else "plotly_white"
+
+
+def limit_categories(df, names, values, limit=CHART_MAX_POINTS, how="sum"):
+    """Aggregate values per names, keeping the largest limit - 1 groups and
+    folding the rest into a single OTHER_LABEL row"""
+    grouped = (
+        df.groupby(names, as_index=False)[values].agg(how)
+        .sort_values(values, ascending=False, ignore_index=True)
+    )
+    if len(grouped) <= limit:
+        return grouped
+
+    head, tail = grouped.iloc[:limit - 1], grouped.iloc[limit - 1:]
+    other = pd.DataFrame({names: [OTHER_LABEL], values: [tail[values].agg(how)]})
+    return pd.concat([head, other], ignore_index=True)
+
+
+def latest_per_group(df, group, order):
+    """Newest row (by order) for every value of group"""
+    return df.sort_values(order).drop_duplicates(group, keep="last")
+
+
+def _style(fig, theme):
+    fig.update_layout(
+        template=plotly_template(theme),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def pie_chart(df, values, names, title, theme, colors=None):
+    with metrics.timed("figure", title):
+        fig = px.pie(
+            df,
+            values=values,
+            names=names,
+            title=title,
+            color_discrete_sequence=colors
+        )
+        return _style(fig, theme)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def bar_chart(df, x, y, title, theme, color=None, labels=None, color_scale=None,
+              color_map=None, text=None, tickangle=None):
+    with metrics.timed("figure", title):
+        fig = px.bar(
+            df,
+            x=x,
+            y=y,
+            title=title,
+            labels=labels,
+            color=color,
+            color_continuous_scale=color_scale,
+            color_discrete_map=color_map,
+            text=text
+        )
+        if text is not None:
+            fig.update_traces(textposition='outside')
+        if tickangle is not None:
+            fig.update_layout(xaxis_tickangle=tickangle)
+        return _style(fig, theme)
+
+
+def show_chart(fig, **kwargs):
+    """st.plotly_chart, timed under the figure's title"""
+    with metrics.timed("chart", fig.layout.title.text or "untitled"):
+        return st.plotly_chart(fig, **kwargs)
@@ -0,0 +1,111 @@
+"""
+Full-table exports for download.
+
+Nothing is generated until the user asks for a file. The backend streams the
+rows out of Snowflake (/services/export/<dataset>), and the response is
+copied to a temporary file chunk by chunk, so the download itself is never
+buffered whole. Parquet is written batch by batch from the Arrow stream with
+a zstd-compressed ParquetWriter.
+
+st.download_button does need the finished file in memory, so the page reads
+it once and refuses files above EXPORT_MAX_BYTES.
+"""
+import os
+import tempfile
+from datetime import datetime
+
+from api_client import ARROW_STREAM, api_stream
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV exports only
+    pa = None
+    pq = None
+
+# Dataset key (backend path segment) -> label
+EXPORT_DATASETS = {
+    "reports": "Nurse reports",
+    "inventory": "Inventory",
+    "transactions": "Stock transactions",
+    "redistributions": "Redistributions",
+}
+
+# Format label -> (file suffix, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+CHUNK_SIZE = 1 << 20
+
+# Largest file handed to st.download_button (held in memory until downloaded)
+EXPORT_MAX_BYTES = 200_000_000
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def export_formats():
+    """Format labels usable in this process (Parquet needs pyarrow)"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "Parquet" or pq is not None]
+
+
+def export_filename(dataset, fmt):
+    suffix, _ = EXPORT_FORMATS[fmt]
+    return f"{dataset}_{datetime.now().strftime('%Y%m%d')}{suffix}"
+
+
+def _copy_stream(response, path):
+    with open(path, "wb") as out:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            out.write(chunk)
+
+
+def _write_parquet(response, path):
+    response.raw.decode_content = True
+    reader = pa.ipc.open_stream(response.raw)
+    schema = reader.schema.with_metadata(None)
+    schema = pa.schema([field.with_name(field.name.lower()) for field in schema])
+
+    with pq.ParquetWriter(path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for batch in reader:
+            writer.write_batch(pa.RecordBatch.from_arrays(batch.columns, schema=schema))
+
+
+def write_export(dataset, fmt):
+    """Stream one dataset export into a temporary file.
+
+    Returns (path, error). The caller owns the file and removes it with
+    discard_export once it has been handed to the user.
+    """
+    if fmt == "Parquet":
+        endpoint, accept = f"/services/export/{dataset}?format=arrow", ARROW_STREAM
+    else:
+        gzip = "true" if fmt == "CSV (gzip)" else "false"
+        endpoint, accept = f"/services/export/{dataset}?gzip={gzip}", None
+
+    response, error = api_stream(endpoint, accept)
+    if error:
+        return None, error
+
+    suffix, _ = EXPORT_FORMATS[fmt]
+    fd, path = tempfile.mkstemp(prefix=f"ecopath_{dataset}_", suffix=suffix)
+    os.close(fd)
+
+    try:
+        with response:
+            if fmt == "Parquet":
+                _write_parquet(response, path)
+            else:
+                _copy_stream(response, path)
+    except Exception as e:
+        discard_export(path)
+        return None, str(e)
+
+    return path, None
+
+
+def discard_export(path):
+    if path and os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,136 @@
+"""
+Consumption-rate forecasting and stock-out projection.
+
+Daily OUT quantities from /test/consumption (redistribution transfers are
+not consumption and are left out by the backend) are laid out as one dense
+series x day matrix, so the exponentially smoothed rate of every
+facility/item series comes out of a single weighted matrix reduction, and
+days-until-stockout for the whole inventory is one vector division.
+
+Rates can be scaled per facility by a disease-pressure factor from
+/test/consumption/pressure: a facility whose nurse reports show more
+patients in the last week than its average week consumes faster.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+HISTORY_DAYS = 90
+
+# Weight of the newest day in the exponential smoothing
+SMOOTHING_ALPHA = 0.1
+
+# Recent window used by the backend pressure query, in days
+PRESSURE_RECENT_DAYS = 7
+
+# factor = 1 + sensitivity * (recent / average - 1), clipped to [1, max]
+PRESSURE_SENSITIVITY = 0.5
+PRESSURE_MAX_FACTOR = 2.0
+
+# Days until stockout below each bound, most urgent first
+RISK_LEVELS = [(7, "CRITICAL"), (14, "HIGH"), (30, "MEDIUM")]
+RISK_NONE = "LOW"
+
+KEYS = ["FACILITY_ID", "ITEM_ID"]
+
+
+def consumption_matrix(daily, days=HISTORY_DAYS, today=None):
+    """Lay daily OUT rows (FACILITY_ID, ITEM_ID, DAY, QUANTITY) out as a
+    (series, days) matrix, oldest day first, zeros on days without usage.
+
+    Returns (keys, matrix) where keys holds FACILITY_ID / ITEM_ID per row.
+    """
+    if daily.empty:
+        return pd.DataFrame(columns=KEYS), np.zeros((0, days))
+
+    today = pd.Timestamp(today or date.today()).normalize()
+    offset = (today - pd.to_datetime(daily["DAY"])).dt.days.to_numpy()
+    in_window = (offset >= 0) & (offset < days)
+
+    rows = daily[in_window]
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(rows[KEYS]))
+    column = days - 1 - offset[in_window]
+
+    flat = np.bincount(
+        codes * days + column,
+        weights=rows["QUANTITY"].to_numpy(dtype=float),
+        minlength=len(uniques) * days
+    )
+
+    return uniques.to_frame(index=False, name=KEYS), flat.reshape(len(uniques), days)
+
+
+def smoothed_rates(matrix, alpha=SMOOTHING_ALPHA):
+    """Exponentially weighted mean daily usage of every row of matrix.
+
+    Days before a series' first recorded usage don't count, so a newly
+    stocked item isn't diluted by the empty history before it existed.
+    """
+    days = matrix.shape[1]
+    weights = alpha * (1 - alpha) ** np.arange(days - 1, -1, -1)
+
+    started = np.maximum.accumulate(matrix > 0, axis=1)
+    total = matrix @ weights
+    norm = started @ weights
+
+    return np.divide(total, norm, out=np.zeros_like(total), where=norm > 0)
+
+
+def pressure_factors(pressure, days=HISTORY_DAYS):
+    """FACILITY_ID -> rate multiplier from RECENT_PATIENTS / WINDOW_PATIENTS"""
+    if pressure is None or pressure.empty:
+        return pd.Series(dtype=float)
+
+    recent = pressure["RECENT_PATIENTS"].to_numpy(dtype=float) / PRESSURE_RECENT_DAYS
+    average = pressure["WINDOW_PATIENTS"].to_numpy(dtype=float) / days
+    ratio = np.divide(recent, average, out=np.ones_like(recent), where=average > 0)
+
+    factor = np.clip(1 + PRESSURE_SENSITIVITY * (ratio - 1), 1.0, PRESSURE_MAX_FACTOR)
+    return pd.Series(factor, index=pressure["FACILITY_ID"].to_numpy())
+
+
+def consumption_rates(daily, pressure=None, days=HISTORY_DAYS, alpha=SMOOTHING_ALPHA, today=None):
+    """FACILITY_ID, ITEM_ID, BASE_RATE, PRESSURE, DAILY_RATE per series"""
+    keys, matrix = consumption_matrix(daily, days, today)
+    rates = keys.assign(BASE_RATE=smoothed_rates(matrix, alpha))
+
+    factors = pressure_factors(pressure, days)
+    rates["PRESSURE"] = rates["FACILITY_ID"].map(factors).fillna(1.0).to_numpy()
+    rates["DAILY_RATE"] = rates["BASE_RATE"] * rates["PRESSURE"]
+    return rates
+
+
+def forecast_stockout(inventory, rates, today=None):
+    """Project every inventory row forward at its daily rate.
+
+    Adds DAILY_RATE, DAYS_UNTIL_STOCKOUT (inf when nothing is consumed),
+    STOCKOUT_DATE and RISK, soonest stockout first.
+    """
+    forecast = inventory.merge(rates[KEYS + ["DAILY_RATE"]], on=KEYS, how="left")
+    rate = forecast["DAILY_RATE"].fillna(0.0).to_numpy()
+    stock = forecast["CURRENT_STOCK"].to_numpy(dtype=float)
+
+    remaining = np.divide(stock, rate, out=np.full_like(stock, np.inf), where=rate > 0)
+    today = pd.Timestamp(today or date.today()).normalize()
+
+    forecast["DAILY_RATE"] = rate
+    forecast["DAYS_UNTIL_STOCKOUT"] = remaining
+    forecast["STOCKOUT_DATE"] = today + pd.to_timedelta(
+        np.where(np.isfinite(remaining), np.floor(remaining), np.nan), unit="D"
+    )
+    forecast["RISK"] = np.select(
+        [remaining < bound for bound, _ in RISK_LEVELS],
+        [level for _, level in RISK_LEVELS],
+        default=RISK_NONE
+    )
+
+    return forecast.sort_values("DAYS_UNTIL_STOCKOUT", ignore_index=True)
+
+
+def coverage_demand(rates, cover_days):
+    """FACILITY_ID, ITEM_ID, DEMAND: units each series uses in cover_days,
+    the input redistribution_engine reserves for senders and receivers"""
+    return rates[KEYS].assign(
+        DEMAND=np.ceil(rates["DAILY_RATE"].to_numpy() * cover_days).astype(np.int64)
+    )
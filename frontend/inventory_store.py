@@ -0,0 +1,154 @@
+"""
+Local snapshot of fact_inventory kept current with delta pulls.
+
+The first sync downloads the whole table (Arrow when available); later syncs
+only ask /test/inventory/changes for rows whose LAST_UPDATED is at or after
+the newest timestamp already held minus DELTA_OVERLAP, and upsert them by
+INVENTORY_ID. The overlap catches rows whose transaction committed after a
+later-stamped row was already pulled. Filters, paging and summary metrics
+then run locally against the snapshot.
+"""
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+
+from api_client import api_get_frame
+
+# Minimum seconds between delta pulls (unless marked stale or live)
+SYNC_INTERVAL = 10
+
+# Seconds before the watermark each delta pull asks again for, so rows that
+# committed late with an older LAST_UPDATED are not missed
+DELTA_OVERLAP = 5 * 60
+
+# Full reload every so often, in case a delta was missed
+FULL_RESYNC_INTERVAL = 15 * 60
+
+DEFAULT_ORDER = ["FACILITY_NAME", "ITEM_NAME", "INVENTORY_ID"]
+
+
+class InventorySnapshot:
+    """Columnar copy of fact_inventory shared by every session in the process.
+
+    The frame is replaced, never modified in place, so readers can keep a
+    reference without holding the lock.
+    """
+
+    def __init__(self, fetch_frame=api_get_frame, live=None):
+        self.fetch_frame = fetch_frame
+        # Returns True while change events mark the snapshot stale (live.py),
+        # which makes the interval delta pulls unnecessary
+        self.live = live or (lambda: False)
+        self.frame = None
+        self.watermark = None
+        self.synced_at = 0.0
+        self.loaded_at = 0.0
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def mark_stale(self):
+        """Force a delta pull on the next sync (e.g. after a stock update)"""
+        self._stale = True
+
+    def sync(self, force=False):
+        """Bring the snapshot up to date. Returns an error string or None."""
+        with self._lock:
+            now = time.monotonic()
+
+            if self.frame is None or now - self.loaded_at > FULL_RESYNC_INTERVAL:
+                return self._load_full(now)
+
+            if not (force or self._stale) and (self.live() or now - self.synced_at < SYNC_INTERVAL):
+                return None
+
+            return self._load_changes(now)
+
+    def _load_full(self, now):
+        df, error = self.fetch_frame("/test/inventory", use_cache=False)
+        if error is not None:
+            return error
+
+        self._replace(df.sort_values(DEFAULT_ORDER, ignore_index=True) if not df.empty else df)
+        self.loaded_at = now
+        self.synced_at = now
+        return None
+
+    def _load_changes(self, now):
+        if self.watermark is None:
+            return self._load_full(now)
+
+        since = pd.Timestamp(self.watermark) - pd.Timedelta(seconds=DELTA_OVERLAP)
+        changes, error = self.fetch_frame(
+            f"/test/inventory/changes?since={quote(since.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])}",
+            use_cache=False
+        )
+        if error is not None:
+            return error
+
+        self.synced_at = now
+        if not changes.empty:
+            # The overlap re-sends rows we already hold; only keep real changes
+            key = ["INVENTORY_ID", "LAST_UPDATED"]
+            held = self.frame.loc[self.frame["INVENTORY_ID"].isin(changes["INVENTORY_ID"]), key]
+            seen = changes[key].merge(held, on=key, how="left", indicator=True)["_merge"] == "both"
+            changes = changes[~seen.to_numpy()]
+        if changes.empty:
+            self._stale = False
+            return None
+
+        # Upsert: drop the old version of every changed row, then append
+        kept = self.frame[~self.frame["INVENTORY_ID"].isin(changes["INVENTORY_ID"])]
+        merged = pd.concat([kept, changes], ignore_index=True)
+        self._replace(merged.sort_values(DEFAULT_ORDER, ignore_index=True))
+        return None
+
+    def _replace(self, df):
+        self.frame = df
+        self._stale = False
+        if "LAST_UPDATED" in df.columns and not df.empty:
+            self.watermark = df["LAST_UPDATED"].dropna().max()
+
+    def query(self, facility_id=None, search=None, sort="default", page=0, size=50):
+        """Filter, sort and page the snapshot.
+
+        Returns the same shape as /test/inventory/page, with DataFrames in
+        place of the row lists.
+        """
+        df = self.frame
+        if df is None:
+            return {"status": "FAILED", "error": "Inventory snapshot not loaded"}
+
+        mask = pd.Series(True, index=df.index)
+        if facility_id:
+            mask &= df["FACILITY_ID"] == facility_id
+        if search:
+            mask &= df["ITEM_NAME"].str.contains(search, case=False, na=False, regex=False)
+
+        filtered = df[mask]
+
+        if sort == "stock_desc":
+            filtered = filtered.sort_values(["CURRENT_STOCK", "INVENTORY_ID"], ascending=[False, True])
+        elif sort == "stock_asc":
+            filtered = filtered.sort_values(["CURRENT_STOCK", "INVENTORY_ID"])
+
+        by_facility = (
+            filtered.groupby("FACILITY_ID", as_index=False)["CURRENT_STOCK"].sum()
+            .sort_values("CURRENT_STOCK", ascending=False)
+        )
+
+        return {
+            "status": "SUCCESS",
+            "page": page,
+            "size": size,
+            "count": len(filtered),
+            "summary": {
+                "TOTAL_ITEMS": len(filtered),
+                "TOTAL_STOCK": int(filtered["CURRENT_STOCK"].sum()),
+                "AVG_STOCK": float(filtered["CURRENT_STOCK"].mean()) if len(filtered) else 0.0,
+                "TOTAL_FACILITIES": int(filtered["FACILITY_ID"].nunique()),
+            },
+            "by_facility": by_facility,
+            "data": filtered.iloc[page * size:(page + 1) * size],
+        }
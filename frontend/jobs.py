@@ -0,0 +1,105 @@
+"""
+Client side of the backend job API (/services/jobs).
+
+start_job submits a job and keeps its id in st.session_state, so it survives
+reruns and page switches. job_progress polls it from an st.fragment: only
+that fragment reruns while the job is in flight, so the rest of the app stays
+responsive. Polls back off from JOB_POLL_MIN to JOB_POLL_MAX seconds.
+"""
+import time
+
+import streamlit as st
+
+from api_client import api_get, api_post, invalidate_cache
+
+JOB_POLL_MIN = 0.5
+JOB_POLL_MAX = 5.0
+JOB_POLL_BACKOFF = 1.5
+
+
+def _state_key(key):
+    return f"job_{key}"
+
+
+def start_job(key, job_type, payload=None):
+    """Submit /services/jobs/{job_type} and track it under key.
+
+    Returns the submit response. Any earlier result for key is dropped.
+    """
+    result = api_post(f"/services/jobs/{job_type}", payload or {})
+
+    if result.get("status") == "SUCCESS":
+        st.session_state[_state_key(key)] = {
+            "job_id": result.get("job_id"),
+            "job": result.get("job", {}),
+            "interval": JOB_POLL_MIN,
+            "next_poll": time.monotonic() + JOB_POLL_MIN,
+            "done": False,
+        }
+
+    return result
+
+
+def job_state(key):
+    """Tracked state for key: job_id, job (latest status), done, and result /
+    error once finished. None when nothing was started."""
+    return st.session_state.get(_state_key(key))
+
+
+def clear_job(key):
+    st.session_state.pop(_state_key(key), None)
+
+
+def _poll(state, invalidates):
+    data = api_get(f"/services/jobs/{state['job_id']}", use_cache=False)
+
+    if data.get("status") != "SUCCESS":
+        # Unknown job (e.g. backend restarted): stop following it
+        state.update(done=True, error=data.get("message", data.get("error")))
+        return
+
+    job = data.get("job", {})
+    state["job"] = job
+
+    if job.get("status") == "COMPLETED":
+        result = api_get(f"/services/jobs/{state['job_id']}/result", use_cache=False)
+        state.update(done=True, result=result.get("result"), error=None)
+        if invalidates:
+            invalidate_cache(*invalidates)
+    elif job.get("status") == "FAILED":
+        state.update(done=True, error=job.get("error") or "Job failed")
+    else:
+        state["interval"] = min(state["interval"] * JOB_POLL_BACKOFF, JOB_POLL_MAX)
+        state["next_poll"] = time.monotonic() + state["interval"]
+
+
+def job_progress(key, label, invalidates=()):
+    """Show a progress bar for the job tracked under key while it runs.
+
+    When it finishes the cache prefixes in invalidates are evicted and the
+    whole app reruns once, so callers can render job_state(key) normally.
+    """
+    state = job_state(key)
+    if state is None or state["done"]:
+        return
+
+    @st.fragment(run_every=JOB_POLL_MIN)
+    def _progress():
+        current = job_state(key)
+        if current is None or current["done"]:
+            return
+
+        if time.monotonic() >= current["next_poll"]:
+            _poll(current, invalidates)
+            if current["done"]:
+                st.rerun(scope="app")
+
+        job = current["job"]
+        fraction = job.get("progress")
+        detail = job.get("message") or job.get("status", "QUEUED").title()
+        if job.get("total"):
+            detail = f"{job.get('completed', 0)} / {job['total']}"
+
+        st.progress(fraction if fraction is not None else 0.0, text=f"{label}: {detail}")
+
+    _progress()
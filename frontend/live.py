@@ -0,0 +1,151 @@
+"""
+Change notifications from the backend (/services/events).
+
+One ChangeListener per process long-polls the backend from a daemon thread.
+Every event names the topics it touched; the listener evicts the matching
+cached responses and bumps a version counter per topic. Pages call
+live_updates, an st.fragment that only compares those counters (no HTTP)
+and reruns the app when one moved, so data is refetched only after it
+actually changed.
+
+While the listener is connected the watched endpoints stay cached for
+LIVE_CACHE_TTL instead of their short polling TTLs. When it drops they fall
+back to the normal TTLs and the Refresh buttons.
+"""
+import threading
+import time
+
+import streamlit as st
+
+from api_client import api_get, invalidate_cache, set_live_prefixes
+
+# Seconds the backend may hold one poll open
+EVENTS_WAIT = 25
+
+# Seconds between retries after a failed poll
+EVENTS_RETRY = 10
+
+# How often the watcher fragment looks at the listener (in process, no HTTP)
+LIVE_CHECK_SECONDS = 2
+
+# Cached GET prefixes made stale by each event topic
+TOPIC_INVALIDATIONS = {
+    "inventory": ["/test/inventory", "/services/dashboard"],
+    "pending": ["/services/redistribution/pending", "/services/dashboard"],
+    "approved": ["/services/redistribution/approved"],
+    "reports": ["/test/reports", "/services/dashboard"],
+}
+
+
+def _prefixes(topics):
+    return [prefix for topic in topics for prefix in TOPIC_INVALIDATIONS.get(topic, [])]
+
+
+class ChangeListener:
+    """Follows /services/events and keeps a change counter per topic"""
+
+    def __init__(self, fetch=api_get, wait=EVENTS_WAIT):
+        self.fetch = fetch
+        self.wait = wait
+        self.seq = None
+        self.connected = False
+        self.error = None
+        self._versions = dict.fromkeys(TOPIC_INVALIDATIONS, 0)
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, topic, handler):
+        """Call handler() whenever topic changes (e.g. to mark a snapshot stale)"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def version(self, topics):
+        """Counter that moves whenever any of topics changed"""
+        with self._lock:
+            return sum(self._versions.get(topic, 0) for topic in topics)
+
+    def poll(self):
+        """One long-poll round trip. Returns an error string or None."""
+        since = -1 if self.seq is None else self.seq
+        data = self.fetch(f"/services/events?since={since}&wait={self.wait}", use_cache=False)
+
+        if data.get("status") != "SUCCESS":
+            self._disconnect(data.get("error", "event poll failed"))
+            return self.error
+
+        # reset: backend restarted or we fell too far behind to replay
+        topics = set(TOPIC_INVALIDATIONS) if data.get("reset") else set()
+        for event in data.get("events", []):
+            topics.update(event.get("topics", []))
+        self.seq = data.get("seq", since)
+
+        if topics:
+            self._changed(topics)
+
+        if not self.connected:
+            self.connected = True
+            self.error = None
+            set_live_prefixes(_prefixes(TOPIC_INVALIDATIONS))
+        return None
+
+    def _changed(self, topics):
+        invalidate_cache(*_prefixes(topics))
+        for topic in topics:
+            for handler in self._handlers.get(topic, []):
+                handler()
+
+        # Bumped last, so a rerun it triggers already sees fresh state
+        with self._lock:
+            for topic in topics:
+                self._versions[topic] = self._versions.get(topic, 0) + 1
+
+    def _disconnect(self, error):
+        self.error = error
+        if self.connected:
+            self.connected = False
+            set_live_prefixes(())
+            # Responses cached with the long live TTL may be stale by now
+            invalidate_cache(*_prefixes(TOPIC_INVALIDATIONS))
+
+    def start(self):
+        """Keep polling from a daemon thread"""
+        if self._thread is not None:
+            return self
+
+        def loop():
+            while True:
+                if self.poll() is not None:
+                    time.sleep(EVENTS_RETRY)
+
+        self._thread = threading.Thread(target=loop, name="change-events", daemon=True)
+        self._thread.start()
+        return self
+
+
+@st.cache_resource
+def change_listener():
+    """Process-wide listener, started on first use"""
+    return ChangeListener().start()
+
+
+def live_updates(key, topics):
+    """Rerun the app once whenever one of topics changes on the backend.
+
+    Call it before the page fetches its data: every full run records the
+    current counter under key, because that run already reads fresh data.
+    """
+    listener = change_listener()
+    state_key = f"live_{key}"
+    st.session_state[state_key] = listener.version(topics)
+
+    @st.fragment(run_every=LIVE_CHECK_SECONDS)
+    def _watch():
+        if listener.version(topics) != st.session_state[state_key]:
+            st.rerun(scope="app")
+
+        if listener.connected:
+            st.caption("🟢 Live updates")
+        else:
+            st.caption(f"⚪ Live updates unavailable ({listener.error}), use Refresh")
+
+    _watch()
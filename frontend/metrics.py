@@ -0,0 +1,166 @@
+"""
+In-process performance metrics for the dashboard.
+
+Timings are kept per (kind, name) series in a rolling window, e.g.
+("get", "/test/inventory"), ("frame", "/test/inventory"),
+("chart", "Stock by facility") or ("page", "Inventory"). Like the response
+cache in api_client, the registry lives at module level, so it covers every
+session served by this Streamlit process.
+
+Every observation is also written as one JSON line to the "ecopath.metrics"
+logger (DEBUG), and the current window can be exported as Prometheus text.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Samples older than this are dropped from the percentiles
+WINDOW_SECONDS = 15 * 60
+
+# Hard cap per series so a hot endpoint can't grow without bound
+MAX_SAMPLES = 2000
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Path segments that are ids (UUIDs, long hex / numeric ids) share one series
+ID_SEGMENT = re.compile(r"/[0-9A-Fa-f-]{16,}(?=/|$)")
+
+logger = logging.getLogger("ecopath.metrics")
+
+
+def series_name(endpoint):
+    """Endpoint path without query string, ids collapsed to {id}"""
+    return ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0])
+
+
+class MetricsRegistry:
+    """Thread-safe rolling window of timings plus outcome counters"""
+
+    def __init__(self, window=WINDOW_SECONDS, max_samples=MAX_SAMPLES):
+        self.window = window
+        self.max_samples = max_samples
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, kind, name, seconds, size=None):
+        """Record one duration (seconds) and optional payload size (bytes)"""
+        now = time.time()
+        with self._lock:
+            self._samples[(kind, name)].append((now, seconds, size))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({
+                "ts": round(now, 3), "kind": kind, "name": name,
+                "ms": round(seconds * 1000, 2), "bytes": size,
+            }))
+
+    def count(self, kind, name, outcome):
+        """Increment a counter such as ("cache", endpoint, "hit")"""
+        with self._lock:
+            self._counts[(kind, name, outcome)] += 1
+
+    @contextmanager
+    def timed(self, kind, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(kind, name, time.perf_counter() - started)
+
+    def _window(self):
+        cutoff = time.time() - self.window
+        with self._lock:
+            for samples in self._samples.values():
+                while samples and samples[0][0] < cutoff:
+                    samples.popleft()
+            return (
+                {key: list(samples) for key, samples in self._samples.items() if samples},
+                dict(self._counts),
+            )
+
+    def summary(self):
+        """One row per series: KIND, NAME, COUNT, P50_MS, P95_MS, P99_MS,
+        MAX_MS, AVG_KB and, for GETs, CACHE_HIT_RATE (cache hits / lookups)"""
+        samples, counts = self._window()
+
+        rows = []
+        for (kind, name), values in samples.items():
+            durations = np.array([seconds for _, seconds, _ in values]) * 1000
+            sizes = [size for _, _, size in values if size is not None]
+            p50, p95, p99 = np.quantile(durations, QUANTILES)
+            rows.append({
+                "KIND": kind,
+                "NAME": name,
+                "COUNT": len(values),
+                "P50_MS": p50,
+                "P95_MS": p95,
+                "P99_MS": p99,
+                "MAX_MS": durations.max(),
+                "AVG_KB": np.mean(sizes) / 1024 if sizes else np.nan,
+                "CACHE_HIT_RATE": _hit_rate(counts, name) if kind == "get" else np.nan,
+            })
+
+        columns = ["KIND", "NAME", "COUNT", "P50_MS", "P95_MS", "P99_MS", "MAX_MS", "AVG_KB", "CACHE_HIT_RATE"]
+        return pd.DataFrame(rows, columns=columns).sort_values(["KIND", "P95_MS"], ascending=[True, False],
+                                                               ignore_index=True)
+
+    def prometheus(self):
+        """Current window in the Prometheus text exposition format"""
+        samples, counts = self._window()
+        lines = [
+            "# HELP ecopath_duration_seconds Rolling-window durations per series",
+            "# TYPE ecopath_duration_seconds summary",
+        ]
+        for (kind, name), values in sorted(samples.items()):
+            durations = np.array([seconds for _, seconds, _ in values])
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+            for q, value in zip(QUANTILES, np.quantile(durations, QUANTILES)):
+                lines.append(f'ecopath_duration_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+            lines.append(f"ecopath_duration_seconds_sum{{{labels}}} {durations.sum():.6f}")
+            lines.append(f"ecopath_duration_seconds_count{{{labels}}} {len(durations)}")
+
+        lines += [
+            "# HELP ecopath_payload_bytes_total Response bytes in the rolling window",
+            "# TYPE ecopath_payload_bytes_total gauge",
+        ]
+        for (kind, name), values in sorted(samples.items()):
+            sizes = [size for _, _, size in values if size is not None]
+            if sizes:
+                labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+                lines.append(f"ecopath_payload_bytes_total{{{labels}}} {sum(sizes)}")
+
+        lines += [
+            "# HELP ecopath_events_total Outcome counters since process start",
+            "# TYPE ecopath_events_total counter",
+        ]
+        for (kind, name, outcome), value in sorted(counts.items()):
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}",outcome="{_escape(outcome)}"'
+            lines.append(f"ecopath_events_total{{{labels}}} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+def _hit_rate(counts, name):
+    hits = counts.get(("cache", name, "hit"), 0)
+    lookups = hits + counts.get(("cache", name, "miss"), 0)
+    return hits / lookups if lookups else np.nan
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,267 @@
+"""
+Vectorised redistribution matching engine.
+
+Gives the same recommendations as RedistributionService.generateRecommendations
+(same surplus/deficit rules and calculatePriority score), but joins candidates
+per item with pandas and scores every pair at once with NumPy instead of the
+over x under nested loop. Input frames are the two lists returned by
+/services/redistribution/candidates.
+
+solve_transport is the optimisation-based alternative: instead of scoring
+every pair on its own terms it solves a min-cost transportation problem per
+item, so no facility gives away more than its surplus and the total distance
+travelled is minimised.
+
+Both engines take an optional allowed_pairs frame (FACILITY_ID_FROM,
+FACILITY_ID_TO), normally FacilityIndex.pairs_within(radius): facilities that
+are too far apart are then never joined, let alone scored.
+
+They also take an optional demand frame (FACILITY_ID, ITEM_ID, DEMAND),
+normally forecasting.coverage_demand: senders then keep at least their
+forecast demand and receivers are topped up to at least theirs.
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371
+
+# A transfer is only recommended when it moves more than this many units
+MIN_TRANSFER = 10
+
+RECOMMENDATION_COLUMNS = [
+    "FROM_FACILITY_ID", "FROM_FACILITY_NAME", "TO_FACILITY_ID", "TO_FACILITY_NAME",
+    "ITEM_ID", "ITEM_NAME", "QUANTITY", "DEFICIT", "DISTANCE_KM", "PRIORITY", "REASON",
+]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between arrays of points given in degrees"""
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2)
+    )
+
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def priority_score(quantity, distance, deficit):
+    """calculatePriority over arrays; quantity and deficit are positive ints,
+    so floor division matches Java's integer division"""
+    quantity = np.asarray(quantity, dtype=np.int64)
+    deficit = np.asarray(deficit, dtype=np.int64)
+
+    qty_score = np.minimum(quantity // 10, 40)
+    dist_score = np.trunc(np.maximum(30 - np.asarray(distance, dtype=float), 0)).astype(np.int64)
+    deficit_score = np.minimum(deficit // 5, 30)
+
+    return np.minimum(qty_score + dist_score + deficit_score, 100)
+
+
+def _surplus(overstocked):
+    return (overstocked["CURRENT_STOCK"].astype(np.int64)
+            - np.trunc(overstocked["MAX_STOCK_CAPACITY"].astype(float) * 0.7).astype(np.int64))
+
+
+def _demand_for(rows, demand):
+    """Forecast demand per row of rows (0 where there is none)"""
+    keys = ["FACILITY_ID", "ITEM_ID"]
+    matched = rows[keys].merge(demand[keys + ["DEMAND"]], on=keys, how="left")
+    return matched["DEMAND"].fillna(0).to_numpy(dtype=np.int64)
+
+
+def surplus_and_deficit(overstocked, understocked, demand=None):
+    """Add SURPLUS / DEFICIT columns exactly as generateRecommendations does,
+    dropping rows that can never take part in a transfer.
+
+    With demand, a sender keeps max(70% of capacity, its demand) and a
+    receiver needs max(min threshold, its demand).
+    """
+    surplus = _surplus(overstocked)
+    target = understocked["MIN_STOCK_THRESHOLD"].astype(np.int64)
+
+    if demand is not None:
+        surplus = np.minimum(
+            surplus,
+            overstocked["CURRENT_STOCK"].astype(np.int64) - _demand_for(overstocked, demand)
+        )
+        target = np.maximum(target, _demand_for(understocked, demand))
+
+    over = overstocked.assign(SURPLUS=surplus)
+    under = understocked.assign(DEFICIT=target - understocked["CURRENT_STOCK"].astype(np.int64))
+
+    # transfer = min(surplus, deficit) > MIN_TRANSFER needs both sides above it
+    return over[over["SURPLUS"] > MIN_TRANSFER], under[under["DEFICIT"] > MIN_TRANSFER]
+
+
+def build_recommendations(pairs, quantity):
+    """Score candidate pairs (one row per from/to/item) moving quantity units"""
+    quantity = np.asarray(quantity, dtype=np.int64)
+    distance = haversine_km(
+        pairs["LATITUDE_FROM"], pairs["LONGITUDE_FROM"],
+        pairs["LATITUDE_TO"], pairs["LONGITUDE_TO"]
+    )
+
+    recs = pd.DataFrame({
+        "FROM_FACILITY_ID": pairs["FACILITY_ID_FROM"].to_numpy(),
+        "FROM_FACILITY_NAME": pairs["FACILITY_NAME_FROM"].to_numpy(),
+        "TO_FACILITY_ID": pairs["FACILITY_ID_TO"].to_numpy(),
+        "TO_FACILITY_NAME": pairs["FACILITY_NAME_TO"].to_numpy(),
+        "ITEM_ID": pairs["ITEM_ID"].to_numpy(),
+        "ITEM_NAME": pairs["ITEM_NAME"].to_numpy(),
+        "QUANTITY": quantity,
+        "DEFICIT": pairs["DEFICIT"].to_numpy(),
+        "DISTANCE_KM": distance,
+        "PRIORITY": priority_score(quantity, distance, pairs["DEFICIT"]),
+    })
+
+    recs["REASON"] = (
+        "Transfer " + recs["QUANTITY"].astype(str)
+        + " units from " + recs["FROM_FACILITY_NAME"].astype(str)
+        + " (surplus) to " + recs["TO_FACILITY_NAME"].astype(str)
+        + " (deficit). Distance: " + pd.Series(np.char.mod("%.1f", distance), index=recs.index)
+        + " km"
+    )
+
+    return recs.sort_values("PRIORITY", ascending=False, ignore_index=True)
+
+
+def candidate_pairs(over, under, allowed_pairs=None):
+    """Join surplus and deficit rows that share an item, restricted to
+    allowed_pairs of facilities when given"""
+    over_cols = ["FACILITY_ID", "FACILITY_NAME", "ITEM_ID", "ITEM_NAME", "SURPLUS", "LATITUDE", "LONGITUDE"]
+    under_cols = ["FACILITY_ID", "FACILITY_NAME", "ITEM_ID", "DEFICIT", "LATITUDE", "LONGITUDE"]
+
+    if allowed_pairs is None:
+        return over[over_cols].merge(under[under_cols], on="ITEM_ID", suffixes=("_FROM", "_TO"))
+
+    # Walk sender -> nearby receivers -> their deficit rows for the same item
+    shared = ["FACILITY_ID", "FACILITY_NAME", "LATITUDE", "LONGITUDE"]
+    senders = over[over_cols].rename(columns={c: f"{c}_FROM" for c in shared})
+    receivers = under[under_cols].rename(columns={c: f"{c}_TO" for c in shared})
+
+    return (
+        senders
+        .merge(allowed_pairs, on="FACILITY_ID_FROM")
+        .merge(receivers, on=["FACILITY_ID_TO", "ITEM_ID"])
+    )
+
+
+def match_candidates(overstocked, understocked, allowed_pairs=None, demand=None):
+    """Greedy all-pairs matching, same rules as the backend engine.
+
+    Every surplus row is paired with every deficit row of the same item and
+    each pair is scored on its own terms. Returns RECOMMENDATION_COLUMNS,
+    highest priority first.
+    """
+    if overstocked.empty or understocked.empty:
+        return pd.DataFrame(columns=RECOMMENDATION_COLUMNS)
+
+    over, under = surplus_and_deficit(overstocked, understocked, demand)
+    pairs = candidate_pairs(over, under, allowed_pairs)
+
+    quantity = np.minimum(pairs["SURPLUS"], pairs["DEFICIT"])
+    keep = (quantity > MIN_TRANSFER).to_numpy()
+
+    if not keep.any():
+        return pd.DataFrame(columns=RECOMMENDATION_COLUMNS)
+
+    return build_recommendations(pairs[keep], quantity[keep])
+
+
+def _item_transport(group):
+    """Optimal flows (units per pair row) for one item's candidate pairs"""
+    from scipy.optimize import linprog
+    from scipy.sparse import coo_matrix, vstack
+
+    n = len(group)
+    columns = np.arange(n)
+    ones = np.ones(n)
+
+    from_codes, from_ids = pd.factorize(group["FACILITY_ID_FROM"])
+    to_codes, to_ids = pd.factorize(group["FACILITY_ID_TO"])
+
+    supply = group.groupby("FACILITY_ID_FROM", sort=False)["SURPLUS"].first().reindex(from_ids).to_numpy()
+    demand = group.groupby("FACILITY_ID_TO", sort=False)["DEFICIT"].first().reindex(to_ids).to_numpy()
+
+    # One row per sender (sum of its flows <= surplus) and per receiver
+    # (sum of its flows <= deficit)
+    a_ub = vstack([
+        coo_matrix((ones, (from_codes, columns)), shape=(len(from_ids), n)),
+        coo_matrix((ones, (to_codes, columns)), shape=(len(to_ids), n)),
+    ]).tocsr()
+    b_ub = np.concatenate([supply, demand]).astype(float)
+
+    # Phase 1: the most units that can move at all
+    most = linprog(-ones, A_ub=a_ub, b_ub=b_ub, bounds=(0, None), method="highs")
+    if not most.success:
+        return np.zeros(n)
+
+    # Phase 2: move that many units over the least total distance
+    cost = haversine_km(
+        group["LATITUDE_FROM"], group["LONGITUDE_FROM"],
+        group["LATITUDE_TO"], group["LONGITUDE_TO"]
+    )
+    best = linprog(
+        cost,
+        A_ub=a_ub, b_ub=b_ub,
+        A_eq=coo_matrix(ones).tocsr(), b_eq=[-most.fun],
+        bounds=(0, None),
+        method="highs"
+    )
+    if not best.success:
+        return np.zeros(n)
+
+    # Integer supplies/demands give an integral optimal vertex; rint only
+    # cleans up floating point noise
+    return np.rint(best.x)
+
+
+def solve_transport(overstocked, understocked, allowed_pairs=None, demand=None):
+    """Min-cost transportation matching, one sparse LP per item.
+
+    Surplus and deficit are derived exactly as in match_candidates. Flows of
+    MIN_TRANSFER units or fewer are dropped afterwards, as the greedy engine
+    never recommends them either. Requires scipy.
+    """
+    if overstocked.empty or understocked.empty:
+        return pd.DataFrame(columns=RECOMMENDATION_COLUMNS)
+
+    over, under = surplus_and_deficit(overstocked, understocked, demand)
+    pairs = candidate_pairs(over, under, allowed_pairs)
+
+    if pairs.empty:
+        return pd.DataFrame(columns=RECOMMENDATION_COLUMNS)
+
+    flows = np.zeros(len(pairs))
+    for rows in pairs.groupby("ITEM_ID", sort=False).indices.values():
+        flows[rows] = _item_transport(pairs.iloc[rows])
+
+    keep = flows > MIN_TRANSFER
+    if not keep.any():
+        return pd.DataFrame(columns=RECOMMENDATION_COLUMNS)
+
+    return build_recommendations(pairs[keep], flows[keep])
+
+
+def nearest_suppliers(index, overstocked, item_id, lat, lon, k=5):
+    """The k facilities nearest to (lat, lon) holding a surplus of item_id,
+    using a FacilityIndex"""
+    over = overstocked[overstocked["ITEM_ID"] == item_id]
+    return index.nearest(lat, lon, k=k, among=over.loc[_surplus(over) > MIN_TRANSFER, "FACILITY_ID"])
+
+
+def recommendations_payload(recs):
+    """Rows for POST /services/redistribution/bulk"""
+    return [
+        {
+            "fromFacilityId": row.FROM_FACILITY_ID,
+            "toFacilityId": row.TO_FACILITY_ID,
+            "itemId": row.ITEM_ID,
+            "quantity": int(row.QUANTITY),
+            "priority": int(row.PRIORITY),
+            "reason": row.REASON,
+        }
+        for row in recs.itertuples(index=False)
+    ]
@@ -0,0 +1,178 @@
+"""
+On-disk replica of the reference tables (dim_health_facilities,
+dim_medical_items).
+
+The replica lives in a small SQLite file, so a restarted process serves
+facility and item dropdowns straight from disk. A background thread asks
+/test/reference/version, which is a row count plus HASH_AGG per table, and
+only downloads /test/facilities and /test/items again when that version
+changes. Pages therefore never wait on the network for reference data. The
+only exception is the very first start, when no replica exists yet.
+"""
+import os
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+
+import pandas as pd
+
+from api_client import api_get, api_get_frame
+
+REPLICA_PATH = os.environ.get(
+    "ECOPATH_REFERENCE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "reference.sqlite")
+)
+
+# Seconds between version checks, and between retries while nothing is loaded
+REFRESH_INTERVAL = 5 * 60
+RETRY_INTERVAL = 30
+
+# SQLite table -> backend endpoint
+TABLES = {
+    "facilities": "/test/facilities",
+    "items": "/test/items",
+}
+
+
+def _storable(df):
+    """Arrow decimals arrive as Decimal objects, which sqlite3 can't bind"""
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        if df[column].map(lambda v: isinstance(v, Decimal)).any():
+            df[column] = pd.to_numeric(df[column].map(lambda v: float(v) if isinstance(v, Decimal) else v))
+    return df
+
+
+class ReferenceReplica:
+    """Facilities and items DataFrames backed by a SQLite file.
+
+    Frames are replaced, never modified in place, so readers can keep a
+    reference without holding the lock.
+    """
+
+    def __init__(self, path=None, fetch=api_get, fetch_frame=api_get_frame):
+        self.path = path or REPLICA_PATH
+        self.fetch = fetch
+        self.fetch_frame = fetch_frame
+        self.facilities = pd.DataFrame()
+        self.items = pd.DataFrame()
+        self.version = None
+        self.synced_at = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def loaded(self):
+        return not self.facilities.empty
+
+    def load(self):
+        """Read the replica from disk; returns False when there is none yet"""
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            with sqlite3.connect(self.path) as conn:
+                frames = {table: pd.read_sql(f"SELECT * FROM {table}", conn) for table in TABLES}
+                meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except (sqlite3.Error, pd.errors.DatabaseError):
+            return False
+
+        self.facilities = frames["facilities"]
+        self.items = frames["items"]
+        self.version = meta.get("version")
+        self.synced_at = meta.get("synced_at")
+        return True
+
+    def refresh(self, force=False):
+        """Download the tables again if the backend version moved.
+
+        Returns an error string or None; on error the current data is kept.
+        """
+        with self._lock:
+            remote = self.fetch("/test/reference/version", use_cache=False)
+            if remote.get("status") != "SUCCESS":
+                self.error = remote.get("error", "version check failed")
+                return self.error
+
+            version = str(remote.get("version"))
+            if not force and self.loaded and version == self.version:
+                self.error = None
+                return None
+
+            frames = {}
+            for table, endpoint in TABLES.items():
+                df, error = self.fetch_frame(endpoint, use_cache=False)
+                if error is not None:
+                    self.error = error
+                    return error
+                frames[table] = df
+
+            synced_at = time.strftime("%Y-%m-%d %H:%M:%S")
+            try:
+                self._save(frames, version, synced_at)
+            except (OSError, sqlite3.Error) as e:
+                # Still serve the fresh data from memory
+                self.error = f"Could not write replica: {e}"
+
+            self.facilities = frames["facilities"]
+            self.items = frames["items"]
+            self.version = version
+            self.synced_at = synced_at
+            return self.error
+
+    def _save(self, frames, version, synced_at):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+
+        # Write a fresh file and swap it in, so a reader never sees half a sync
+        with sqlite3.connect(tmp_path) as conn:
+            for table, df in frames.items():
+                _storable(df).to_sql(table, conn, index=False, if_exists="replace")
+            conn.execute("DROP TABLE IF EXISTS meta")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [("version", version), ("synced_at", synced_at)]
+            )
+        os.replace(tmp_path, self.path)
+
+    def open(self):
+        """Load from disk, falling back to a blocking download on first run,
+        then keep the replica fresh in the background"""
+        if self.load():
+            self.start(check_now=True)
+        else:
+            self.refresh(force=True)
+            self.start(check_now=not self.loaded)
+        return self
+
+    def start(self, interval=REFRESH_INTERVAL, check_now=True):
+        """Keep the replica fresh from a daemon thread"""
+        if self._thread is not None:
+            return
+
+        def loop():
+            if not check_now:
+                time.sleep(interval)
+            while True:
+                self.refresh()
+                time.sleep(interval if self.loaded else RETRY_INTERVAL)
+
+        self._thread = threading.Thread(target=loop, name="reference-refresh", daemon=True)
+        self._thread.start()
+
+    def facility_options(self):
+        """[(FACILITY_ID, "ID - name"), ...] for selectboxes"""
+        if not self.loaded:
+            return []
+        df = self.facilities
+        return list(zip(df["FACILITY_ID"], df["FACILITY_ID"] + " - " + df["FACILITY_NAME"].fillna("")))
+
+    def item_options(self):
+        """[(ITEM_ID, "ID - name"), ...] for selectboxes"""
+        if self.items.empty:
+            return []
+        df = self.items
+        return list(zip(df["ITEM_ID"], df["ITEM_ID"] + " - " + df["ITEM_NAME"].fillna("")))
@@ -0,0 +1,198 @@
+"""
+Local front end for nurse-report extraction.
+
+Reports go through three stages, cheapest first:
+
+1. a content-hash cache of earlier extractions,
+2. a rule/regex extractor built from the same synonym table as
+   GeminiService.normalizeDisease,
+3. the LLM (normally Gemini, run as a backend report-process job), only
+   when the rules are not confident enough.
+
+When the LLM fails (quota, network) the rule result is used anyway, so
+ingestion keeps working. stub_llm is a deterministic offline stand-in.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# Same order and synonyms as GeminiService.normalizeDisease
+DISEASE_SYNONYMS = [
+    ("DBD", ["dbd", "demam berdarah", "dengue"]),
+    ("ISPA", ["ispa", "infeksi saluran", "batuk", "pilek"]),
+    ("Diare", ["diare", "mencret"]),
+    ("COVID-19", ["covid", "corona"]),
+    ("Demam Tifoid", ["tifoid", "tipes", "typhoid"]),
+    ("Malaria", ["malaria"]),
+    ("Pneumonia", ["pneumonia"]),
+    ("Tuberkulosis", ["tuberkulosis", "tbc", "tb"]),
+]
+
+# Checked from most to least severe; the first hit wins
+SEVERITY_KEYWORDS = [
+    ("Critical", ["kritis", "critical", "darurat", "gawat"]),
+    ("High", ["berat", "parah", "severe"]),
+    ("Medium", ["sedang", "moderate", "medium"]),
+    ("Low", ["ringan", "mild", "low"]),
+]
+
+# Same spelling as the stored reports and dashboard colours; GeminiService
+# normalizes whatever the client sends to these four and defaults to Medium
+DEFAULT_SEVERITY = "Medium"
+
+PATIENT_NOUNS = r"(?:orang\s+)?(?:pasien|penderita|kasus|orang|warga|anak|balita|patients?|cases?|people)"
+
+# Rule results at or above this confidence skip the LLM
+CONFIDENCE_THRESHOLD = 0.85
+
+EXTRACTION_CACHE_MAX = 4096
+
+
+def _word_pattern(words):
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\b", re.IGNORECASE)
+
+
+_DISEASE_PATTERNS = [(name, _word_pattern(words)) for name, words in DISEASE_SYNONYMS]
+_SEVERITY_PATTERNS = [(level, _word_pattern(words)) for level, words in SEVERITY_KEYWORDS]
+
+# "15 pasien", "15 orang pasien", "pasien sebanyak 15", "jumlah kasus: 15"
+_COUNT_BEFORE = re.compile(r"(\d+)\s*" + PATIENT_NOUNS + r"\b", re.IGNORECASE)
+_COUNT_AFTER = re.compile(PATIENT_NOUNS + r"\D{0,15}?(\d+)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def normalize_text(text):
+    return " ".join(text.lower().split())
+
+
+def content_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def extract_rules(text):
+    """Rule-based extraction with a confidence in [0, 1].
+
+    0.6 for exactly one disease (0.2 when several match), 0.3 for a patient
+    count next to a patient noun (0.15 for a single bare number), 0.1 for an
+    explicit severity word. Several counts ("15 pasien ..., 5 pasien sudah
+    pulang") get no credit and only the first is kept, so the result always
+    stays below CONFIDENCE_THRESHOLD and goes to the LLM.
+    """
+    confidence = 0.0
+
+    diseases = [name for name, pattern in _DISEASE_PATTERNS if pattern.search(text)]
+    if len(diseases) == 1:
+        confidence += 0.6
+    elif diseases:
+        confidence += 0.2
+    disease = diseases[0] if diseases else "Unknown"
+
+    counts = [int(n) for n in _COUNT_BEFORE.findall(text)] or [int(n) for n in _COUNT_AFTER.findall(text)]
+    if len(counts) == 1:
+        confidence += 0.3
+    elif not counts:
+        numbers = _NUMBER.findall(text)
+        if len(numbers) == 1:
+            counts = [int(numbers[0])]
+            confidence += 0.15
+
+    severity = next((level for level, pattern in _SEVERITY_PATTERNS if pattern.search(text)), None)
+    if severity is not None:
+        confidence += 0.1
+
+    return {
+        "disease": disease,
+        "severity": severity or DEFAULT_SEVERITY,
+        "patient_count": counts[0] if counts else 0,
+        "confidence": round(min(confidence, 1.0), 2),
+        "source": "rules",
+    }
+
+
+def stub_llm(text):
+    """Offline stand-in for the LLM: the rule result, always answering"""
+    result = extract_rules(text)
+    return {key: result[key] for key in ("disease", "severity", "patient_count")}
+
+
+class ReportExtractor:
+    """Cache -> rules -> LLM pipeline, safe to share between sessions.
+
+    llm is a callable text -> {disease, severity, patient_count} that raises
+    (or returns None) when it cannot answer.
+    """
+
+    def __init__(self, llm=None, threshold=CONFIDENCE_THRESHOLD, cache_size=EXTRACTION_CACHE_MAX):
+        self.llm = llm
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key):
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def remember(self, text, extraction):
+        """Cache an extraction obtained elsewhere (e.g. a backend Gemini job)"""
+        if extraction and extraction.get("disease"):
+            self._remember(content_hash(text), {
+                "disease": extraction["disease"],
+                "severity": extraction.get("severity") or DEFAULT_SEVERITY,
+                "patient_count": int(extraction.get("patient_count") or 0),
+                "confidence": 1.0,
+                "source": "llm",
+            })
+
+    def extract_local(self, text):
+        """Cached or confident rule extraction, or None when the LLM is needed"""
+        cached = self._cached(content_hash(text))
+        if cached is not None:
+            return dict(cached, source="cache")
+
+        result = extract_rules(text)
+        return result if result["confidence"] >= self.threshold else None
+
+    def extract(self, text):
+        """Extraction dict with disease, severity, patient_count, confidence
+        and source (cache / rules / llm / rules-fallback)"""
+        key = content_hash(text)
+
+        cached = self._cached(key)
+        if cached is not None:
+            return dict(cached, source="cache")
+
+        result = extract_rules(text)
+
+        if result["confidence"] < self.threshold and self.llm is not None:
+            try:
+                answer = self.llm(text)
+            except Exception:
+                answer = None
+
+            if not answer:
+                # LLM unavailable: keep ingesting with the rule result, but
+                # don't cache it so a later attempt can still ask the LLM
+                return dict(result, source="rules-fallback")
+
+            result = {
+                "disease": answer.get("disease") or "Unknown",
+                "severity": answer.get("severity") or DEFAULT_SEVERITY,
+                "patient_count": int(answer.get("patient_count") or 0),
+                "confidence": 1.0,
+                "source": "llm",
+            }
+
+        self._remember(key, result)
+        return result
@@ -0,0 +1,106 @@
+"""
+Spatial index over dim_health_facilities.
+
+Facilities are placed on the unit sphere as 3D points and indexed with a
+KD-tree; straight-line (chord) distance on the sphere grows monotonically
+with great-circle distance, so radius and k-nearest queries are exact while
+staying sub-linear. Distances returned are Haversine kilometres.
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371
+
+
+def _unit_vectors(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack([
+        np.cos(lat) * np.cos(lon),
+        np.cos(lat) * np.sin(lon),
+        np.sin(lat),
+    ])
+
+
+def _km_to_chord(km):
+    return 2 * np.sin(np.minimum(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+class FacilityIndex:
+    """KD-tree over facility coordinates (needs scipy)"""
+
+    def __init__(self, facilities):
+        from scipy.spatial import cKDTree
+
+        located = facilities.dropna(subset=["LATITUDE", "LONGITUDE"])
+        self.facilities = located.reset_index(drop=True)
+        self.ids = self.facilities["FACILITY_ID"].to_numpy()
+        self._positions = {facility_id: i for i, facility_id in enumerate(self.ids)}
+        self._tree = cKDTree(_unit_vectors(self.facilities["LATITUDE"], self.facilities["LONGITUDE"]))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def location(self, facility_id):
+        """(lat, lon) of a facility, or None if it has no coordinates"""
+        i = self._positions.get(facility_id)
+        if i is None:
+            return None
+        row = self.facilities.iloc[i]
+        return float(row["LATITUDE"]), float(row["LONGITUDE"])
+
+    def _result(self, positions, chords):
+        found = self.facilities.iloc[positions].copy()
+        found["DISTANCE_KM"] = _chord_to_km(chords)
+        return found.sort_values("DISTANCE_KM", ignore_index=True)
+
+    def within(self, lat, lon, radius_km):
+        """All facilities within radius_km of a point, nearest first"""
+        point = _unit_vectors([lat], [lon])[0]
+        positions = self._tree.query_ball_point(point, _km_to_chord(radius_km))
+        chords = np.linalg.norm(self._tree.data[positions] - point, axis=1) if positions else []
+        return self._result(positions, chords)
+
+    def nearest(self, lat, lon, k=5, among=None):
+        """k nearest facilities to a point, optionally only those in among
+        (e.g. the facilities holding a surplus of some item)"""
+        allowed = None if among is None else set(among)
+        if len(self) == 0 or k <= 0 or allowed == set():
+            return self._result([], [])
+
+        point = _unit_vectors([lat], [lon])[0]
+        k_query = min(len(self), k if allowed is None else max(k * 4, 16))
+
+        while True:
+            chords, positions = self._tree.query(point, k=k_query)
+            chords, positions = np.atleast_1d(chords), np.atleast_1d(positions)
+
+            if allowed is not None:
+                mask = np.isin(self.ids[positions], list(allowed))
+                chords, positions = chords[mask], positions[mask]
+
+            if len(positions) >= k or k_query == len(self):
+                return self._result(positions[:k], chords[:k])
+
+            k_query = min(len(self), k_query * 4)
+
+    def pairs_within(self, radius_km):
+        """Facility pairs no more than radius_km apart, in both directions.
+
+        Each facility is also paired with itself, so pruning a candidate set
+        with these pairs only ever removes pairs that are too far apart.
+        """
+        pairs = self._tree.query_pairs(_km_to_chord(radius_km), output_type="ndarray")
+        diagonal = np.arange(len(self))
+
+        from_pos = np.concatenate([pairs[:, 0], pairs[:, 1], diagonal])
+        to_pos = np.concatenate([pairs[:, 1], pairs[:, 0], diagonal])
+
+        return pd.DataFrame({
+            "FACILITY_ID_FROM": self.ids[from_pos],
+            "FACILITY_ID_TO": self.ids[to_pos],
+        })
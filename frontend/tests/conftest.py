@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Frontend modules import each other as top-level modules (streamlit run app.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
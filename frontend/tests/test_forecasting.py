@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecasting import (RISK_NONE, consumption_matrix, consumption_rates, coverage_demand, forecast_stockout,
+                         pressure_factors, smoothed_rates)
+
+TODAY = "2026-03-10"
+
+
+def daily_frame(rows):
+    """rows: (facility, item, day, quantity)"""
+    return pd.DataFrame(rows, columns=["FACILITY_ID", "ITEM_ID", "DAY", "QUANTITY"])
+
+
+def test_matrix_places_days_by_offset_from_today():
+    daily = daily_frame([
+        ("F1", "I1", "2026-03-10", 5),     # today -> last column
+        ("F1", "I1", "2026-03-06", 3),     # 4 days ago -> first column
+        ("F1", "I1", "2026-03-06", 2),     # same day adds up
+        ("F1", "I1", "2026-03-05", 100),   # outside the 5 day window
+        ("F1", "I1", "2026-03-11", 100),   # future
+        ("F2", "I1", "2026-03-08", 7),
+    ])
+    keys, matrix = consumption_matrix(daily, days=5, today=TODAY)
+
+    assert keys.to_dict("records") == [
+        {"FACILITY_ID": "F1", "ITEM_ID": "I1"},
+        {"FACILITY_ID": "F2", "ITEM_ID": "I1"},
+    ]
+    np.testing.assert_array_equal(matrix, [
+        [5, 0, 0, 0, 5],
+        [0, 0, 7, 0, 0],
+    ])
+
+
+def test_matrix_of_no_usage():
+    keys, matrix = consumption_matrix(daily_frame([]), days=5, today=TODAY)
+    assert keys.empty
+    assert matrix.shape == (0, 5)
+
+
+def test_constant_usage_smooths_to_itself():
+    np.testing.assert_allclose(smoothed_rates(np.full((1, 30), 4.0)), [4.0])
+
+
+def test_days_before_first_use_are_not_weighted():
+    # A newly stocked item used 10/day for its last two days is not diluted
+    matrix = np.array([[0, 0, 0, 10, 10]], dtype=float)
+    np.testing.assert_allclose(smoothed_rates(matrix, alpha=0.5), [10.0])
+
+
+def test_gaps_after_first_use_count_as_zero():
+    # weights 0.125, 0.25, 0.5: (10 * 0.125) / (0.125 + 0.25 + 0.5)
+    matrix = np.array([[10, 0, 0]], dtype=float)
+    np.testing.assert_allclose(smoothed_rates(matrix, alpha=0.5), [1.25 / 0.875])
+
+
+def test_series_without_usage_has_zero_rate():
+    np.testing.assert_array_equal(smoothed_rates(np.zeros((2, 5))), [0.0, 0.0])
+
+
+def test_pressure_factor_is_clipped():
+    pressure = pd.DataFrame({
+        "FACILITY_ID": ["calm", "busy", "outbreak", "quiet"],
+        "RECENT_PATIENTS": [7, 14, 700, 0],
+        "WINDOW_PATIENTS": [90, 90, 900, 0],
+    })
+    factors = pressure_factors(pressure, days=90)
+
+    # recent / average = (14 / 7) / (90 / 90) = 2 -> 1 + 0.5 * (2 - 1)
+    assert factors.to_dict() == pytest.approx({"calm": 1.0, "busy": 1.5, "outbreak": 2.0, "quiet": 1.0})
+
+
+def test_rates_apply_pressure_per_facility():
+    daily = daily_frame([("F1", "I1", TODAY, 4), ("F2", "I1", TODAY, 4)])
+    pressure = pd.DataFrame({"FACILITY_ID": ["F1"], "RECENT_PATIENTS": [14], "WINDOW_PATIENTS": [90]})
+    rates = consumption_rates(daily, pressure, days=90, today=TODAY).set_index("FACILITY_ID")
+
+    assert rates.loc["F1", "DAILY_RATE"] == pytest.approx(6.0)
+    assert rates.loc["F2", "PRESSURE"] == 1.0
+    assert rates.loc["F2", "DAILY_RATE"] == pytest.approx(4.0)
+
+
+def test_stockout_risk_boundaries():
+    inventory = pd.DataFrame({
+        "FACILITY_ID": ["F"] * 6,
+        "ITEM_ID": ["a", "b", "c", "d", "e", "f"],
+        "CURRENT_STOCK": [69, 70, 140, 299, 300, 50],
+    })
+    rates = pd.DataFrame({
+        "FACILITY_ID": ["F"] * 5,
+        "ITEM_ID": ["a", "b", "c", "d", "e"],
+        "DAILY_RATE": [10.0, 10.0, 10.0, 10.0, 10.0],
+    })
+    forecast = forecast_stockout(inventory, rates, today=TODAY).set_index("ITEM_ID")
+
+    assert forecast["RISK"].to_dict() == {
+        "a": "CRITICAL",    # 6.9 days
+        "b": "HIGH",        # exactly 7
+        "c": "MEDIUM",      # exactly 14
+        "d": "MEDIUM",      # 29.9
+        "e": RISK_NONE,     # exactly 30
+        "f": RISK_NONE,     # no rate
+    }
+    assert forecast.loc["a", "STOCKOUT_DATE"] == pd.Timestamp("2026-03-16")
+
+
+def test_no_consumption_never_stocks_out():
+    inventory = pd.DataFrame({"FACILITY_ID": ["F", "F"], "ITEM_ID": ["a", "b"], "CURRENT_STOCK": [5, 5]})
+    rates = pd.DataFrame({"FACILITY_ID": ["F", "F"], "ITEM_ID": ["a", "b"], "DAILY_RATE": [0.0, 1.0]})
+    forecast = forecast_stockout(inventory, rates, today=TODAY)
+
+    # soonest first, the unused item last
+    assert forecast["ITEM_ID"].tolist() == ["b", "a"]
+    assert np.isinf(forecast.loc[1, "DAYS_UNTIL_STOCKOUT"])
+    assert pd.isna(forecast.loc[1, "STOCKOUT_DATE"])
+    assert forecast.loc[1, "DAILY_RATE"] == 0.0
+
+
+def test_coverage_demand_rounds_up():
+    rates = pd.DataFrame({"FACILITY_ID": ["F"], "ITEM_ID": ["a"], "DAILY_RATE": [2.1]})
+    assert coverage_demand(rates, 7)["DEMAND"].tolist() == [15]
@@ -0,0 +1,192 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from redistribution_engine import (MIN_TRANSFER, haversine_km, match_candidates, priority_score, solve_transport,
+                                   surplus_and_deficit)
+
+# Degrees of latitude per km along a meridian
+KM = 1 / 111.195
+
+
+def java_calculate_priority(quantity, distance, deficit):
+    """RedistributionService.calculatePriority, line for line (int division, (int) cast)"""
+    qty_score = min(int(quantity / 10), 40)
+    dist_score = int(max(30 - distance, 0))
+    deficit_score = min(int(deficit / 5), 30)
+    return min(qty_score + dist_score + deficit_score, 100)
+
+
+def java_generate(overstocked, understocked):
+    """generateRecommendations' nested loop: (from, to, item, quantity, priority)"""
+    recs = []
+    for over in overstocked.itertuples():
+        for under in understocked.itertuples():
+            if over.ITEM_ID != under.ITEM_ID:
+                continue
+            surplus = over.CURRENT_STOCK - int(over.MAX_STOCK_CAPACITY * 0.7)
+            deficit = under.MIN_STOCK_THRESHOLD - under.CURRENT_STOCK
+            quantity = min(surplus, deficit)
+            if quantity > 10:
+                distance = float(haversine_km(over.LATITUDE, over.LONGITUDE, under.LATITUDE, under.LONGITUDE))
+                recs.append((over.FACILITY_ID, under.FACILITY_ID, over.ITEM_ID, quantity,
+                             java_calculate_priority(quantity, distance, deficit)))
+    return sorted(recs)
+
+
+def overstocked_frame(rows):
+    """rows: (facility, item, stock, capacity, km north of the origin)"""
+    return pd.DataFrame([
+        {"FACILITY_ID": f, "FACILITY_NAME": f"Facility {f}", "ITEM_ID": i, "ITEM_NAME": f"Item {i}",
+         "CURRENT_STOCK": stock, "MAX_STOCK_CAPACITY": capacity, "LATITUDE": km * KM, "LONGITUDE": 0.0}
+        for f, i, stock, capacity, km in rows
+    ])
+
+
+def understocked_frame(rows):
+    """rows: (facility, item, stock, min threshold, km north of the origin)"""
+    return pd.DataFrame([
+        {"FACILITY_ID": f, "FACILITY_NAME": f"Facility {f}", "ITEM_ID": i, "ITEM_NAME": f"Item {i}",
+         "CURRENT_STOCK": stock, "MIN_STOCK_THRESHOLD": threshold, "LATITUDE": km * KM, "LONGITUDE": 0.0}
+        for f, i, stock, threshold, km in rows
+    ])
+
+
+def flows(recs):
+    return {(r.FROM_FACILITY_ID, r.TO_FACILITY_ID, r.ITEM_ID): int(r.QUANTITY) for r in recs.itertuples()}
+
+
+@pytest.mark.parametrize("quantity, distance, deficit", [
+    (11, 0.0, 11),
+    (19, 29.99, 24),
+    (50, 4.6, 50),
+    (399, 12.5, 149),
+    (400, 0.0, 150),
+    (1000, 31.0, 1000),
+    (15, 30.0, 15),
+])
+def test_priority_matches_calculate_priority(quantity, distance, deficit):
+    assert priority_score(quantity, distance, deficit) == java_calculate_priority(quantity, distance, deficit)
+
+
+def test_priority_known_values():
+    # 50 // 10 + int(30 - 4.6) + 50 // 5
+    assert priority_score(50, 4.6, 50) == 5 + 25 + 10
+    # capped per component and overall
+    assert priority_score(10_000, 0.0, 10_000) == 100
+
+
+def test_surplus_truncates_like_java():
+    over = overstocked_frame([("A", "X", 100, 115, 0)])      # 115 * 0.7 = 80.5 -> 80
+    under = understocked_frame([("B", "X", 5, 30, 1)])
+    over, under = surplus_and_deficit(over, under)
+
+    assert over["SURPLUS"].tolist() == [20]
+    assert under["DEFICIT"].tolist() == [25]
+
+
+def test_surplus_and_deficit_drop_rows_at_min_transfer():
+    over = overstocked_frame([("A", "X", 80, 100, 0), ("B", "X", 81, 100, 0)])     # surplus 10, 11
+    under = understocked_frame([("C", "X", 40, 50, 1), ("D", "X", 39, 50, 1)])     # deficit 10, 11
+    over, under = surplus_and_deficit(over, under)
+
+    assert over["FACILITY_ID"].tolist() == ["B"]
+    assert under["FACILITY_ID"].tolist() == ["D"]
+
+
+def test_demand_raises_what_senders_keep_and_receivers_need():
+    over = overstocked_frame([("A", "X", 130, 100, 0)])       # surplus 60
+    under = understocked_frame([("B", "X", 10, 30, 1)])       # deficit 20
+    demand = pd.DataFrame({"FACILITY_ID": ["A", "B"], "ITEM_ID": ["X", "X"], "DEMAND": [100, 70]})
+    over, under = surplus_and_deficit(over, under, demand)
+
+    assert over["SURPLUS"].tolist() == [30]
+    assert under["DEFICIT"].tolist() == [60]
+
+
+def test_match_candidates_matches_backend_loop():
+    over = overstocked_frame([
+        ("A", "X", 130, 100, 0),
+        ("B", "X", 95, 100, 12.3),
+        ("C", "Y", 200, 150, 40),
+        ("D", "Y", 71, 100, 3),        # surplus 1, never a sender
+    ])
+    under = understocked_frame([
+        ("E", "X", 10, 60, 4.6),
+        ("F", "X", 20, 35, 25),
+        ("G", "Y", 0, 90, 8),
+        ("H", "Z", 0, 90, 8),          # nobody holds Z
+    ])
+
+    recs = match_candidates(over, under)
+    got = sorted(zip(recs["FROM_FACILITY_ID"], recs["TO_FACILITY_ID"], recs["ITEM_ID"],
+                     recs["QUANTITY"].astype(int), recs["PRIORITY"].astype(int)))
+
+    assert got == java_generate(over, under)
+    assert recs["PRIORITY"].is_monotonic_decreasing
+
+
+def test_transport_serves_nearest_receiver_and_drops_small_remainder():
+    over = overstocked_frame([("S", "X", 130, 100, 0)])                          # surplus 60
+    under = understocked_frame([("NEAR", "X", 10, 60, 5), ("FAR", "X", 10, 60, 50)])   # 50 each
+
+    assert flows(solve_transport(over, under)) == {("S", "NEAR", "X"): 50}
+
+
+def test_transport_never_ships_more_than_surplus_or_deficit():
+    over = overstocked_frame([
+        ("A", "X", 130, 100, 0),       # surplus 60
+        ("B", "X", 110, 100, 20),      # surplus 40
+        ("C", "Y", 300, 200, 10),      # surplus 160
+    ])
+    under = understocked_frame([
+        ("D", "X", 0, 45, 5),
+        ("E", "X", 0, 45, 15),
+        ("F", "X", 0, 45, 30),
+        ("G", "Y", 0, 100, 2),
+        ("H", "Y", 0, 100, 60),
+    ])
+    recs = solve_transport(over, under)
+    over_s, under_d = surplus_and_deficit(over, under)
+
+    sent = recs.groupby("FROM_FACILITY_ID")["QUANTITY"].sum()
+    received = recs.groupby("TO_FACILITY_ID")["QUANTITY"].sum()
+    surplus = over_s.set_index("FACILITY_ID")["SURPLUS"]
+    deficit = under_d.set_index("FACILITY_ID")["DEFICIT"]
+
+    assert (sent <= surplus.reindex(sent.index)).all()
+    assert (received <= deficit.reindex(received.index)).all()
+    assert (recs["QUANTITY"] > MIN_TRANSFER).all()
+    assert np.array_equal(recs["QUANTITY"], np.rint(recs["QUANTITY"]))
+
+
+def test_transport_minimises_distance_for_the_same_volume():
+    # Either sender can cover either receiver; the crossing assignment is longer
+    over = overstocked_frame([("A", "X", 100, 100, 0), ("B", "X", 100, 100, 100)])      # 30 each
+    under = understocked_frame([("C", "X", 0, 30, 1), ("D", "X", 0, 30, 99)])           # 30 each
+
+    assert flows(solve_transport(over, under)) == {("A", "C", "X"): 30, ("B", "D", "X"): 30}
+
+
+@pytest.mark.parametrize("engine", [match_candidates, solve_transport])
+def test_allowed_pairs_prune_far_pairs(engine):
+    over = overstocked_frame([("S", "X", 130, 100, 0)])
+    under = understocked_frame([("NEAR", "X", 10, 60, 5), ("FAR", "X", 10, 60, 50)])
+    allowed = pd.DataFrame({
+        "FACILITY_ID_FROM": ["S", "NEAR", "S", "NEAR", "FAR"],
+        "FACILITY_ID_TO": ["NEAR", "S", "S", "NEAR", "FAR"],
+    })
+
+    recs = engine(over, under, allowed_pairs=allowed)
+    assert set(recs["TO_FACILITY_ID"]) == {"NEAR"}
+
+    unpruned = engine(over, under.iloc[[1]])
+    assert set(unpruned["TO_FACILITY_ID"]) == {"FAR"}
+    assert engine(over, under.iloc[[1]], allowed_pairs=allowed).empty
+
+
+def test_distance_is_haversine_km():
+    assert float(haversine_km(0, 0, 50 * KM, 0)) == pytest.approx(50, rel=1e-6)
+    assert math.isclose(float(haversine_km(0, 0, 0, 0)), 0)
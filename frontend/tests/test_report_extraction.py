@@ -0,0 +1,136 @@
+import pytest
+
+from report_extraction import (CONFIDENCE_THRESHOLD, DEFAULT_SEVERITY, ReportExtractor, extract_rules,
+                               stub_llm)
+
+# Synonym -> name, as GeminiService.normalizeDisease maps them
+JAVA_NORMALIZE_DISEASE = {
+    "dbd": "DBD", "demam berdarah": "DBD", "dengue": "DBD",
+    "ispa": "ISPA", "infeksi saluran": "ISPA", "batuk": "ISPA", "pilek": "ISPA",
+    "diare": "Diare", "mencret": "Diare",
+    "covid": "COVID-19", "corona": "COVID-19",
+    "tifoid": "Demam Tifoid", "tipes": "Demam Tifoid", "typhoid": "Demam Tifoid",
+    "malaria": "Malaria",
+    "pneumonia": "Pneumonia",
+    "tuberkulosis": "Tuberkulosis", "tbc": "Tuberkulosis", "tb": "Tuberkulosis",
+}
+
+
+@pytest.mark.parametrize("synonym, disease", JAVA_NORMALIZE_DISEASE.items())
+def test_disease_synonyms_match_gemini_service(synonym, disease):
+    assert extract_rules(f"12 pasien {synonym.upper()} hari ini")["disease"] == disease
+
+
+def test_unknown_disease():
+    result = extract_rules("12 pasien demam biasa")
+    assert result["disease"] == "Unknown"
+    assert result["confidence"] < CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("text, count", [
+    ("15 pasien DBD", 15),
+    ("15 orang pasien DBD", 15),
+    ("pasien DBD sebanyak 15", 15),
+    ("DBD, jumlah kasus: 15", 15),
+    ("8 patients with malaria", 8),
+])
+def test_count_next_to_patient_noun(text, count):
+    result = extract_rules(text)
+    assert result["patient_count"] == count
+    assert result["confidence"] >= CONFIDENCE_THRESHOLD
+
+
+def test_bare_number_is_less_confident():
+    result = extract_rules("DBD 15")
+    assert result["patient_count"] == 15
+    assert result["confidence"] == pytest.approx(0.75)
+
+
+@pytest.mark.parametrize("text", [
+    "Ada 15 pasien DBD kondisi berat, 5 pasien sudah pulang",
+    "Hari ini 12 pasien DBD, kemarin 10 pasien DBD",
+])
+def test_several_counts_are_not_summed_and_go_to_the_llm(text):
+    result = extract_rules(text)
+    assert result["patient_count"] in (15, 12)
+    assert result["confidence"] < CONFIDENCE_THRESHOLD
+
+
+def test_severity_words():
+    assert extract_rules("10 pasien DBD kondisi kritis")["severity"] == "Critical"
+    assert extract_rules("10 pasien DBD gejala ringan")["severity"] == "Low"
+    assert extract_rules("10 pasien DBD")["severity"] == DEFAULT_SEVERITY
+
+
+def test_confident_rules_skip_the_llm():
+    def llm(text):
+        raise AssertionError("LLM called for a confident rule result")
+
+    result = ReportExtractor(llm=llm).extract("15 pasien DBD kondisi berat")
+    assert result["source"] == "rules"
+    assert result["patient_count"] == 15
+
+
+def test_extract_with_stub_llm_is_cached():
+    extractor = ReportExtractor(llm=stub_llm)
+    text = "Ada 15 pasien DBD kondisi berat, 5 pasien sudah pulang"
+
+    first = extractor.extract(text)
+    assert first["source"] == "llm"
+    assert first["disease"] == "DBD"
+    assert first["confidence"] == 1.0
+
+    # Whitespace and case do not change the content hash
+    second = extractor.extract("  ada 15 PASIEN dbd kondisi berat,  5 pasien sudah pulang ")
+    assert second["source"] == "cache"
+    assert second["patient_count"] == first["patient_count"]
+
+
+def test_failing_llm_falls_back_to_rules_without_caching():
+    calls = []
+
+    def llm(text):
+        calls.append(text)
+        raise RuntimeError("quota exceeded")
+
+    extractor = ReportExtractor(llm=llm)
+    text = "Hari ini 12 pasien DBD, kemarin 10 pasien DBD"
+
+    assert extractor.extract(text)["source"] == "rules-fallback"
+    assert extractor.extract(text)["source"] == "rules-fallback"
+    assert len(calls) == 2
+    assert extractor.extract_local(text) is None
+
+
+def test_llm_returning_nothing_falls_back_to_rules():
+    result = ReportExtractor(llm=lambda text: None).extract("pasien demam")
+    assert result["source"] == "rules-fallback"
+
+
+def test_remember_makes_the_next_extraction_a_cache_hit():
+    extractor = ReportExtractor()
+    text = "Hari ini 12 pasien DBD, kemarin 10 pasien DBD"
+    assert extractor.extract_local(text) is None
+
+    extractor.remember(text, {"disease": "DBD", "severity": "high", "patient_count": "12"})
+
+    cached = extractor.extract_local(text)
+    assert cached["source"] == "cache"
+    assert cached["patient_count"] == 12
+    assert cached["disease"] == "DBD"
+
+
+def test_remember_ignores_extractions_without_disease():
+    extractor = ReportExtractor()
+    extractor.remember("12 pasien", {"disease": None, "patient_count": 12})
+    assert extractor.extract_local("12 pasien") is None
+
+
+def test_cache_is_bounded():
+    extractor = ReportExtractor(llm=stub_llm, cache_size=2)
+    texts = [f"Hari ini {n} pasien DBD, kemarin 1 pasien DBD" for n in (10, 11, 12)]
+    for text in texts:
+        extractor.extract(text)
+
+    assert extractor.extract_local(texts[0]) is None
+    assert extractor.extract_local(texts[2])["source"] == "cache"
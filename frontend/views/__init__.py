@@ -0,0 +1,28 @@
+"""
+Dashboard pages.
+
+Each page lives in its own module: a render() function plus data
+preparation functions that only fetch and shape DataFrames / dicts, so
+they can be timed and cached apart from the widgets. app.py imports a page
+module the first time it is opened, so heavy dependencies (plotly, scipy,
+the report extractor, ...) are only loaded for the pages that use them.
+
+(The package is not called pages/ on purpose: Streamlit would turn that
+directory into its own multipage navigation.)
+"""
+from importlib import import_module
+
+# Sidebar label -> module, in navigation order
+PAGES = {
+    "Dashboard": "views.dashboard",
+    "Nurse Reports": "views.nurse_reports",
+    "Inventory": "views.inventory",
+    "Redistribution": "views.redistribution",
+    "Weather": "views.weather",
+    "System Health": "views.system_health",
+}
+
+
+def page_module(page):
+    """The module rendering page, imported on first use"""
+    return import_module(PAGES[page])
@@ -0,0 +1,118 @@
+"""
+Process-wide resources and widgets shared by several pages.
+"""
+import os
+from datetime import date
+
+import streamlit as st
+
+from api_client import api_get_frame
+from inventory_store import InventorySnapshot
+from live import change_listener
+from reference_store import ReferenceReplica
+
+
+@st.cache_resource
+def inventory_snapshot():
+    """Process-wide local copy of fact_inventory (see inventory_store),
+    marked stale by inventory change events"""
+    listener = change_listener()
+    snapshot = InventorySnapshot(live=lambda: listener.connected)
+    listener.subscribe("inventory", snapshot.mark_stale)
+    return snapshot
+
+
+@st.cache_resource
+def reference_replica():
+    """Process-wide facilities/items replica (see reference_store)"""
+    return ReferenceReplica().open()
+
+
+@st.cache_resource(max_entries=2)
+def build_facility_index(facilities):
+    """KD-tree over facility coordinates, rebuilt only when the list changes"""
+    from spatial_index import FacilityIndex
+
+    return FacilityIndex(facilities)
+
+
+def facility_index():
+    """(index, facilities DataFrame), index is None when facilities are unavailable"""
+    facilities = reference_replica().facilities
+    if facilities.empty:
+        return None, facilities
+    return build_facility_index(facilities), facilities
+
+
+@st.cache_data(max_entries=2, show_spinner="Forecasting consumption...")
+def daily_consumption_rates(day):
+    """Consumption rate per facility/item series, computed once per day"""
+    from forecasting import HISTORY_DAYS, consumption_rates
+
+    daily, error = api_get_frame(f"/test/consumption?days={HISTORY_DAYS}", use_cache=False)
+    if error is not None:
+        # Raising keeps the failure out of the cache
+        raise RuntimeError(error)
+
+    pressure, pressure_error = api_get_frame(f"/test/consumption/pressure?days={HISTORY_DAYS}", use_cache=False)
+    return consumption_rates(daily, None if pressure_error else pressure, today=day)
+
+
+def consumption_forecast():
+    """(rates DataFrame, error) for today"""
+    try:
+        return daily_consumption_rates(date.today().isoformat()), None
+    except RuntimeError as e:
+        return None, str(e)
+
+
+def export_panel(dataset):
+    """Prepare-then-download controls for a full backend export of dataset.
+
+    The file is only produced when asked for and read into memory once (the
+    temporary file is removed right away); the bytes are dropped once
+    downloaded, so reruns never regenerate or re-read it.
+    """
+    from exports import (EXPORT_DATASETS, EXPORT_FORMATS, EXPORT_MAX_BYTES, discard_export, export_filename,
+                         export_formats, write_export)
+
+    state_key = f"export_{dataset}"
+    label = EXPORT_DATASETS[dataset]
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        fmt = st.selectbox(f"Export all {label.lower()} as", export_formats(), key=f"{state_key}_format")
+    with col2:
+        st.write("")
+        if st.button("Prepare export", key=f"{state_key}_prepare", use_container_width=True):
+            st.session_state.pop(state_key, None)
+            with st.spinner(f"Exporting {label.lower()}..."):
+                path, error = write_export(dataset, fmt)
+            if error:
+                st.markdown(f'<div class="error-box">Export failed: {error}</div>', unsafe_allow_html=True)
+            elif (size := os.path.getsize(path)) > EXPORT_MAX_BYTES:
+                discard_export(path)
+                st.warning(
+                    f"Export is {size / 1e6:.0f} MB, over the {EXPORT_MAX_BYTES / 1e6:.0f} MB download limit. "
+                    "Try CSV (gzip) or Parquet."
+                )
+            else:
+                with open(path, "rb") as f:
+                    st.session_state[state_key] = (f.read(), fmt)
+                discard_export(path)
+
+    prepared = st.session_state.get(state_key)
+    if prepared:
+        data, prepared_fmt = prepared
+
+        def finish():
+            st.session_state.pop(state_key, None)
+
+        st.download_button(
+            label=f"Download {prepared_fmt} ({len(data) / 1e6:.1f} MB)",
+            data=data,
+            file_name=export_filename(dataset, prepared_fmt),
+            mime=EXPORT_FORMATS[prepared_fmt][1],
+            key=f"{state_key}_download",
+            on_click=finish
+        )
@@ -0,0 +1,110 @@
+"""
+Dashboard page: headline counts and the disease / severity breakdown.
+"""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from api_client import api_get
+from charts import bar_chart, limit_categories, pie_chart, show_chart
+from live import live_updates
+
+# Report window options for the breakdown charts (0 = all time)
+PERIODS = {
+    "All time": 0,
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+}
+
+RECENT_REPORTS = 10
+
+
+def load_dashboard(days=0):
+    """(summary response, {diseases, severities, recent} DataFrames)
+
+    One pre-aggregated request: the backend reads its daily report rollup
+    instead of returning every facility/disease/severity group.
+    """
+    data = api_get(f"/services/dashboard/summary?days={days}&recent={RECENT_REPORTS}")
+
+    frames = {}
+    if data.get("status") == "SUCCESS":
+        frames = {key: pd.DataFrame(data.get(key, [])) for key in ("diseases", "severities", "recent")}
+    return data, frames
+
+
+def render():
+    st.title("Dashboard Overview")
+    live_updates("dashboard", ["reports", "inventory", "pending"])
+    
+    period = st.selectbox("Report period", list(PERIODS))
+    summary_data, frames = load_dashboard(PERIODS[period])
+    
+    if summary_data.get("status") != "SUCCESS":
+        st.error(f"Failed to load dashboard: {summary_data.get('error', 'Unknown error')}")
+        return
+    
+    stats = summary_data.get("statistics", {})
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Facilities", stats.get("TOTAL_FACILITIES", 0))
+    with col2:
+        st.metric("Medical Items", stats.get("TOTAL_ITEMS", 0))
+    with col3:
+        st.metric("Inventory Records", stats.get("TOTAL_INVENTORY", 0))
+    with col4:
+        st.metric("Reports", stats.get("TOTAL_REPORTS", 0))
+    
+    counts = summary_data.get("summary", {})
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Stock Issues", counts.get("stock_issues", 0))
+    with col2:
+        st.metric("Pending Redistributions", counts.get("pending_redistributions", 0))
+    
+    st.markdown("---")
+    
+    df_diseases = frames["diseases"]
+    if not df_diseases.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Disease Distribution")
+            disease_counts = limit_categories(df_diseases, 'DISEASE_DETECTED', 'TOTAL_PATIENTS')
+            fig = pie_chart(
+                disease_counts,
+                values='TOTAL_PATIENTS',
+                names='DISEASE_DETECTED',
+                title='Patients by Disease',
+                theme=st.session_state.theme,
+                colors=px.colors.sequential.Purples
+            )
+            show_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("Severity Levels")
+            severity_counts = limit_categories(frames["severities"], 'SEVERITY_LEVEL', 'REPORT_COUNT')
+            fig = bar_chart(
+                severity_counts,
+                x='SEVERITY_LEVEL',
+                y='REPORT_COUNT',
+                title='Reports by Severity',
+                theme=st.session_state.theme,
+                color='SEVERITY_LEVEL',
+                color_map={
+                    'Low': '#10b981',
+                    'Medium': '#f59e0b',
+                    'High': '#f97316',
+                    'Critical': '#ef4444'
+                }
+            )
+            show_chart(fig, use_container_width=True)
+        
+        st.subheader("Recent Reports")
+        display_cols = ['FACILITY_NAME', 'DISEASE_DETECTED', 'SEVERITY_LEVEL', 
+                       'TOTAL_PATIENTS', 'LAST_REPORT_DATE']
+        st.dataframe(frames["recent"].reindex(columns=display_cols), use_container_width=True)
+    else:
+        st.markdown('<div class="info-box"> No report data available for this period</div>', unsafe_allow_html=True)
@@ -0,0 +1,391 @@
+"""
+Inventory page: current stock, stock transactions, anomalies and the
+stock-out forecast.
+"""
+from urllib.parse import urlencode
+
+import pandas as pd
+import streamlit as st
+
+from api_client import api_get, api_get_frame, api_post, api_prefetch, invalidate_cache
+from charts import bar_chart, limit_categories, pie_chart, show_chart
+from forecasting import HISTORY_DAYS, forecast_stockout
+from jobs import job_progress, job_state, start_job
+from live import live_updates
+from views.common import consumption_forecast, export_panel, inventory_snapshot, reference_replica
+
+INVENTORY_PAGE_SIZE = 50
+
+INVENTORY_SORTS = {
+    "Default": "default",
+    "Highest Stock First": "stock_desc",
+    "Lowest Stock First": "stock_asc",
+}
+
+# Rows shown in the stock-out forecast table
+FORECAST_MAX_ROWS = 500
+
+# Payload key, metric label, table title, notice per anomaly group
+ANOMALY_GROUPS = [
+    ("understocked", "Low Stock", "⚠️ Low Stock Items", st.warning),
+    ("near_expiry", "Expiring Soon", "⏰ Items Expiring Soon", st.warning),
+    ("overstocked", "Overstock", "📦 Overstock Items", st.info),
+]
+
+
+def inventory_page_endpoint(facility, search, sort_label, page):
+    """URL for one page (0-based) of /test/inventory/page"""
+    params = {
+        "sort": INVENTORY_SORTS.get(sort_label, "default"),
+        "page": page,
+        "size": INVENTORY_PAGE_SIZE,
+    }
+    if facility != "All":
+        params["facilityId"] = facility
+    if search and search.strip():
+        params["search"] = search.strip()
+    return f"/test/inventory/page?{urlencode(params)}"
+
+
+def load_inventory(snapshot, facility, search, sort_label, page):
+    """(page response, snapshot error) for one page of Current Stock.
+
+    Prefers the local snapshot and falls back to server-side pages when it
+    can't sync.
+    """
+    snapshot_error = snapshot.sync()
+    if snapshot_error is None:
+        return snapshot.query(
+            None if facility == "All" else facility,
+            search.strip(),
+            INVENTORY_SORTS.get(sort_label, "default"),
+            page,
+            INVENTORY_PAGE_SIZE
+        ), None
+    return api_get(inventory_page_endpoint(facility, search, sort_label, page)), snapshot_error
+
+
+def stockout_risk(inventory_frame, rates, horizon):
+    """(full forecast, rows running out within horizon days)"""
+    forecast = forecast_stockout(inventory_frame, rates)
+    return forecast, forecast[forecast["DAYS_UNTIL_STOCKOUT"] <= horizon]
+
+
+def render():
+    st.title("Inventory Management")
+    
+    # Reruns the page when the backend reports a change; no polling otherwise
+    live_updates("inventory", ["inventory"])
+    
+    # Current Stock only asks the backend for the visible page; the filter
+    # widgets keep their values in session_state, so the page URL is known
+    # before the tabs render and can be fetched together with facilities.
+    filter_facility = st.session_state.get("filter_facility", "All")
+    sort_stock = st.session_state.get("sort_stock", "Default")
+    search_item = st.session_state.get("search_item", "")
+    
+    filters = (filter_facility, sort_stock, search_item)
+    if st.session_state.get("inventory_filters") != filters:
+        st.session_state.inventory_filters = filters
+        st.session_state.inventory_page = 1
+    
+    page_index = st.session_state.get("inventory_page", 1) - 1
+    
+    snapshot = inventory_snapshot()
+    inventory_data, snapshot_error = load_inventory(snapshot, filter_facility, search_item, sort_stock, page_index)
+    
+    replica = reference_replica()
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["Current Stock", "Update Stock", "Anomalies", "Forecast"])
+    
+    with tab1:
+        st.subheader("Current Inventory")
+        
+        if st.button("Refresh Data"):
+            invalidate_cache("/test/inventory")
+            snapshot.mark_stale()
+            st.rerun()
+        
+        if snapshot_error is None:
+            st.caption(f"Local snapshot: {len(snapshot.frame)} rows, synced up to {snapshot.watermark}")
+        
+        if inventory_data.get("status") == "SUCCESS":
+            total_items = inventory_data.get("count", 0)
+            df_page = pd.DataFrame(inventory_data.get("data", []))
+            
+            # Normalize column names (handle both upper and lower case)
+            if not df_page.empty:
+                df_page.columns = df_page.columns.str.upper()
+            
+            # Filter and Sort Section
+            st.markdown("### 🔍 Filter & Sort Options")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                # Filter by Facility
+                facility_ids = [facility_id for facility_id, _ in replica.facility_options()]
+                if filter_facility != "All" and filter_facility not in facility_ids:
+                    facility_ids.append(filter_facility)
+                st.selectbox(
+                    "Filter by Facility",
+                    ["All"] + sorted(facility_ids),
+                    key="filter_facility"
+                )
+            
+            with col2:
+                # Sort by Stock
+                st.selectbox(
+                    "Sort by Stock Level",
+                    list(INVENTORY_SORTS.keys()),
+                    key="sort_stock"
+                )
+            
+            with col3:
+                # Filter by Item Name (search)
+                st.text_input(
+                    "Search Item Name",
+                    placeholder="Type to search...",
+                    key="search_item"
+                )
+            
+            if total_items > 0:
+                total_pages = max(1, -(-total_items // INVENTORY_PAGE_SIZE))
+                
+                # Data shrank underneath the selected page (e.g. after a refresh)
+                if page_index >= total_pages:
+                    st.session_state.inventory_page = total_pages
+                    st.rerun()
+                
+                first_row = page_index * INVENTORY_PAGE_SIZE + 1
+                last_row = page_index * INVENTORY_PAGE_SIZE + len(df_page)
+                
+                page_col1, page_col2 = st.columns([3, 1])
+                with page_col1:
+                    # Display filtered count
+                    st.markdown(f"**Showing {first_row}-{last_row} of {total_items} items**")
+                with page_col2:
+                    st.number_input(
+                        f"Page (of {total_pages})",
+                        min_value=1,
+                        max_value=total_pages,
+                        key="inventory_page"
+                    )
+                
+                # Display the current page only
+                st.dataframe(
+                    df_page,
+                    use_container_width=True,
+                    height=400
+                )
+                
+                # Warm the cache for the page the user is most likely to open next
+                if snapshot_error is not None and page_index + 1 < total_pages:
+                    api_prefetch(inventory_page_endpoint(
+                        filter_facility, search_item, sort_stock, page_index + 1
+                    ))
+                
+                # Visualization section
+                st.markdown("### 📊 Stock Visualization")
+                
+                viz_col1, viz_col2 = st.columns(2)
+                
+                with viz_col1:
+                    # Show top 10 of the current page
+                    chart_data = df_page.head(10)[['ITEM_NAME', 'CURRENT_STOCK']]
+                    
+                    fig = bar_chart(
+                        chart_data,
+                        x='ITEM_NAME',
+                        y='CURRENT_STOCK',
+                        title=f'Stock Levels (Top {len(chart_data)} Items)',
+                        theme=st.session_state.theme,
+                        labels={'CURRENT_STOCK': 'Stock Quantity'},
+                        color='CURRENT_STOCK',
+                        color_scale='Purples',
+                        text='CURRENT_STOCK',
+                        tickangle=-45
+                    )
+                    show_chart(fig, use_container_width=True)
+                
+                with viz_col2:
+                    # Stock distribution by facility (if showing all facilities)
+                    if filter_facility == "All":
+                        facility_stock = pd.DataFrame(inventory_data.get("by_facility", []))
+                        if not facility_stock.empty:
+                            facility_stock.columns = facility_stock.columns.str.upper()
+                            facility_stock = limit_categories(facility_stock, 'FACILITY_ID', 'CURRENT_STOCK')
+                        
+                        fig2 = pie_chart(
+                            facility_stock,
+                            values='CURRENT_STOCK',
+                            names='FACILITY_ID',
+                            title='Stock Distribution by Facility',
+                            theme=st.session_state.theme
+                        )
+                        show_chart(fig2, use_container_width=True)
+                    else:
+                        # Show item distribution for selected facility
+                        fig2 = pie_chart(
+                            df_page.head(10)[['ITEM_NAME', 'CURRENT_STOCK']],
+                            values='CURRENT_STOCK',
+                            names='ITEM_NAME',
+                            title=f'Item Distribution - {filter_facility}',
+                            theme=st.session_state.theme
+                        )
+                        show_chart(fig2, use_container_width=True)
+                
+                # Summary statistics (computed by the backend over the whole filter)
+                summary = inventory_data.get("summary", {})
+                
+                st.markdown("### 📈 Summary Statistics")
+                stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+                
+                with stat_col1:
+                    st.metric("Total Items", total_items)
+                
+                with stat_col2:
+                    st.metric("Total Stock", f"{int(summary.get('TOTAL_STOCK', 0)):,}")
+                
+                with stat_col3:
+                    st.metric("Avg Stock", f"{float(summary.get('AVG_STOCK', 0)):.0f}")
+                
+                with stat_col4:
+                    st.metric("Facilities", summary.get("TOTAL_FACILITIES", 0))
+                
+                st.markdown("### 📥 Export")
+                export_panel("inventory")
+                export_panel("transactions")
+                
+            else:
+                st.markdown('<div class="info-box">No inventory data available</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="error-box">Failed to fetch inventory: {inventory_data.get("error")}</div>', 
+                      unsafe_allow_html=True)
+    
+    with tab2:
+        st.subheader("Update Stock Transaction")
+        
+        facility_options = [label for _, label in replica.facility_options()]
+        item_options = [label for _, label in replica.item_options()]
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if facility_options:
+                selected_facility = st.selectbox(
+                    "Select Facility",
+                    facility_options,
+                    key="inv_facility"
+                )
+                facility_id = selected_facility.split(" - ")[0]
+            else:
+                # Fallback: manual input sampai replica facilities pertama kali tersinkron
+                st.warning(f"⚠️ Facility list not available yet ({replica.error}). Using manual input.")
+                facility_id = st.text_input("Facility ID", key="inv_facility_fallback").strip()
+            
+            if item_options:
+                selected_item = st.selectbox("Select Item", item_options, key="inv_item")
+                item_id = selected_item.split(" - ")[0]
+            else:
+                item_id = st.text_input("Item ID", key="inv_item_fallback").strip()
+        
+        with col2:
+            quantity = st.number_input("Quantity", min_value=1, value=10)
+            tx_type = st.radio("Transaction Type", ["IN", "OUT"], horizontal=True)
+        
+        if st.button("Update Stock", type="primary", use_container_width=True):
+            with st.spinner("Updating stock..."):
+                result = api_post("/services/inventory/update", {
+                    "facilityId": facility_id,
+                    "itemId": item_id,
+                    "quantity": quantity,
+                    "type": tx_type
+                })
+                
+                if result.get("status") == "SUCCESS":
+                    snapshot.mark_stale()
+                    st.markdown(f'<div class="success-box">✓ {result.get("message")}</div>', 
+                              unsafe_allow_html=True)
+                    st.balloons()
+                else:
+                    st.markdown(f'<div class="error-box">✗ {result.get("message", result.get("error"))}</div>', 
+                              unsafe_allow_html=True)
+    
+    with tab3:
+        st.subheader("Stock Anomalies Detection")
+
+        if st.button("Detect Anomalies", type="primary"):
+            start_job("anomalies", "inventory-anomalies")
+        
+        job_progress("anomalies", "Analyzing inventory")
+        anomalies_job = job_state("anomalies")
+        
+        if anomalies_job and anomalies_job["done"]:
+            if anomalies_job.get("error") is None:
+                anomalies = anomalies_job.get("result") or {}
+                counts = anomalies.get('counts', {})
+
+                # Backend sudah mengelompokkan per jenis anomaly
+                for col, (key, label, _, _) in zip(st.columns(len(ANOMALY_GROUPS)), ANOMALY_GROUPS):
+                    with col:
+                        st.metric(label, counts.get(key, len(anomalies.get(key, []))))
+
+                for key, _, title, notice in ANOMALY_GROUPS:
+                    rows = anomalies.get(key, [])
+                    if rows:
+                        notice(title)
+                        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+                # No anomalies
+                if not anomalies.get('total_issues'):
+                    st.markdown('<div class="success-box">✓ No anomalies detected! All stock levels are healthy.</div>', 
+                              unsafe_allow_html=True)
+            else:
+                st.markdown(f'<div class="error-box">❌ Failed: {anomalies_job.get("error")}</div>', 
+                          unsafe_allow_html=True)
+    
+    with tab4:
+        st.subheader("Stock-out Forecast")
+        
+        st.markdown(f"""
+        <div class="info-box">
+        Daily consumption is smoothed from the last {HISTORY_DAYS} days of stock OUT 
+        transactions and raised for facilities whose nurse reports show a recent surge 
+        in patients. Rates are recomputed once a day.
+        </div>
+        """, unsafe_allow_html=True)
+        
+        rates, forecast_error = consumption_forecast()
+        inventory_frame = snapshot.frame if snapshot_error is None else api_get_frame("/test/inventory")[0]
+        
+        if forecast_error is not None:
+            st.markdown(f'<div class="error-box">❌ Failed: {forecast_error}</div>', 
+                      unsafe_allow_html=True)
+        elif inventory_frame is None or inventory_frame.empty:
+            st.info("No inventory data available")
+        else:
+            horizon = st.slider("Horizon (days)", min_value=7, max_value=90, value=30, step=7)
+            
+            forecast, at_risk = stockout_risk(inventory_frame, rates, horizon)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Stock-outs Within Horizon", len(at_risk))
+            with col2:
+                st.metric("Within 7 Days", int((at_risk["RISK"] == "CRITICAL").sum()))
+            with col3:
+                st.metric("Series With Usage", int((forecast["DAILY_RATE"] > 0).sum()))
+            
+            if at_risk.empty:
+                st.markdown(f'<div class="success-box">✓ No stock-outs expected in the next {horizon} days.</div>', 
+                          unsafe_allow_html=True)
+            else:
+                st.dataframe(
+                    at_risk[["FACILITY_NAME", "ITEM_NAME", "CURRENT_STOCK", "DAILY_RATE",
+                             "DAYS_UNTIL_STOCKOUT", "STOCKOUT_DATE", "RISK"]]
+                    .head(FORECAST_MAX_ROWS).round(1),
+                    use_container_width=True
+                )
+                if len(at_risk) > FORECAST_MAX_ROWS:
+                    st.caption(f"Showing the {FORECAST_MAX_ROWS} soonest of {len(at_risk)} stock-outs")
@@ -0,0 +1,267 @@
+"""
+Nurse report page: single submissions, bulk upload and the report list.
+"""
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from api_client import api_get_frame, api_post
+from jobs import clear_job, job_progress, job_state, start_job
+from report_extraction import ReportExtractor, extract_rules, stub_llm
+from views.common import export_panel, reference_replica
+
+# Reports per POST to /services/reports/process-batch (one progress step each)
+REPORT_UPLOAD_CHUNK = 50
+
+REPORT_UPLOAD_COLUMNS = {"facilityid": "facilityId", "text": "text", "rawtext": "text"}
+
+
+@st.cache_resource
+def report_extractor():
+    """Process-wide extraction cache. Gemini runs as a backend job for
+    reports the local rules can't handle; ECOPATH_LLM=stub stays offline."""
+    return ReportExtractor(stub_llm if os.environ.get("ECOPATH_LLM") == "stub" else None)
+
+
+def ingest_report(facility_id, text, extraction):
+    """Save a locally extracted report and show the outcome"""
+    result = api_post("/services/reports/ingest", {
+        "facilityId": facility_id,
+        "text": text,
+        "disease": extraction["disease"],
+        "severity": extraction["severity"],
+        "patientCount": extraction["patient_count"]
+    })
+    
+    if result.get("status") == "SUCCESS":
+        st.markdown(f'<div class="success-box">✓ {result.get("message")}</div>', 
+                  unsafe_allow_html=True)
+        st.caption(f"Extracted by: {extraction['source']} (confidence {extraction['confidence']:.2f})")
+    else:
+        st.markdown(f'<div class="error-box">✗ Error: {result.get("message", result.get("error"))}</div>', 
+                  unsafe_allow_html=True)
+
+
+def read_report_upload(uploaded):
+    """([{facilityId, text}, ...], error) from an uploaded CSV or JSONL file"""
+    try:
+        if uploaded.name.lower().endswith((".jsonl", ".ndjson")):
+            df = pd.read_json(uploaded, lines=True, dtype=False)
+        else:
+            df = pd.read_csv(uploaded, dtype=str)
+    except Exception as e:
+        return [], f"Could not read file: {e}"
+    
+    # facility_id / facilityId / FACILITY_ID all map to the same field
+    df = df.rename(columns=lambda c: REPORT_UPLOAD_COLUMNS.get(str(c).strip().lower().replace("_", ""), c))
+    missing = {"facilityId", "text"} - set(df.columns)
+    if missing:
+        return [], f"Missing column(s): {', '.join(sorted(missing))}"
+    
+    df = df.dropna(subset=["facilityId", "text"])
+    df = df[df["text"].astype(str).str.strip() != ""]
+    return [
+        {"facilityId": str(facility_id).strip(), "text": str(text)}
+        for facility_id, text in zip(df["facilityId"], df["text"])
+    ], None
+
+
+def load_reports():
+    """(reports DataFrame, error) for the report list"""
+    return api_get_frame("/test/reports")
+
+
+def filter_reports(df_reports, diseases, severities):
+    """Reports whose disease and severity are both selected"""
+    return df_reports[
+        (df_reports['DISEASE_DETECTED'].isin(diseases)) &
+        (df_reports['SEVERITY_LEVEL'].isin(severities))
+    ]
+
+
+def render():
+    st.title("Nurse Report Processing")
+    
+    reports_frame = load_reports()
+    
+    tab1, tab2, tab3 = st.tabs(["Submit Report", "Bulk Upload", "View Reports"])
+    
+    with tab1:
+        st.subheader("Submit New Report")
+        
+        facility_options = [label for _, label in reference_replica().facility_options()]
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            if facility_options:
+                selected_facility = st.selectbox("Select Facility", facility_options)
+                facility_id = selected_facility.split(" - ")[0]
+            else:
+                facility_id = st.text_input("Facility ID", placeholder="Facility list not loaded yet")
+        
+        with col2:
+            report_text = st.text_area(
+                "Report Details",
+                placeholder="e.g., 15 patients with severe dengue fever symptoms today",
+                height=150
+            )
+        
+        if st.button("Processing", type="primary"):
+            if report_text.strip():
+                # Cache and local rules first; Gemini (as a job) only for unclear reports
+                extractor = report_extractor()
+                extraction = extractor.extract_local(report_text) if extractor.llm is None else extractor.extract(report_text)
+                
+                if extraction is not None:
+                    with st.spinner("Processing report..."):
+                        ingest_report(facility_id, report_text, extraction)
+                else:
+                    payload = {"facilityId": facility_id, "text": report_text}
+                    submitted = start_job("report", "report-process", payload)
+                    
+                    if submitted.get("status") == "SUCCESS":
+                        st.session_state.report_job_payload = payload
+                    else:
+                        st.markdown(f'<div class="error-box">✗ Error: {submitted.get("message", submitted.get("error"))}</div>', 
+                                  unsafe_allow_html=True)
+            else:
+                st.warning("Please enter report text")
+        
+        job_progress("report", "Processing report with Gemini AI",
+                     invalidates=["/test/reports", "/services/dashboard"])
+        report_job = job_state("report")
+        
+        if report_job and report_job["done"]:
+            payload = st.session_state.pop("report_job_payload", {})
+            clear_job("report")
+            result = report_job.get("result") or {}
+            
+            if report_job.get("error") is None:
+                report_extractor().remember(payload.get("text", ""), result.get("extraction", {}))
+                st.markdown(f'<div class="success-box">✓ {result.get("message")}</div>', 
+                          unsafe_allow_html=True)
+                st.caption("Extracted by: llm")
+            elif payload:
+                # Gemini unavailable: keep ingesting with the local rules
+                st.warning(f"Gemini unavailable ({report_job['error']}), using local extraction")
+                ingest_report(payload["facilityId"], payload["text"],
+                              dict(extract_rules(payload["text"]), source="rules-fallback"))
+    
+    with tab2:
+        st.subheader("Bulk Upload")
+        
+        st.markdown("""
+        <div class="info-box">
+        Upload a CSV or JSONL file with one report per row and the columns 
+        <b>facility_id</b> and <b>text</b>. Reports are extracted in batches and 
+        merged into the existing daily totals.
+        </div>
+        """, unsafe_allow_html=True)
+        
+        uploaded = st.file_uploader("Reports file", type=["csv", "jsonl", "ndjson"], key="report_upload")
+        
+        if uploaded is not None:
+            reports, upload_error = read_report_upload(uploaded)
+            
+            if upload_error:
+                st.markdown(f'<div class="error-box">✗ {upload_error}</div>', unsafe_allow_html=True)
+            elif not reports:
+                st.warning("The file contains no reports")
+            else:
+                st.write(f"**{len(reports)}** reports ready to process")
+                st.dataframe(pd.DataFrame(reports).head(10), use_container_width=True)
+                
+                if st.button("Process All Reports", type="primary"):
+                    # Confident local extractions travel with the report, so the
+                    # backend only sends the rest to Gemini
+                    extractor = report_extractor()
+                    for report in reports:
+                        local = extractor.extract_local(report["text"])
+                        if local is not None:
+                            report.update(
+                                disease=local["disease"],
+                                severity=local["severity"],
+                                patientCount=local["patient_count"]
+                            )
+                    
+                    chunks = [reports[i:i + REPORT_UPLOAD_CHUNK] for i in range(0, len(reports), REPORT_UPLOAD_CHUNK)]
+                    progress = st.progress(0.0, text=f"Processing chunk 1 of {len(chunks)}...")
+                    processed, failed, errors = 0, 0, []
+                    
+                    for n, chunk in enumerate(chunks, 1):
+                        result = api_post("/services/reports/process-batch", {"reports": chunk})
+                        
+                        if result.get("status") == "SUCCESS":
+                            processed += result.get("processed", 0)
+                            failed += result.get("failed", 0)
+                            errors.extend(f"Chunk {n}: {e}" for e in result.get("errors", []))
+                        else:
+                            failed += len(chunk)
+                            errors.append(f"Chunk {n}: {result.get('message', result.get('error'))}")
+                        
+                        progress.progress(n / len(chunks), text=f"Processed chunk {n} of {len(chunks)}")
+                    
+                    if processed:
+                        st.markdown(f'<div class="success-box">✓ {processed} reports processed, {failed} failed</div>', 
+                                  unsafe_allow_html=True)
+                    else:
+                        st.markdown(f'<div class="error-box">✗ No reports processed ({failed} failed)</div>', 
+                                  unsafe_allow_html=True)
+                    
+                    if errors:
+                        with st.expander(f"Errors ({len(errors)})"):
+                            for error in errors:
+                                st.write(error)
+    
+    with tab3:
+        st.subheader("All Reports")
+        
+        df_reports, reports_error = reports_frame
+        
+        if reports_error is None:
+            
+            if not df_reports.empty:
+                col1, col2 = st.columns(2)
+                with col1:
+                    diseases = df_reports['DISEASE_DETECTED'].dropna().unique().tolist()
+                    selected_disease = st.multiselect(
+                        "Filter by Disease",
+                        options=diseases,
+                        default=diseases
+                    )
+                
+                with col2:
+                    severities = df_reports['SEVERITY_LEVEL'].dropna().unique().tolist()
+                    selected_severity = st.multiselect(
+                        "Filter by Severity",
+                        options=severities,
+                        default=severities
+                    )
+                
+                filtered_df = filter_reports(df_reports, selected_disease, selected_severity)
+                
+                st.dataframe(filtered_df, use_container_width=True)
+                
+                # Serialised only when asked for, not on every rerun
+                if st.button("Prepare filtered CSV", key="reports_filtered_prepare"):
+                    st.session_state.reports_filtered_csv = filtered_df.to_csv(index=False)
+                
+                if "reports_filtered_csv" in st.session_state:
+                    st.download_button(
+                        label="Download filtered CSV",
+                        data=st.session_state.reports_filtered_csv,
+                        file_name=f"reports_filtered_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv",
+                        on_click=lambda: st.session_state.pop("reports_filtered_csv", None)
+                    )
+                
+                st.markdown("#### Export all reports")
+                export_panel("reports")
+            else:
+                st.markdown('<div class="info-box">No reports available</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="error-box">Failed to fetch reports: {reports_error}</div>', 
+                      unsafe_allow_html=True)
@@ -0,0 +1,383 @@
+"""
+Redistribution page: generate, review and audit stock transfers between
+facilities.
+"""
+from urllib.parse import urlencode
+
+import pandas as pd
+import streamlit as st
+
+from api_client import api_get, api_get_frame, api_post, api_prefetch, invalidate_cache
+from forecasting import coverage_demand
+from jobs import clear_job, job_progress, job_state, start_job
+from live import live_updates
+from redistribution_engine import match_candidates, recommendations_payload, solve_transport
+from views.common import consumption_forecast, export_panel, facility_index, inventory_snapshot
+
+PENDING_PAGE_SIZES = [10, 25, 50]
+
+# ✅ FIX: Ganti column mapping sesuai backend response
+APPROVED_COLUMNS = {
+    'RECOMMENDATION_ID': 'ID',
+    'SOURCE_FACILITY': 'From Facility',           # Backend return SOURCE_FACILITY
+    'DESTINATION_FACILITY': 'To Facility',        # Backend return DESTINATION_FACILITY
+    'ITEM_NAME': 'Item',
+    'RECOMMENDED_QUANTITY': 'Quantity',           # ✅ GANTI INI
+    'PRIORITY_SCORE': 'Priority',
+    'REASON': 'Reason',                           # ✅ TAMBAH INI
+    'APPROVED_BY': 'Approved By',
+    'APPROVED_AT': 'Approved Date',
+    'STATUS': 'Status'
+}
+
+
+def pending_page_endpoint(min_priority, page_size, offset):
+    """URL for one page of /services/redistribution/pending"""
+    params = {"minPriority": min_priority, "limit": page_size, "offset": offset}
+    return f"/services/redistribution/pending?{urlencode(params)}"
+
+
+def match_local(candidates, optimal, allowed_pairs=None, demand=None):
+    """Recommendations DataFrame for a /candidates response"""
+    match = solve_transport if optimal else match_candidates
+    return match(
+        pd.DataFrame(candidates.get("overstocked", [])),
+        pd.DataFrame(candidates.get("understocked", [])),
+        allowed_pairs,
+        demand
+    )
+
+
+def approved_display(df_approved):
+    """Approved history with readable column names"""
+    display_cols = [col for col in APPROVED_COLUMNS if col in df_approved.columns]
+    return df_approved[display_cols].rename(columns=APPROVED_COLUMNS)
+
+
+@st.fragment
+def pending_review():
+    """Pending tab. Only the visible page is fetched (filtered and paged
+    server side) and rendered; paging and selecting rerun just this part."""
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        min_priority = st.slider("Minimum priority", 0, 100, 0, step=5, key="pending_min_priority")
+    with col2:
+        page_size = st.selectbox("Per page", PENDING_PAGE_SIZES, key="pending_page_size")
+    with col3:
+        st.write("")
+        if st.button("Refresh", use_container_width=True):
+            invalidate_cache("/services/redistribution/pending")
+    
+    filters = (min_priority, page_size)
+    if st.session_state.get("pending_filters") != filters:
+        st.session_state.pending_filters = filters
+        st.session_state.pending_page = 1
+    
+    offset = (st.session_state.get("pending_page", 1) - 1) * page_size
+    pending_data = api_get(pending_page_endpoint(min_priority, page_size, offset))
+    
+    if pending_data.get("status") != "SUCCESS":
+        st.markdown(f'<div class="error-box">❌ Failed to fetch: {pending_data.get("error")}</div>', 
+                  unsafe_allow_html=True)
+        return
+    
+    total = pending_data.get("total", 0)
+    recommendations = pending_data.get("recommendations", [])
+    
+    if total == 0:
+        st.markdown('<div class="info-box">📋 No pending recommendations. Generate new ones in the "Generate" tab.</div>', 
+                  unsafe_allow_html=True)
+        return
+    
+    total_pages = max(1, -(-total // page_size))
+    
+    # List shrank underneath the selected page (e.g. after approvals): clamp and
+    # fetch the last page in place, this may be a full-app run so no fragment rerun
+    if not recommendations and st.session_state.get("pending_page", 1) > total_pages:
+        st.session_state.pending_page = total_pages
+        offset = (total_pages - 1) * page_size
+        pending_data = api_get(pending_page_endpoint(min_priority, page_size, offset))
+        total = pending_data.get("total", total)
+        recommendations = pending_data.get("recommendations", [])
+        total_pages = max(1, -(-total // page_size))
+
+    if not recommendations:
+        st.markdown('<div class="info-box">📋 No pending recommendations. Generate new ones in the "Generate" tab.</div>',
+                  unsafe_allow_html=True)
+        return
+
+    page_col1, page_col2 = st.columns([3, 1])
+    with page_col1:
+        st.metric("Pending Recommendations", total)
+        st.markdown(f"**Showing {offset + 1}-{offset + len(recommendations)} of {total}**")
+    with page_col2:
+        st.number_input(
+            f"Page (of {total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            key="pending_page"
+        )
+    
+    if offset + page_size < total:
+        api_prefetch(pending_page_endpoint(min_priority, page_size, offset + page_size))
+    
+    # Approve many at once: one request, one transaction on the backend
+    df_pending = pd.DataFrame(recommendations)
+    df_select = pd.DataFrame({
+        "Approve": False,
+        "ID": df_pending.get("RECOMMENDATION_ID"),
+        "Item": df_pending.get("ITEM_NAME"),
+        "From": df_pending.get("FROM_FACILITY_NAME"),
+        "To": df_pending.get("TO_FACILITY_NAME"),
+        "Quantity": df_pending.get("RECOMMENDED_QUANTITY"),
+        "Priority": df_pending.get("PRIORITY_SCORE"),
+    })
+
+    select_all = st.checkbox("Select all", key="pending_select_all")
+    if select_all:
+        df_select["Approve"] = True
+
+    edited = st.data_editor(
+        df_select,
+        key=f"pending_selection_{offset}_{select_all}",
+        hide_index=True,
+        use_container_width=True,
+        disabled=[c for c in df_select.columns if c != "Approve"]
+    )
+    selected_ids = edited.loc[edited["Approve"], "ID"].tolist()
+
+    col_name, col_button = st.columns([2, 1])
+    with col_name:
+        bulk_approver = st.text_input("Approved by:", key="bulk_approver", placeholder="Your name")
+    with col_button:
+        st.write("")
+        bulk_approve = st.button(
+            f"Approve selected ({len(selected_ids)})",
+            type="primary",
+            disabled=not selected_ids,
+            use_container_width=True
+        )
+
+    if bulk_approve:
+        if bulk_approver.strip():
+            with st.spinner("Processing approvals..."):
+                approve_result = api_post("/services/redistribution/approve-batch", {
+                    "recommendationIds": selected_ids,
+                    "approvedBy": bulk_approver
+                })
+
+            if approve_result.get("status") == "SUCCESS":
+                inventory_snapshot().mark_stale()
+                skipped = approve_result.get("skipped_ids", [])
+                if skipped:
+                    st.warning(f"Skipped {len(skipped)} recommendation(s) that were no longer pending")
+                st.success(approve_result.get("message"))
+                st.rerun(scope="app")
+            else:
+                st.error(f"{approve_result.get('message', approve_result.get('error'))}")
+        else:
+            st.warning("Please enter approver name")
+
+    st.divider()
+
+    for rec in recommendations:
+        with st.expander(f"{rec.get('ITEM_NAME', 'Unknown')} - {rec.get('FROM_FACILITY_NAME', 'N/A')} → {rec.get('TO_FACILITY_NAME', 'N/A')}"):
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.write("**From:**")
+                st.write(f"{rec.get('FROM_FACILITY_NAME', 'N/A')}")
+                st.write(f"Current: {rec.get('FROM_CURRENT_STOCK', 0)}")
+                st.write(f"After: {rec.get('FROM_AFTER_STOCK', 0)}")
+
+            with col2:
+                st.write("**To:**")
+                st.write(f"{rec.get('TO_FACILITY_NAME', 'N/A')}")
+                st.write(f"Current: {rec.get('TO_CURRENT_STOCK', 0)}")
+                st.write(f"After: {rec.get('TO_AFTER_STOCK', 0)}")
+
+            with col3:
+                st.write("**Details:**")
+                st.write(f"Quantity: {rec.get('RECOMMENDED_QUANTITY', 0)}")  # ✅ GANTI INI
+                st.write(f"Priority: {rec.get('PRIORITY_SCORE', 'N/A')}")    # ✅ GANTI INI
+                st.write(f"Reason: {rec.get('REASON', 'N/A')[:50]}...")      # ✅ GANTI INI
+
+            st.divider()
+
+            col_approve, col_reject = st.columns([1, 1])
+
+            with col_approve:
+                approver_name = st.text_input(
+                    "Approved by:",
+                    key=f"approver_{rec.get('RECOMMENDATION_ID')}",
+                    placeholder="Your name"
+                )
+
+                if st.button(
+                    "Approve",
+                    key=f"approve_{rec.get('RECOMMENDATION_ID')}",
+                    type="primary",
+                    use_container_width=True
+                ):
+                    if approver_name.strip():
+                        with st.spinner("Processing approval..."):
+                            approve_result = api_post("/services/redistribution/approve", {
+                                "recommendationId": rec.get('RECOMMENDATION_ID'),
+                                "approvedBy": approver_name
+                            })
+
+                            if approve_result.get("status") == "SUCCESS":
+                                inventory_snapshot().mark_stale()
+                                st.success(f"{approve_result.get('message')}")
+                                st.rerun(scope="app")
+                            else:
+                                st.error(f"{approve_result.get('message', approve_result.get('error'))}")
+                    else:
+                        st.warning("Please enter approver name")
+
+
+def render():
+    st.title("Stock Redistribution Management")
+    
+    # Reruns the page when the backend reports a change; no polling otherwise
+    live_updates("redistribution", ["pending", "approved"])
+    
+    # Pending fetches only its visible page, see pending_review
+    approved_frame = api_get_frame("/services/redistribution/approved")
+
+    tab1, tab2, tab3 = st.tabs(["Generate", "Pending", "Approved"])
+    
+    with tab1:
+        st.subheader("Generate Redistribution Recommendations")
+        
+        st.markdown("""
+        <div class="info-box">
+        This feature analyzes inventory levels across all facilities and generates 
+        smart redistribution recommendations to balance stock levels.
+        </div>
+        """, unsafe_allow_html=True)
+        
+        engine = st.radio(
+            "Matching engine",
+            ["Vectorised (local)", "Optimal transport (local)", "Server (legacy)"],
+            horizontal=True,
+            key="redistribution_engine",
+            help="Optimal transport never sends more than a facility's surplus and "
+                 "minimises total distance; the other engines score every pair separately."
+        )
+        
+        max_distance = st.number_input(
+            "Max transfer distance (km)",
+            min_value=0,
+            value=0,
+            step=10,
+            disabled=engine == "Server (legacy)",
+            help="Facility pairs further apart than this are never considered. 0 = no limit."
+        )
+        
+        cover_days = st.number_input(
+            "Reserve forecast demand (days)",
+            min_value=0,
+            value=0,
+            step=7,
+            disabled=engine == "Server (legacy)",
+            help="Senders keep, and receivers are topped up to, the stock they are forecast "
+                 "to consume in this many days. 0 = thresholds only."
+        )
+        
+        # (result, created, df_recs) to show, from a local run or a finished job
+        generate_result = None
+        
+        if st.button("Generate Recommendations", type="primary", use_container_width=True):
+            if engine == "Server (legacy)":
+                submitted = start_job("generate", "redistribution-generate")
+                if submitted.get("status") != "SUCCESS":
+                    generate_result = (submitted, 0, pd.DataFrame())
+            else:
+                clear_job("generate")
+                with st.spinner("Analyzing inventory and generating recommendations..."):
+                    # Match locally, then save everything with one bulk insert
+                    result = api_get("/services/redistribution/candidates", use_cache=False)
+                    created = 0
+                    df_recs = pd.DataFrame()
+                    
+                    if result.get("status") == "SUCCESS":
+                        allowed_pairs = None
+                        if max_distance > 0:
+                            index, _ = facility_index()
+                            if index is not None:
+                                allowed_pairs = index.pairs_within(max_distance)
+                        
+                        demand = None
+                        if cover_days > 0:
+                            rates, forecast_error = consumption_forecast()
+                            if rates is not None:
+                                demand = coverage_demand(rates, cover_days)
+                            else:
+                                st.warning(f"Forecast unavailable ({forecast_error}), using thresholds only")
+                        
+                        df_recs = match_local(result, engine == "Optimal transport (local)", allowed_pairs, demand)
+                        if not df_recs.empty:
+                            result = api_post("/services/redistribution/bulk", {
+                                "recommendations": recommendations_payload(df_recs)
+                            })
+                            created = result.get("recommendations_created", 0)
+                    
+                    generate_result = (result, created, df_recs)
+        
+        job_progress("generate", "Generating recommendations", invalidates=["/services/redistribution/pending"])
+        generate_job = job_state("generate")
+        
+        if generate_job and generate_job["done"]:
+            data = generate_job.get("result") or {}
+            generate_result = (
+                {"status": "FAILED", "error": generate_job["error"]} if generate_job.get("error") else {"status": "SUCCESS"},
+                data.get("recommendations_generated", 0),
+                pd.DataFrame(data.get("recommendations", []))
+            )
+        
+        if generate_result is not None:
+            result, created, df_recs = generate_result
+            
+            if result.get("status") == "SUCCESS":
+                st.markdown(f'<div class="success-box">✓ Generated {created} recommendations!</div>', 
+                          unsafe_allow_html=True)
+                
+                if not df_recs.empty:
+                    st.dataframe(df_recs, use_container_width=True)
+                    st.success("Recommendations are now in 'Pending' tab for review.")
+            else:
+                st.markdown(f'<div class="error-box">❌ Error: {result.get("error", result.get("message", "Unknown error"))}</div>', 
+                          unsafe_allow_html=True)
+    
+    with tab2:
+        st.subheader("Pending Redistribution Recommendations")
+        pending_review()
+    
+    with tab3:
+        st.subheader("Approved Redistributions History")
+
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            if st.button("Refresh History", use_container_width=True):
+                invalidate_cache("/services/redistribution/approved")
+                st.rerun()
+
+        df_approved, approved_error = approved_frame
+
+        if approved_error is None:
+            if not df_approved.empty:
+                st.metric("Total Approved", len(df_approved))
+
+                df_display = approved_display(df_approved)
+
+                st.dataframe(df_display, use_container_width=True)
+
+                export_panel("redistributions")
+
+            else:
+                st.markdown('<div class="info-box">📋 No approved redistributions yet.</div>', 
+                          unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="error-box">❌ Failed to fetch: {approved_error}</div>', 
+                      unsafe_allow_html=True)
@@ -0,0 +1,89 @@
+"""
+System health page: backend / Snowflake status and the frontend timing panel.
+"""
+from datetime import datetime
+
+import streamlit as st
+
+from api_client import api_get_many
+from metrics import WINDOW_SECONDS, registry as metrics
+
+
+def load_health():
+    """(backend health, Snowflake check) responses"""
+    responses = api_get_many(["/test/health", "/test/snowflake"])
+    return responses["/test/health"], responses["/test/snowflake"]
+
+
+def render():
+    st.title("System Health Check")
+    
+    health_data, snowflake_data = load_health()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Backend Health")
+        
+        if health_data.get("status") == "UP":
+            st.markdown('<div class="success-box">✓ Backend is running</div>', 
+                      unsafe_allow_html=True)
+            st.json(health_data)
+        else:
+            st.markdown('<div class="error-box">✗ Backend is down</div>', 
+                      unsafe_allow_html=True)
+    
+    with col2:
+        st.subheader("Snowflake Connection")
+        
+        if snowflake_data.get("status") == "SUCCESS":
+            st.markdown('<div class="success-box">✓ Snowflake connected</div>', 
+                      unsafe_allow_html=True)
+            st.json(snowflake_data)
+        else:
+            st.markdown('<div class="error-box">✗ Snowflake connection failed</div>', 
+                      unsafe_allow_html=True)
+    
+    st.subheader("Frontend Performance")
+    st.caption(
+        f"Rolling {WINDOW_SECONDS // 60} minute window for this Streamlit process. "
+        "get/post = HTTP round trip, json/arrow = decoding, frame = DataFrame build, "
+        "figure/chart = Plotly build/render, page = whole page run."
+    )
+    
+    perf = metrics.summary()
+    
+    if not perf.empty:
+        kinds = sorted(perf["KIND"].unique())
+        selected_kinds = st.multiselect("Series", options=kinds, default=kinds)
+        perf = perf[perf["KIND"].isin(selected_kinds)]
+        
+        st.dataframe(
+            perf,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "P50_MS": st.column_config.NumberColumn("p50 (ms)", format="%.1f"),
+                "P95_MS": st.column_config.NumberColumn("p95 (ms)", format="%.1f"),
+                "P99_MS": st.column_config.NumberColumn("p99 (ms)", format="%.1f"),
+                "MAX_MS": st.column_config.NumberColumn("max (ms)", format="%.1f"),
+                "AVG_KB": st.column_config.NumberColumn("avg payload (KB)", format="%.1f"),
+                "CACHE_HIT_RATE": st.column_config.ProgressColumn("cache hit rate", min_value=0.0, max_value=1.0),
+            }
+        )
+    else:
+        st.markdown('<div class="info-box">No measurements yet in this window</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Download Prometheus metrics",
+            data=metrics.prometheus(),
+            file_name=f"ecopath_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prom",
+            mime="text/plain",
+            use_container_width=True
+        )
+    with col2:
+        if st.button("Reset measurements", use_container_width=True):
+            metrics.reset()
+            st.rerun()
@@ -0,0 +1,76 @@
+"""Light / dark theme CSS, injected at the top of every run."""
+import streamlit as st
+
+DARK_CSS = """
+    <style>
+    .stApp {
+        background: linear-gradient(135deg, #0b0207 0%, #2a0d18 100%);
+        color: #fdf2f8;
+    }
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #1a050d 0%, #3b0f1e 100%);
+    }
+    h1, h2, h3, h4, h5, h6, p, span, label {
+        color: #fdf2f8 !important;
+    }
+    .success-box {
+        background-color: #0f2f24;
+        border-left: 4px solid #34d399;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin: 1rem 0;
+        color: #d1fae5;
+    }
+    .error-box {
+        background-color: #3a0a12;
+        border-left: 4px solid #fb7185;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin: 1rem 0;
+        color: #ffe4e6;
+    }
+    .info-box {
+        background-color: #1f0a14;
+        border-left: 4px solid #f472b6;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin: 1rem 0;
+        color: #fce7f3;
+    }
+    .warning-box {
+        background-color: #2d1f0a;
+        border-left: 4px solid #fb923c;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin: 1rem 0;
+        color: #fed7aa;
+    }
+    </style>
+"""
+
+LIGHT_CSS = """
+    <style>
+    .stApp {
+        background: linear-gradient(135deg, #fff1f2 0%, #ffe4e6 100%);
+        color: #111827;
+    }
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #ffffff 0%, #ffe4e6 100%);
+    }
+    h1, h2, h3, h4, h5, h6, p, span, label {
+        color: #111827 !important;
+    }
+    .stButton > button {
+        background: linear-gradient(135deg, #f472b6 0%, #fb7185 100%);
+        color: white;
+        border-radius: 10px;
+    }
+    .stButton > button:hover {
+        background: linear-gradient(135deg, #ec4899 0%, #f43f5e 100%);
+    }
+    </style>
+"""
+
+
+def apply_theme(theme):
+    st.markdown(DARK_CSS if theme == 'dark' else LIGHT_CSS, unsafe_allow_html=True)
@@ -0,0 +1,152 @@
+"""
+Weather page: stored weather records and fetching new readings.
+"""
+import pandas as pd
+import streamlit as st
+
+from api_client import api_get_frame, api_post
+from charts import bar_chart, latest_per_group, limit_categories, show_chart
+from jobs import job_progress, job_state, start_job
+from views.common import facility_index, reference_replica
+
+NEARBY_FACILITIES = 5
+
+
+def current_temperatures(df_weather):
+    """Latest average temperature per facility, for the bar chart"""
+    df_weather = df_weather.assign(DATE=pd.to_datetime(df_weather['DATE'], errors='coerce'))
+
+    # Satu bar per facility: ambil data terbaru, bukan semua row
+    current = latest_per_group(df_weather, 'FACILITY_NAME', 'DATE')
+    return limit_categories(current, 'FACILITY_NAME', 'TEMPERATURE_AVG', how='mean')
+
+
+def render():
+    st.title("Weather Data")
+    
+    tab1, tab2, tab3 = st.tabs(["Current Data", "Fetch Single", "Fetch All"])
+    
+    with tab1:
+        st.subheader("Current Weather Records")
+        
+        df_weather, weather_error = api_get_frame("/test/weather")
+        
+        if weather_error is None:
+            
+            if not df_weather.empty:
+                st.dataframe(df_weather, use_container_width=True)
+                
+                current = current_temperatures(df_weather)
+
+                fig = bar_chart(
+                    current,
+                    x='FACILITY_NAME',
+                    y='TEMPERATURE_AVG',
+                    title='Current Average Temperature per Facility',
+                    theme=st.session_state.theme,
+                    labels={'TEMPERATURE_AVG': 'Temperature (°C)'},
+                    color='TEMPERATURE_AVG',
+                    color_scale='RdYlBu_r',
+                    tickangle=-30
+                )
+
+                show_chart(
+                    fig,
+                    use_container_width=True,
+                    key="weather_temperature_chart"
+                )
+            else:
+                st.markdown('<div class="info-box">No weather data available</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="error-box">Failed to fetch weather: {weather_error}</div>', 
+                      unsafe_allow_html=True)
+    
+    with tab2:
+        st.subheader("Fetch Weather for Single Facility")
+        
+        index, facilities = facility_index()
+        
+        col1, col2 = st.columns(2)
+        
+        if index is not None:
+            names = dict(zip(facilities["FACILITY_ID"], facilities["FACILITY_NAME"]))
+            
+            with col1:
+                facility_id = st.selectbox(
+                    "Facility",
+                    list(index.ids),
+                    format_func=lambda f: f"{f} - {names.get(f, '')}",
+                    key="weather_facility"
+                )
+            
+            # Coordinates come from dim_health_facilities; keyed per facility
+            # so switching facility refills them
+            default_lat, default_lon = index.location(facility_id)
+            
+            with col2:
+                lat = st.number_input("Latitude", value=default_lat, format="%.6f",
+                                      key=f"weather_lat_{facility_id}")
+                lon = st.number_input("Longitude", value=default_lon, format="%.6f",
+                                      key=f"weather_lon_{facility_id}")
+            
+            with st.expander("Nearest facilities"):
+                nearby = index.nearest(lat, lon, k=NEARBY_FACILITIES + 1)
+                nearby = nearby[nearby["FACILITY_ID"] != facility_id].head(NEARBY_FACILITIES)
+                st.dataframe(
+                    nearby[["FACILITY_ID", "FACILITY_NAME", "DISTANCE_KM"]].round({"DISTANCE_KM": 1}),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        else:
+            st.warning(f"⚠️ Facility list not available yet ({reference_replica().error}). Using manual input.")
+            with col1:
+                facility_id = st.text_input("Facility ID", key="weather_facility_manual").strip()
+                lat = st.number_input("Latitude", value=-7.1234, format="%.6f")
+            
+            with col2:
+                lon = st.number_input("Longitude", value=107.5678, format="%.6f")
+        
+        if st.button("Fetch Weather", type="primary"):
+            with st.spinner("Fetching weather data..."):
+                result = api_post("/services/weather/fetch", {
+                    "facilityId": facility_id,
+                    "lat": lat,
+                    "lon": lon
+                })
+                
+                if result.get("status") == "SUCCESS":
+                    st.markdown(f'<div class="success-box">✓ {result.get("message")}</div>', 
+                              unsafe_allow_html=True)
+                else:
+                    st.markdown(f'<div class="error-box">✗ {result.get("message", result.get("error"))}</div>', 
+                              unsafe_allow_html=True)
+    
+    with tab3:
+        st.subheader("Fetch Weather for All Facilities")
+        
+        if st.button("Fetch All Weather Data", type="primary"):
+            result = start_job("weather", "weather-fetch-all")
+            
+            if result.get("status") != "SUCCESS":
+                st.markdown(f'<div class="error-box">✗ {result.get("message", result.get("error"))}</div>', 
+                          unsafe_allow_html=True)
+        
+        # The backend runs the fetch as a job; the progress bar follows it
+        job_progress("weather", "Fetching weather", invalidates=["/test/weather"])
+        weather_job = job_state("weather")
+        
+        if weather_job and weather_job["done"]:
+            job = weather_job.get("job", {})
+            
+            if weather_job.get("error") is None:
+                st.markdown(f'<div class="success-box">✓ {job.get("message")} '
+                            f'in {job.get("elapsed_ms", 0) / 1000:.1f}s</div>', 
+                          unsafe_allow_html=True)
+            else:
+                st.markdown(f'<div class="error-box">✗ {weather_job.get("error")}</div>', 
+                          unsafe_allow_html=True)
+            
+            if job.get("errors"):
+                with st.expander(f"Errors ({len(job['errors'])})"):
+                    for error in job["errors"]:
+                        st.write(error)